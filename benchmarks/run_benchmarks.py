@@ -0,0 +1,200 @@
+"""
+Benchmarks de rendimiento de las estrategias de actualizacion de renta.
+
+Los indices del INE se sirven desde una fuente en memoria (StubIndexProvider),
+por lo que los resultados no dependen de la red y son reproducibles.
+
+Uso:
+
+    python benchmarks/run_benchmarks.py
+    python benchmarks/run_benchmarks.py --filter ipc --json actual.json
+    python benchmarks/run_benchmarks.py --compare base.json --threshold 0.2
+"""
+
+import argparse
+import json
+import sys
+import timeit
+from decimal import Decimal
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from arrendatools.rent_update.base import RentUpdateInput, RentUpdateResult
+from arrendatools.rent_update.factory import RentUpdateFactory
+from arrendatools.rent_update.index_provider import IndexProvider
+
+_SERIES_IPC = "IPC290751"
+_SERIES_IRAV = "IRAV1"
+_BATCH_SIZE = 1000
+
+
+class StubIndexProvider(IndexProvider):
+    """Fuente de indices en memoria con valores sinteticos deterministas."""
+
+    def __init__(self) -> None:
+        self.values: Dict[Tuple[str, int, int], Decimal] = {}
+        for year in range(2002, 2031):
+            for month in range(1, 13):
+                offset = (year - 2002) * 12 + month - 1
+                self.values[(_SERIES_IPC, year, month)] = Decimal(60000 + offset * 157) / 1000
+        for year in range(2024, 2031):
+            for month in range(1, 13):
+                self.values[(_SERIES_IRAV, year, month)] = Decimal(2000 + month * 10) / 1000
+
+    def get_value(self, series: str, year: int, month: int) -> Optional[Decimal]:
+        return self.values.get((series, year, month))
+
+
+def _ipc_input(index: int = 0) -> RentUpdateInput:
+    return RentUpdateInput(
+        amount=Decimal("400.00"),
+        data=Decimal("0.03"),
+        month=index % 12 + 1,
+        year_start=2003 + index % 20,
+        year_end=2004 + index % 20,
+    )
+
+
+def _irav_input(index: int = 0) -> RentUpdateInput:
+    return RentUpdateInput(
+        amount=Decimal("1000.00"),
+        month=index % 12 + 1,
+        year_start=2025 + index % 5,
+    )
+
+
+def build_benchmarks() -> Dict[str, Callable[[], object]]:
+    """Devuelve los benchmarks disponibles, por nombre."""
+    provider = StubIndexProvider()
+
+    def strategy(key: str):
+        return RentUpdateFactory.create(key, provider=provider)
+
+    percentage_input = RentUpdateInput(amount=Decimal("100.00"), data=Decimal("0.10"))
+    ipc_input = _ipc_input()
+    ipc_pre_2002_input = RentUpdateInput(
+        amount=Decimal("400.00"), month=8, year_start=1999, year_end=2001
+    )
+    irav_input = _irav_input()
+    ipc_batch = [_ipc_input(index) for index in range(_BATCH_SIZE)]
+    irav_batch = [_irav_input(index) for index in range(_BATCH_SIZE)]
+    result = RentUpdateResult(
+        amount=Decimal("400.00"),
+        updated_amount=Decimal("412.00"),
+        index_start=Decimal("60.030"),
+        index_end=Decimal("61.827"),
+        month="agosto",
+        year_start=2002,
+        year_end=2003,
+        variation_rate=Decimal("0.03"),
+    )
+
+    percentage = strategy("percentage")
+    fixed_amount = strategy("fixed_amount")
+    ipc = strategy("ipc")
+    irav = strategy("irav")
+    min_ipc_or_percentage = strategy("min_ipc_or_percentage")
+    ipc_then_percentage = strategy("ipc_then_percentage")
+
+    return {
+        "input_construction": lambda: RentUpdateInput(
+            amount=Decimal("400.00"), month=8, year_start=2002, year_end=2003
+        ),
+        "result_as_dict": result.as_dict,
+        "result_as_dict_include_none": lambda: result.as_dict(include_none=True),
+        "factory_create_percentage": lambda: RentUpdateFactory.create("percentage"),
+        "factory_create_ipc": lambda: RentUpdateFactory.create("ipc", provider=provider),
+        "percentage": lambda: percentage.calculate(percentage_input),
+        "fixed_amount": lambda: fixed_amount.calculate(percentage_input),
+        "ipc": lambda: ipc.calculate(ipc_input),
+        "ipc_pre_2002": lambda: ipc.calculate(ipc_pre_2002_input),
+        "irav": lambda: irav.calculate(irav_input),
+        "min_ipc_or_percentage": lambda: min_ipc_or_percentage.calculate(ipc_input),
+        "ipc_then_percentage": lambda: ipc_then_percentage.calculate(ipc_input),
+        f"ipc_calculate_many_{_BATCH_SIZE}": lambda: ipc.calculate_many(ipc_batch),
+        f"irav_calculate_many_{_BATCH_SIZE}": lambda: irav.calculate_many(irav_batch),
+    }
+
+
+def run_benchmarks(
+    name_filter: Optional[str] = None,
+    number: int = 0,
+    repeat: int = 5,
+) -> Dict[str, float]:
+    """
+    Ejecuta los benchmarks y devuelve el mejor tiempo por llamada (segundos).
+
+    :param name_filter: Solo se ejecutan los benchmarks cuyo nombre lo contenga.
+    :param number: Llamadas por medicion. Si es 0 se calcula automaticamente.
+    :param repeat: Numero de mediciones; se toma la mejor.
+    """
+    results = {}
+    for name, func in build_benchmarks().items():
+        if name_filter and name_filter not in name:
+            continue
+        timer = timeit.Timer(func)
+        calls = number or timer.autorange()[0]
+        results[name] = min(timer.repeat(repeat=repeat, number=calls)) / calls
+    return results
+
+
+def compare(
+    results: Dict[str, float], baseline: Dict[str, float], threshold: float
+) -> List[str]:
+    """Devuelve los benchmarks mas lentos que la referencia por encima del umbral."""
+    return [
+        name
+        for name, seconds in results.items()
+        if name in baseline and seconds > baseline[name] * (1 + threshold)
+    ]
+
+
+def _format_time(seconds: float) -> str:
+    for unit, scale in (("s", 1), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.2f} {unit}"
+    return f"{seconds / 1e-9:.0f} ns"
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Benchmarks de las estrategias de actualizacion de renta."
+    )
+    parser.add_argument("--filter", help="Ejecuta solo los benchmarks que contengan este texto.")
+    parser.add_argument("--number", type=int, default=0, help="Llamadas por medicion (0 = automatico).")
+    parser.add_argument("--repeat", type=int, default=5, help="Numero de mediciones.")
+    parser.add_argument("--json", help="Fichero donde guardar los resultados.")
+    parser.add_argument("--compare", help="Resultados de referencia (JSON) con los que comparar.")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.2,
+        help="Empeoramiento relativo tolerado frente a la referencia (0.2 = 20%%).",
+    )
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(args.filter, args.number, args.repeat)
+    baseline = {}
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as baseline_file:
+            baseline = json.load(baseline_file)
+
+    width = max((len(name) for name in results), default=0)
+    for name, seconds in results.items():
+        line = f"{name:<{width}}  {_format_time(seconds):>10}"
+        if name in baseline:
+            line += f"  ({seconds / baseline[name] - 1:+.1%})"
+        print(line)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as output_file:
+            json.dump(results, output_file, indent=2, sort_keys=True)
+
+    regressions = compare(results, baseline, args.threshold)
+    if regressions:
+        print(f"Regressions over {args.threshold:.0%}: {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,21 +1,40 @@
 """Actualizacion de rentas de alquiler en Espana."""
 
-from arrendatools.rent_update.base import (
-    RentUpdateInput,
-    RentUpdateMethod,
-    RentUpdateResult,
-)
-from arrendatools.rent_update.factory import RentUpdateFactory
-from arrendatools.rent_update.strategies.fixed_amount import FixedAmountUpdate
-from arrendatools.rent_update.strategies.ipc import IpcUpdate
-from arrendatools.rent_update.strategies.ipc_then_percentage import (
-    IpcThenPercentageUpdate,
-)
-from arrendatools.rent_update.strategies.irav import IravUpdate
-from arrendatools.rent_update.strategies.min_ipc_or_percentage import (
-    MinIpcOrPercentageUpdate,
-)
-from arrendatools.rent_update.strategies.percentage import PercentageUpdate
+from importlib import import_module
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from arrendatools.rent_update.base import (
+        RentUpdateInput,
+        RentUpdateMethod,
+        RentUpdateResult,
+    )
+    from arrendatools.rent_update.factory import RentUpdateFactory
+    from arrendatools.rent_update.strategies.fixed_amount import FixedAmountUpdate
+    from arrendatools.rent_update.strategies.ipc import IpcUpdate
+    from arrendatools.rent_update.strategies.ipc_then_percentage import (
+        IpcThenPercentageUpdate,
+    )
+    from arrendatools.rent_update.strategies.irav import IravUpdate
+    from arrendatools.rent_update.strategies.min_ipc_or_percentage import (
+        MinIpcOrPercentageUpdate,
+    )
+    from arrendatools.rent_update.strategies.percentage import PercentageUpdate
+
+# Modulo de cada nombre exportado. Se importan la primera vez que se usan para
+# que importar el paquete no cargue todas las estrategias ni sus dependencias.
+_LAZY_ATTRIBUTES = {
+    "RentUpdateInput": "arrendatools.rent_update.base",
+    "RentUpdateMethod": "arrendatools.rent_update.base",
+    "RentUpdateResult": "arrendatools.rent_update.base",
+    "RentUpdateFactory": "arrendatools.rent_update.factory",
+    "FixedAmountUpdate": "arrendatools.rent_update.strategies.fixed_amount",
+    "IpcUpdate": "arrendatools.rent_update.strategies.ipc",
+    "IpcThenPercentageUpdate": "arrendatools.rent_update.strategies.ipc_then_percentage",
+    "IravUpdate": "arrendatools.rent_update.strategies.irav",
+    "MinIpcOrPercentageUpdate": "arrendatools.rent_update.strategies.min_ipc_or_percentage",
+    "PercentageUpdate": "arrendatools.rent_update.strategies.percentage",
+}
 
 __all__ = [
     "RentUpdateInput",
@@ -29,3 +48,16 @@ __all__ = [
     "MinIpcOrPercentageUpdate",
     "PercentageUpdate",
 ]
+
+
+def __getattr__(name: str):
+    module = _LAZY_ATTRIBUTES.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
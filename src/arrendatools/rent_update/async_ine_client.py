@@ -0,0 +1,78 @@
+import asyncio
+import time
+from datetime import date
+from decimal import Decimal
+from typing import Dict, Optional, Tuple
+
+from arrendatools.rent_update import instrumentation
+from arrendatools.rent_update.ine_client import IneClient, _emit_cache_hit
+from arrendatools.rent_update.ine_payload import SeriesValues
+from arrendatools.rent_update.instrumentation import CACHE_MEMORY
+
+
+class AsyncIneClient:
+    """
+    Cliente asincrono de la API del INE.
+
+    Ejecuta las peticiones del IneClient subyacente en hilos auxiliares para
+    no bloquear el bucle de eventos, reutilizando su sesion, pool de
+    conexiones y caches.
+    """
+
+    def __init__(self, client: Optional[IneClient] = None) -> None:
+        """
+        Args:
+            client (IneClient | None): Cliente sincrono a usar. Si no se indica
+                se usa el cliente compartido IneClient.default().
+        """
+        self.client = client if client is not None else IneClient.default()
+
+    async def __aenter__(self) -> "AsyncIneClient":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        """Cierra la sesion HTTP del cliente subyacente."""
+        await asyncio.to_thread(self.client.close)
+
+    async def fetch_series_data(
+        self, start_date: date, end_date: date, series: str
+    ) -> dict:
+        """Version asincrona de IneClient.fetch_series_data."""
+        return await asyncio.to_thread(
+            self.client.fetch_series_data, start_date, end_date, series
+        )
+
+    async def fetch_series_values(
+        self, start_date: date, end_date: date, series: str
+    ) -> SeriesValues:
+        """Version asincrona de IneClient.fetch_series_values."""
+        return await asyncio.to_thread(
+            self.client.fetch_series_values, start_date, end_date, series
+        )
+
+    async def fetch_series_value(
+        self, series: str, year: int, month: int
+    ) -> Optional[Decimal]:
+        """Version asincrona de IneClient.fetch_series_value."""
+        started = time.perf_counter() if instrumentation.enabled() else None
+        memory_cache = IneClient._memory_cache
+        if memory_cache is not None:
+            value = memory_cache.get(series, year, month)
+            if value is not None:
+                if started is not None:
+                    _emit_cache_hit(series, year, month, CACHE_MEMORY, started)
+                return value
+        return await asyncio.to_thread(
+            self.client.fetch_series_value, series, year, month
+        )
+
+    async def prefetch_series(
+        self, series: str, start_date: date, end_date: date
+    ) -> Dict[Tuple[int, int], Decimal]:
+        """Version asincrona de IneClient.prefetch_series."""
+        return await asyncio.to_thread(
+            self.client.prefetch_series, series, start_date, end_date
+        )
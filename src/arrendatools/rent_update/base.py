@@ -3,7 +3,12 @@ from __future__ import annotations
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
 from decimal import Decimal
-from typing import Optional
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from arrendatools.rent_update.instrumentation import instrument_calculation
+
+# Metodos de calculo que se instrumentan en todas las estrategias.
+_INSTRUMENTED_METHODS = ("calculate", "calculate_many", "acalculate")
 
 
 @dataclass(frozen=True)
@@ -64,6 +69,19 @@ class RentUpdateResult:
 class RentUpdateMethod(ABC):
     """Clase base abstracta para las actualizaciones de renta."""
 
+    # Indica si el constructor acepta una fuente de indices (provider=...).
+    uses_index_provider = False
+    # Clave de la estrategia en RentUpdateFactory, usada en la instrumentacion.
+    key: Optional[str] = None
+
+    def __init_subclass__(cls, **kwargs) -> None:
+        super().__init_subclass__(**kwargs)
+        for name in _INSTRUMENTED_METHODS:
+            method = cls.__dict__.get(name)
+            if method is None or getattr(method, "__isabstractmethod__", False):
+                continue
+            setattr(cls, name, instrument_calculation(method))
+
     @abstractmethod
     def calculate(
         self,
@@ -71,3 +89,58 @@ class RentUpdateMethod(ABC):
     ) -> RentUpdateResult:
         """Calcula la actualizacion de la renta."""
         raise NotImplementedError
+
+    @instrument_calculation
+    async def acalculate(
+        self,
+        inputs: RentUpdateInput,
+    ) -> RentUpdateResult:
+        """
+        Version asincrona de calculate().
+
+        Por defecto ejecuta calculate() en un hilo auxiliar para no bloquear el
+        bucle de eventos; las estrategias que consultan al INE lo reimplementan.
+        """
+        import asyncio
+
+        return await asyncio.to_thread(self.calculate, inputs)
+
+    @instrument_calculation
+    def calculate_many(
+        self,
+        inputs: Iterable[RentUpdateInput],
+    ) -> List[RentUpdateResult]:
+        """
+        Calcula la actualizacion de un conjunto de rentas.
+
+        Las estrategias que consultan indices al INE reimplementan este metodo
+        para obtener cada indice distinto una sola vez.
+
+        :param inputs: Datos de entrada de cada renta.
+        :return: Resultados en el mismo orden que las entradas.
+        """
+        return [self.calculate(item) for item in inputs]
+
+    def prefetch(self, inputs: Iterable[RentUpdateInput]) -> None:
+        """
+        Precarga los indices que necesitara un conjunto de calculos.
+
+        Por defecto no hace nada; las estrategias que consultan al INE lo
+        reimplementan para pedir todos los meses en una sola peticion.
+
+        :param inputs: Datos de entrada de cada renta.
+        """
+
+    def index_periods(
+        self, inputs: Iterable[RentUpdateInput]
+    ) -> Dict[str, List[Tuple[int, int]]]:
+        """
+        Devuelve los meses de cada serie de indices que necesita un conjunto
+        de calculos.
+
+        Por defecto ninguno; lo reimplementan las estrategias que usan indices.
+
+        :param inputs: Datos de entrada de cada renta.
+        :return: Meses (ano, mes) ordenados, por codigo de serie.
+        """
+        return {}
@@ -0,0 +1,167 @@
+"""Linea de comandos para actualizar rentas en bloque: arrendatools-rent-update."""
+
+import argparse
+import logging
+import sys
+import tempfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence
+
+from arrendatools.rent_update.index_cache import DiskIndexCache
+from arrendatools.rent_update.index_provider import default_index_provider
+from arrendatools.rent_update.ine_client import IneClient
+from arrendatools.rent_update.pipeline import (
+    FORMAT_CSV,
+    FORMAT_JSONL,
+    PipelineStats,
+    RentUpdatePipeline,
+    iter_batches,
+    read_rows,
+    write_rows,
+)
+from arrendatools.rent_update.snapshot import SERIES_START
+
+# Pipeline de cada proceso del pool, creado por _init_worker.
+_worker_pipeline: Optional[RentUpdatePipeline] = None
+
+
+def warm_index_cache(end_date: Optional[date] = None) -> None:
+    """
+    Descarga las series del INE (una peticion por serie, solo los meses que no
+    estan en la copia local) para dejarlas en las caches de IneClient.
+
+    :param end_date: Ultima fecha a descargar. Por defecto hoy.
+    """
+    end_date = end_date if end_date is not None else date.today()
+    provider = default_index_provider()
+    for series, start_date in SERIES_START.items():
+        provider.get_range(series, start_date, end_date)
+
+
+def _init_worker(
+    method: Optional[str], method_column: Optional[str], cache_dir: Optional[str]
+) -> None:
+    global _worker_pipeline
+    if cache_dir is not None:
+        IneClient.set_disk_cache(DiskIndexCache(cache_dir))
+    _worker_pipeline = RentUpdatePipeline(method, method_column)
+
+
+def _process_batch(batch: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    return _worker_pipeline.process_batch(batch)
+
+
+def process_parallel(
+    rows: Iterable[Dict[str, Any]],
+    workers: int,
+    method: Optional[str] = None,
+    method_column: Optional[str] = "method",
+    batch_size: int = 1000,
+    cache_dir: Optional[str] = None,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Calcula la actualizacion de las filas repartiendo los lotes entre varios
+    procesos. Las filas de salida se devuelven en el orden de entrada y nunca
+    hay mas de dos lotes por proceso pendientes en memoria.
+
+    :param rows: Filas de entrada.
+    :param workers: Numero de procesos.
+    :param method: Estrategia para todas las filas.
+    :param method_column: Columna con la estrategia de cada fila.
+    :param batch_size: Numero de filas de cada lote.
+    :param cache_dir: Directorio del DiskIndexCache compartido por los
+        procesos.
+    """
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(method, method_column, cache_dir),
+    ) as executor:
+        pending = deque()
+        for batch in iter_batches(rows, batch_size):
+            pending.append(executor.submit(_process_batch, batch))
+            if len(pending) >= workers * 2:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+
+def _parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="arrendatools-rent-update",
+        description="Actualiza en bloque las rentas de un fichero CSV o JSONL.",
+    )
+    parser.add_argument("input", help='Fichero de entrada, o "-" para la entrada estandar.')
+    parser.add_argument(
+        "-o", "--output", default="-", help='Fichero de salida, o "-" para la salida estandar (por defecto).'
+    )
+    parser.add_argument("-m", "--method", help="Estrategia para todas las filas (clave de RentUpdateFactory).")
+    parser.add_argument(
+        "--method-column", default="method", help="Columna con la estrategia de cada fila (por defecto: method)."
+    )
+    parser.add_argument("--input-format", choices=(FORMAT_CSV, FORMAT_JSONL), help="Por defecto segun la extension.")
+    parser.add_argument("--output-format", choices=(FORMAT_CSV, FORMAT_JSONL), help="Por defecto segun la extension.")
+    parser.add_argument("-w", "--workers", type=int, default=1, help="Numero de procesos (por defecto 1).")
+    parser.add_argument("--batch-size", type=int, default=1000, help="Filas por lote (por defecto 1000).")
+    parser.add_argument(
+        "--cache-dir",
+        help="Directorio de la cache persistente de indices. Con varios procesos, por defecto uno temporal.",
+    )
+    parser.add_argument(
+        "--no-warm", action="store_true", help="No precargar las series del INE antes de repartir el trabajo."
+    )
+    return parser
+
+
+def _run(args: argparse.Namespace, cache_dir: Optional[str]) -> PipelineStats:
+    if args.workers > 1 and not args.no_warm:
+        try:
+            warm_index_cache()
+        except ConnectionError as err:
+            logging.warning("Could not warm the index cache: %s", err)
+
+    source = sys.stdin if args.input == "-" else args.input
+    destination = sys.stdout if args.output == "-" else args.output
+    rows = read_rows(source, args.input_format)
+    if args.workers > 1:
+        results = process_parallel(
+            rows, args.workers, args.method, args.method_column, args.batch_size, cache_dir
+        )
+    else:
+        pipeline = RentUpdatePipeline(args.method, args.method_column, batch_size=args.batch_size)
+        results = pipeline.process(rows)
+    return write_rows(results, destination, args.output_format)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = _parser()
+    args = parser.parse_args(argv)
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+    if args.batch_size < 1:
+        parser.error("--batch-size must be at least 1")
+    if args.input == "-" and args.input_format is None:
+        parser.error("--input-format is required when reading from standard input")
+    if args.output == "-" and args.output_format is None:
+        args.output_format = FORMAT_CSV
+
+    previous_disk_cache = IneClient._disk_cache
+    with tempfile.TemporaryDirectory() as temporary_dir:
+        cache_dir = args.cache_dir
+        if cache_dir is None and args.workers > 1:
+            cache_dir = temporary_dir
+        try:
+            if cache_dir is not None:
+                IneClient.set_disk_cache(DiskIndexCache(cache_dir))
+            stats = _run(args, cache_dir)
+        finally:
+            IneClient.set_disk_cache(previous_disk_cache)
+
+    print(f"Processed {stats.rows} rows ({stats.errors} with errors).", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
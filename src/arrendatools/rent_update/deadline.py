@@ -0,0 +1,107 @@
+"""
+Plazo maximo (deadline) para los calculos que consultan al INE.
+
+El plazo se fija con el gestor de contexto deadline() y se propaga por una
+variable de contexto: llega a todas las consultas al INE hechas dentro del
+bloque with, aunque pasen por estrategias compuestas, IpcUpdate, fuentes de
+indices o los hilos auxiliares de los metodos asincronos. IneClient ajusta el
+timeout de cada peticion a lo que queda del plazo y, cuando se agota, lanza
+DeadlineExceeded en lugar de seguir esperando o reintentando.
+"""
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Iterator, Optional
+
+
+class DeadlineExceeded(TimeoutError):
+    """Se ha agotado el plazo maximo fijado con deadline()."""
+
+
+class Deadline:
+    """Instante limite, medido con un reloj monotono."""
+
+    def __init__(
+        self, timeout: float, clock: Callable[[], float] = time.monotonic
+    ) -> None:
+        """
+        Args:
+            timeout (float): Segundos disponibles desde ahora.
+            clock (Callable[[], float]): Reloj monotono en segundos.
+        """
+        if timeout < 0:
+            raise ValueError("Timeout cannot be negative.")
+        self.timeout = timeout
+        self._clock = clock
+        self.expires_at = clock() + timeout
+
+    def remaining(self) -> float:
+        """Segundos que quedan del plazo; 0 si ya se ha agotado."""
+        return max(0.0, self.expires_at - self._clock())
+
+    def expired(self) -> bool:
+        """Indica si se ha agotado el plazo."""
+        return self._clock() >= self.expires_at
+
+    def check(self, operation: str = "the INE API request") -> float:
+        """
+        Comprueba que queda plazo.
+
+        Args:
+            operation (str): Descripcion de la operacion, para el mensaje.
+
+        Returns:
+            float: Segundos que quedan.
+
+        Raises:
+            DeadlineExceeded: Si se ha agotado el plazo.
+        """
+        remaining = self.remaining()
+        if remaining <= 0:
+            raise self.exceeded(operation)
+        return remaining
+
+    def exceeded(self, operation: str = "the INE API request") -> DeadlineExceeded:
+        """
+        Crea el error que se lanza al agotarse el plazo.
+
+        Args:
+            operation (str): Descripcion de la operacion, para el mensaje.
+
+        Returns:
+            DeadlineExceeded: Error con el plazo y la operacion.
+        """
+        return DeadlineExceeded(f"Deadline of {self.timeout:g} s exceeded during {operation}.")
+
+
+_current: ContextVar[Optional[Deadline]] = ContextVar("_current_deadline", default=None)
+
+
+def current_deadline() -> Optional[Deadline]:
+    """Devuelve el plazo activo en el contexto actual, o None si no hay."""
+    return _current.get()
+
+
+@contextmanager
+def deadline(timeout: float) -> Iterator[Deadline]:
+    """
+    Fija un plazo maximo para todo lo que se ejecute dentro del bloque with.
+
+    Los plazos se pueden anidar: el interior nunca amplia el exterior.
+
+    Args:
+        timeout (float): Segundos disponibles.
+
+    Yields:
+        Deadline: Plazo activo dentro del bloque.
+    """
+    new = Deadline(timeout)
+    outer = _current.get()
+    if outer is not None and outer.expires_at < new.expires_at:
+        new = outer
+    token = _current.set(new)
+    try:
+        yield new
+    finally:
+        _current.reset(token)
@@ -1,35 +1,76 @@
 from __future__ import annotations
 
-from importlib import metadata
-from typing import Dict, Type
-
+import json
+import os
+import sys
+import tempfile
+import threading
+from importlib import import_module, metadata
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple, Type
+
+from arrendatools.rent_update import instrumentation
 from arrendatools.rent_update.base import RentUpdateMethod
-from arrendatools.rent_update.strategies.fixed_amount import FixedAmountUpdate
-from arrendatools.rent_update.strategies.ipc import IpcUpdate
-from arrendatools.rent_update.strategies.ipc_then_percentage import (
-    IpcThenPercentageUpdate,
-)
-from arrendatools.rent_update.strategies.irav import IravUpdate
-from arrendatools.rent_update.strategies.min_ipc_or_percentage import (
-    MinIpcOrPercentageUpdate,
+from arrendatools.rent_update.instrumentation import (
+    OUTCOME_ERROR,
+    OUTCOME_OK,
+    StrategyCreatedEvent,
 )
-from arrendatools.rent_update.strategies.percentage import PercentageUpdate
+
+if TYPE_CHECKING:
+    from arrendatools.rent_update.index_provider import IndexProvider
+
+_ENTRY_POINT_GROUP = "arrendatools.rent_update"
+
+
+def _load_object(path: str):
+    """Importa un objeto a partir de su ruta 'modulo:atributo [extras]'."""
+    module_name, _, attribute = path.split("[")[0].strip().partition(":")
+    value = import_module(module_name)
+    for name in filter(None, attribute.split(".")):
+        value = getattr(value, name)
+    return value
+
+
+def _environment_fingerprint() -> List[List]:
+    """
+    Identifica los paquetes instalados: rutas de sys.path y su fecha de
+    modificacion, que cambia al instalar o desinstalar una distribucion.
+    """
+    fingerprint = []
+    for path in sys.path:
+        try:
+            mtime = os.stat(path or ".").st_mtime_ns
+        except OSError:
+            mtime = None
+        fingerprint.append([path, mtime])
+    return fingerprint
 
 
 class RentUpdateFactory:
     """Factory para crear instancias de RentUpdateMethod."""
 
     _registry: Dict[str, Type[RentUpdateMethod]] = {}
-    _entry_points_loaded = False
-    _builtins_loaded = False
-    _builtin_classes = {
-        "percentage": PercentageUpdate,
-        "fixed_amount": FixedAmountUpdate,
-        "ipc": IpcUpdate,
-        "ipc_then_percentage": IpcThenPercentageUpdate,
-        "irav": IravUpdate,
-        "min_ipc_or_percentage": MinIpcOrPercentageUpdate,
+    # Las estrategias incluidas se importan solo cuando se piden.
+    _builtin_paths = {
+        "percentage": "arrendatools.rent_update.strategies.percentage:PercentageUpdate",
+        "fixed_amount": "arrendatools.rent_update.strategies.fixed_amount:FixedAmountUpdate",
+        "ipc": "arrendatools.rent_update.strategies.ipc:IpcUpdate",
+        "ipc_then_percentage": (
+            "arrendatools.rent_update.strategies.ipc_then_percentage:IpcThenPercentageUpdate"
+        ),
+        "irav": "arrendatools.rent_update.strategies.irav:IravUpdate",
+        "min_ipc_or_percentage": (
+            "arrendatools.rent_update.strategies.min_ipc_or_percentage:MinIpcOrPercentageUpdate"
+        ),
     }
+    # Ruta 'modulo:atributo' de cada entry point, sin importar el plugin.
+    _entry_point_paths: Optional[Dict[str, str]] = None
+    _entry_point_cache: Optional[str] = None
+    # Instancias compartidas por clase y fuente de indices (create(shared=True)).
+    _shared_instances: Dict[
+        Tuple[Type[RentUpdateMethod], Optional[IndexProvider]], RentUpdateMethod
+    ] = {}
+    _shared_lock = threading.Lock()
 
     @classmethod
     def _normalize_key(cls, key: str) -> str:
@@ -41,47 +82,168 @@ class RentUpdateFactory:
         cls._registry[cls._normalize_key(key)] = klass
 
     @classmethod
-    def _load_builtins(cls) -> None:
-        if cls._builtins_loaded:
-            return
-
-        for key, klass in cls._builtin_classes.items():
-            cls.register(key, klass)
+    def set_entry_point_cache(cls, path: Optional[str]) -> None:
+        """
+        Configura el fichero JSON en el que se guarda el resultado de buscar
+        los entry points, para que otros procesos no repitan la busqueda
+        mientras no cambien los paquetes instalados.
 
-        cls._builtins_loaded = True
+        :param path: Ruta del fichero, o None para no usar cache persistente.
+        """
+        cls._entry_point_cache = path
+        cls._entry_point_paths = None
 
     @classmethod
-    def _load_entry_points(cls) -> None:
-        if cls._entry_points_loaded:
-            return
-
+    def _select_entry_points(cls):
         entry_points = metadata.entry_points()
         if hasattr(entry_points, "select"):
-            candidates = entry_points.select(group="arrendatools.rent_update")
-        else:
-            candidates = entry_points.get("arrendatools.rent_update", [])
+            return entry_points.select(group=_ENTRY_POINT_GROUP)
+        return entry_points.get(_ENTRY_POINT_GROUP, [])
+
+    @classmethod
+    def _read_entry_point_cache(cls, fingerprint: List[List]) -> Optional[Dict[str, str]]:
+        try:
+            with open(cls._entry_point_cache, encoding="utf-8") as handle:
+                cached = json.load(handle)
+        except (OSError, ValueError):
+            return None
+        if not isinstance(cached, dict) or cached.get("fingerprint") != fingerprint:
+            return None
+        return cached.get("entry_points")
+
+    @classmethod
+    def _write_entry_point_cache(
+        cls, fingerprint: List[List], paths: Dict[str, str]
+    ) -> None:
+        directory = os.path.dirname(os.path.abspath(cls._entry_point_cache))
+        try:
+            os.makedirs(directory, exist_ok=True)
+            # Se escribe en un temporal y se renombra para que otro proceso
+            # nunca lea un fichero a medias.
+            descriptor, temporary = tempfile.mkstemp(dir=directory, suffix=".tmp")
+            with os.fdopen(descriptor, "w", encoding="utf-8") as handle:
+                json.dump({"fingerprint": fingerprint, "entry_points": paths}, handle)
+            os.replace(temporary, cls._entry_point_cache)
+        except OSError:
+            # La cache es solo una optimizacion.
+            pass
 
-        for entry_point in candidates:
-            cls.register(entry_point.name, entry_point.load())
+    @classmethod
+    def entry_point_paths(cls) -> Dict[str, str]:
+        """
+        Devuelve la ruta 'modulo:atributo' de cada entry point del grupo
+        arrendatools.rent_update, sin importar los plugins. El resultado se
+        guarda en memoria y, si se configuro, en set_entry_point_cache().
+        """
+        if cls._entry_point_paths is not None:
+            return cls._entry_point_paths
+
+        fingerprint = None
+        paths = None
+        if cls._entry_point_cache is not None:
+            fingerprint = _environment_fingerprint()
+            paths = cls._read_entry_point_cache(fingerprint)
+        if paths is None:
+            paths = {
+                cls._normalize_key(entry_point.name): entry_point.value
+                for entry_point in cls._select_entry_points()
+            }
+            if fingerprint is not None:
+                cls._write_entry_point_cache(fingerprint, paths)
+
+        cls._entry_point_paths = paths
+        return paths
 
-        cls._entry_points_loaded = True
+    @classmethod
+    def _resolve(cls, key: str) -> Optional[Type[RentUpdateMethod]]:
+        klass = cls._registry.get(key)
+        if klass is not None:
+            return klass
+        path = cls._builtin_paths.get(key)
+        if path is None:
+            path = cls.entry_point_paths().get(key)
+        if path is None:
+            return None
+        klass = _load_object(path)
+        cls.register(key, klass)
+        return klass
 
     @classmethod
-    def create(cls, update_type: str) -> RentUpdateMethod:
+    def available(cls) -> List[str]:
+        """Devuelve, ordenadas, las claves que se pueden pasar a create()."""
+        return sorted(
+            set(cls._registry) | set(cls._builtin_paths) | set(cls.entry_point_paths())
+        )
+
+    @classmethod
+    def clear_shared_instances(cls) -> None:
+        """Descarta las instancias compartidas creadas con shared=True."""
+        with cls._shared_lock:
+            cls._shared_instances = {}
+
+    @classmethod
+    def _instantiate(
+        cls, klass: Type[RentUpdateMethod], provider: Optional[IndexProvider]
+    ) -> RentUpdateMethod:
+        if provider is not None:
+            return klass(provider=provider)
+        return klass()
+
+    @classmethod
+    def create(
+        cls,
+        update_type: str,
+        provider: Optional[IndexProvider] = None,
+        shared: bool = False,
+    ) -> RentUpdateMethod:
         """
         Crea una instancia de una clase que extiende RentUpdateMethod.
 
+        Solo se importa la clase pedida. Los entry points se buscan cuando la
+        clave no esta registrada ni es una estrategia incluida.
+
         :param update_type: Clave registrada o entry point.
+        :param provider: Fuente de indices a inyectar en las estrategias que
+            la usan (uses_index_provider); el resto la ignoran.
+        :param shared: Si es True se devuelve siempre la misma instancia para
+            cada clase y fuente de indices, de modo que sus clientes y caches
+            se reutilizan entre llamadas. Las estrategias no cambian de estado
+            al calcular, por lo que la instancia se puede usar desde varios
+            hilos a la vez.
         :return: Instancia de la clase especificada.
         :raises ValueError: Si no existe una clase con el nombre especificado.
         """
-        cls._load_builtins()
-        cls._load_entry_points()
-
-        klass = cls._registry.get(cls._normalize_key(update_type))
+        key = cls._normalize_key(update_type)
+        klass = cls._resolve(key)
         if not klass:
-            available = ", ".join(sorted(cls._registry))
+            if instrumentation.enabled():
+                instrumentation.emit(
+                    StrategyCreatedEvent(key, shared, OUTCOME_ERROR, "ValueError")
+                )
+            available = ", ".join(cls.available())
             raise ValueError(
                 f"Unknown update type: {update_type}. Available: {available}"
             )
-        return klass()
+        if not getattr(klass, "uses_index_provider", False):
+            provider = None
+        if shared:
+            instance = cls._shared_instance(klass, provider)
+        else:
+            instance = cls._instantiate(klass, provider)
+        if instrumentation.enabled():
+            instrumentation.emit(StrategyCreatedEvent(key, shared, OUTCOME_OK))
+        return instance
+
+    @classmethod
+    def _shared_instance(
+        cls, klass: Type[RentUpdateMethod], provider: Optional[IndexProvider]
+    ) -> RentUpdateMethod:
+        key = (klass, provider)
+        instance = cls._shared_instances.get(key)
+        if instance is None:
+            with cls._shared_lock:
+                instance = cls._shared_instances.get(key)
+                if instance is None:
+                    instance = cls._instantiate(klass, provider)
+                    cls._shared_instances[key] = instance
+        return instance
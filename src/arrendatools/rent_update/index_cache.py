@@ -0,0 +1,251 @@
+from __future__ import annotations
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import date
+from decimal import Decimal
+from typing import TYPE_CHECKING, Callable, Dict, Mapping, Optional, Tuple
+
+if TYPE_CHECKING:
+    import sqlite3
+
+
+def _is_recent(year: int, month: int, recent_months: int) -> bool:
+    """Indica si el mes esta entre los recent_months ultimos, contando el actual."""
+    today = date.today()
+    months_ago = (today.year - year) * 12 + (today.month - month)
+    return months_ago < recent_months
+
+
+class MemoryIndexCache:
+    """
+    Cache LRU en memoria, acotado y seguro entre hilos, de valores del INE.
+
+    Como DiskIndexCache, los valores de los meses recientes (que el INE aun
+    puede revisar) caducan a los recent_ttl segundos; los anteriores solo se
+    descartan por tamano.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 4096,
+        recent_months: int = 2,
+        recent_ttl: float = 86400,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        Args:
+            maxsize (int): Numero maximo de valores guardados.
+            recent_months (int): Numero de meses, contando el actual, que se
+                consideran recientes y pueden cambiar.
+            recent_ttl (float): Segundos de validez de un valor reciente.
+            clock (Callable[[], float]): Reloj monotono en segundos.
+        """
+        if maxsize < 1:
+            raise ValueError("Max size must be at least 1.")
+        if recent_months < 0:
+            raise ValueError("Recent months cannot be negative.")
+        if recent_ttl < 0:
+            raise ValueError("Recent TTL cannot be negative.")
+        self.maxsize = maxsize
+        self.recent_months = recent_months
+        self.recent_ttl = recent_ttl
+        self.hits = 0
+        self.misses = 0
+        self._clock = clock
+        self._values: "OrderedDict[Tuple[str, int, int], Decimal]" = OrderedDict()
+        # Instante de caducidad de los valores de meses recientes.
+        self._expires: Dict[Tuple[str, int, int], float] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def __contains__(self, key: Tuple[str, int, int]) -> bool:
+        with self._lock:
+            return key in self._values and not self._expired(key)
+
+    def _expired(self, key: Tuple[str, int, int]) -> bool:
+        """Indica si el valor ha caducado y, en ese caso, lo elimina."""
+        expires = self._expires.get(key)
+        if expires is None or self._clock() < expires:
+            return False
+        del self._values[key]
+        del self._expires[key]
+        return True
+
+    def get(self, series: str, year: int, month: int) -> Optional[Decimal]:
+        """Devuelve el valor guardado o None si no existe o ha caducado."""
+        key = (series, year, month)
+        with self._lock:
+            value = self._values.get(key)
+            if value is None or self._expired(key):
+                self.misses += 1
+                return None
+            self._values.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, series: str, year: int, month: int, value: Decimal) -> None:
+        """Guarda el valor, descartando el menos usado si se supera maxsize."""
+        self.set_many(series, {(year, month): value})
+
+    def set_many(
+        self, series: str, values: Mapping[Tuple[int, int], Decimal]
+    ) -> None:
+        """Guarda varios valores de una serie, indexados por (ano, mes)."""
+        with self._lock:
+            expires = self._clock() + self.recent_ttl
+            for (year, month), value in values.items():
+                key = (series, year, month)
+                self._values[key] = value
+                self._values.move_to_end(key)
+                if _is_recent(year, month, self.recent_months):
+                    self._expires[key] = expires
+                else:
+                    self._expires.pop(key, None)
+            while len(self._values) > self.maxsize:
+                key, _ = self._values.popitem(last=False)
+                self._expires.pop(key, None)
+
+    def invalidate(
+        self,
+        series: str,
+        year: Optional[int] = None,
+        month: Optional[int] = None,
+    ) -> None:
+        """Elimina los valores de una serie, opcionalmente de un ano o mes."""
+        with self._lock:
+            for key in list(self._values):
+                if key[0] != series:
+                    continue
+                if year is not None and key[1] != year:
+                    continue
+                if month is not None and key[2] != month:
+                    continue
+                del self._values[key]
+                self._expires.pop(key, None)
+
+    def clear(self) -> None:
+        """Elimina todos los valores y reinicia los contadores."""
+        with self._lock:
+            self._values.clear()
+            self._expires.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+class DiskIndexCache:
+    """
+    Cache persistente en SQLite de los valores de las series del INE.
+
+    Cada hilo reutiliza su propia conexion a la base de datos.
+    """
+
+    _FILE_NAME = "ine_series.sqlite3"
+
+    def __init__(
+        self,
+        directory: str,
+        recent_months: int = 2,
+        recent_ttl: float = 86400,
+    ) -> None:
+        """
+        Args:
+            directory (str): Directorio donde se guarda la base de datos.
+            recent_months (int): Numero de meses, contando el actual, que se
+                consideran recientes y pueden no estar publicados o cambiar.
+            recent_ttl (float): Segundos de validez de un valor reciente. Los
+                valores de meses anteriores no caducan.
+        """
+        if recent_months < 0:
+            raise ValueError("Recent months cannot be negative.")
+        if recent_ttl < 0:
+            raise ValueError("Recent TTL cannot be negative.")
+        os.makedirs(directory, exist_ok=True)
+        self.path = os.path.join(directory, self._FILE_NAME)
+        self.recent_months = recent_months
+        self.recent_ttl = recent_ttl
+        self._local = threading.local()
+        with self._connection() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS series_values ("
+                "series TEXT NOT NULL, "
+                "year INTEGER NOT NULL, "
+                "month INTEGER NOT NULL, "
+                "value TEXT NOT NULL, "
+                "fetched_at REAL NOT NULL, "
+                "PRIMARY KEY (series, year, month))"
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        import sqlite3
+
+        return sqlite3.connect(self.path, timeout=30)
+
+    def _connection(self) -> sqlite3.Connection:
+        """
+        Devuelve la conexion del hilo actual, creandola la primera vez. Usada
+        como gestor de contexto hace commit al salir (o rollback si falla).
+        Tras un fork se abre una nueva: las conexiones no se comparten entre
+        procesos.
+        """
+        pid = os.getpid()
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != pid:
+            conn = self._local.conn = self._connect()
+            self._local.pid = pid
+        return conn
+
+    def close(self) -> None:
+        """Cierra la conexion del hilo actual, si la hay."""
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            self._local.conn = None
+            conn.close()
+
+    def get(self, series: str, year: int, month: int) -> Optional[Decimal]:
+        """Devuelve el valor guardado o None si no existe o ha caducado."""
+        with self._connection() as conn:
+            row = conn.execute(
+                "SELECT value, fetched_at FROM series_values "
+                "WHERE series = ? AND year = ? AND month = ?",
+                (series, year, month),
+            ).fetchone()
+        if row is None:
+            return None
+        value, fetched_at = row
+        if _is_recent(year, month, self.recent_months) and (
+            time.time() - fetched_at >= self.recent_ttl
+        ):
+            return None
+        return Decimal(value)
+
+    def set(self, series: str, year: int, month: int, value: Decimal) -> None:
+        """Guarda el valor de una serie para el ano y mes indicado."""
+        self.set_many(series, {(year, month): value})
+
+    def set_many(
+        self, series: str, values: Mapping[Tuple[int, int], Decimal]
+    ) -> None:
+        """
+        Guarda varios valores de una serie, indexados por (ano, mes), en una
+        unica transaccion.
+        """
+        fetched_at = time.time()
+        with self._connection() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO series_values "
+                "(series, year, month, value, fetched_at) VALUES (?, ?, ?, ?, ?)",
+                [
+                    (series, year, month, str(value), fetched_at)
+                    for (year, month), value in values.items()
+                ],
+            )
+
+    def clear(self) -> None:
+        """Elimina todos los valores guardados."""
+        with self._connection() as conn:
+            conn.execute("DELETE FROM series_values")
@@ -0,0 +1,500 @@
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from abc import ABC, abstractmethod
+from datetime import date
+from decimal import Decimal
+from typing import (
+    TYPE_CHECKING,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Union,
+)
+
+from arrendatools.rent_update.index_cache import DiskIndexCache, MemoryIndexCache
+from arrendatools.rent_update.ine_client import IneClient
+from arrendatools.rent_update.snapshot import snapshot_value
+
+if TYPE_CHECKING:
+    from concurrent.futures import Executor
+
+    from arrendatools.rent_update.async_ine_client import AsyncIneClient
+
+# Codigo con el que BundledIndexProvider sirve la tabla del IPC base 1992.
+SERIES_IPC_BASE_1992 = "IPC_BASE_1992"
+
+
+def _months(start_date: date, end_date: date) -> List[Tuple[int, int]]:
+    """Devuelve los meses (ano, mes) entre dos fechas, ambos incluidos."""
+    periods = []
+    year, month = start_date.year, start_date.month
+    while (year, month) <= (end_date.year, end_date.month):
+        periods.append((year, month))
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+    return periods
+
+
+class IndexProvider(ABC):
+    """Clase base abstracta para las fuentes de valores de series de indices."""
+
+    @abstractmethod
+    def get_value(self, series: str, year: int, month: int) -> Optional[Decimal]:
+        """
+        Devuelve el valor de una serie para un ano y mes.
+
+        :param series: Codigo de la serie temporal.
+        :param year: Ano del dato.
+        :param month: Mes del dato.
+        :return: Valor o None si la fuente no lo tiene.
+        """
+        raise NotImplementedError
+
+    async def aget_value(
+        self, series: str, year: int, month: int
+    ) -> Optional[Decimal]:
+        """Version asincrona de get_value(); por defecto usa un hilo auxiliar."""
+        import asyncio
+
+        return await asyncio.to_thread(self.get_value, series, year, month)
+
+    def get_range(
+        self, series: str, start_date: date, end_date: date
+    ) -> Dict[Tuple[int, int], Decimal]:
+        """
+        Devuelve los valores mensuales de una serie entre dos fechas.
+
+        Por defecto consulta get_value() mes a mes; las fuentes remotas lo
+        reimplementan para hacer una sola peticion.
+
+        :return: Valores por (ano, mes); los meses sin dato no se incluyen.
+        """
+        values = {}
+        for year, month in _months(start_date, end_date):
+            value = self.get_value(series, year, month)
+            if value is not None:
+                values[(year, month)] = value
+        return values
+
+    def missing_periods(
+        self, series: str, periods: Iterable[Tuple[int, int]]
+    ) -> List[Tuple[int, int]]:
+        """
+        Devuelve, ordenados, los periodos que la fuente no puede servir sin
+        hacer entrada/salida. Por defecto, todos.
+        """
+        return sorted(set(periods))
+
+
+class IneIndexProvider(IndexProvider):
+    """Fuente de indices que consulta la API del INE a traves de IneClient."""
+
+    def __init__(
+        self,
+        client: Optional[IneClient] = None,
+        async_client: Optional[AsyncIneClient] = None,
+    ) -> None:
+        """
+        :param client: Cliente del INE. Por defecto el compartido.
+        :param async_client: Cliente asincrono. Por defecto envuelve al
+            cliente sincrono.
+        """
+        self._client = client
+        self._async_client = async_client
+
+    @property
+    def client(self) -> IneClient:
+        """Cliente del INE usado para obtener los indices."""
+        if self._client is not None:
+            return self._client
+        return IneClient.default()
+
+    @property
+    def async_client(self) -> AsyncIneClient:
+        """Cliente asincrono del INE usado por aget_value()."""
+        from arrendatools.rent_update.async_ine_client import AsyncIneClient
+
+        if self._async_client is not None:
+            return self._async_client
+        return AsyncIneClient(self.client)
+
+    def get_value(self, series: str, year: int, month: int) -> Optional[Decimal]:
+        return self.client.fetch_series_value(series, year, month)
+
+    async def aget_value(
+        self, series: str, year: int, month: int
+    ) -> Optional[Decimal]:
+        return await self.async_client.fetch_series_value(series, year, month)
+
+    def get_range(
+        self, series: str, start_date: date, end_date: date
+    ) -> Dict[Tuple[int, int], Decimal]:
+        return self.client.prefetch_series(series, start_date, end_date)
+
+    def missing_periods(
+        self, series: str, periods: Iterable[Tuple[int, int]]
+    ) -> List[Tuple[int, int]]:
+        return self.client.missing_periods(series, periods)
+
+
+class BundledIndexProvider(IndexProvider):
+    """
+    Fuente de indices incluidos en el paquete: la tabla del IPC base 1992
+    (serie SERIES_IPC_BASE_1992) y la copia local de las series del INE.
+    """
+
+    def __init__(self, include_snapshot: bool = True) -> None:
+        """
+        :param include_snapshot: Si es False solo se sirve la tabla del IPC
+            base 1992.
+        """
+        # Importado aqui: el paquete strategies depende de este modulo.
+        from arrendatools.rent_update.strategies.ipc_data import ipc_base_1992
+
+        self.include_snapshot = include_snapshot
+        self._ipc_base_1992 = ipc_base_1992
+
+    def get_value(self, series: str, year: int, month: int) -> Optional[Decimal]:
+        if series == SERIES_IPC_BASE_1992:
+            return self._ipc_base_1992(year, month)
+        if self.include_snapshot:
+            return snapshot_value(series, year, month)
+        return None
+
+    async def aget_value(
+        self, series: str, year: int, month: int
+    ) -> Optional[Decimal]:
+        return self.get_value(series, year, month)
+
+    def missing_periods(
+        self, series: str, periods: Iterable[Tuple[int, int]]
+    ) -> List[Tuple[int, int]]:
+        return [
+            (year, month)
+            for year, month in sorted(set(periods))
+            if self.get_value(series, year, month) is None
+        ]
+
+
+class CachingIndexProvider(IndexProvider):
+    """Capa de cache delante de cualquier otra fuente de indices."""
+
+    def __init__(
+        self,
+        provider: IndexProvider,
+        cache: Optional[Union[MemoryIndexCache, DiskIndexCache]] = None,
+    ) -> None:
+        """
+        :param provider: Fuente a la que se consulta si el valor no esta en
+            cache.
+        :param cache: Cache a usar. Por defecto un MemoryIndexCache propio.
+        """
+        self.provider = provider
+        self.cache = cache if cache is not None else MemoryIndexCache()
+
+    def get_value(self, series: str, year: int, month: int) -> Optional[Decimal]:
+        value = self.cache.get(series, year, month)
+        if value is None:
+            value = self.provider.get_value(series, year, month)
+            if value is not None:
+                self.cache.set(series, year, month, value)
+        return value
+
+    async def aget_value(
+        self, series: str, year: int, month: int
+    ) -> Optional[Decimal]:
+        value = self.cache.get(series, year, month)
+        if value is None:
+            value = await self.provider.aget_value(series, year, month)
+            if value is not None:
+                self.cache.set(series, year, month, value)
+        return value
+
+    def get_range(
+        self, series: str, start_date: date, end_date: date
+    ) -> Dict[Tuple[int, int], Decimal]:
+        values = {}
+        for year, month in _months(start_date, end_date):
+            value = self.cache.get(series, year, month)
+            if value is not None:
+                values[(year, month)] = value
+        pending = [
+            period
+            for period in _months(start_date, end_date)
+            if period not in values
+        ]
+        if not pending:
+            return values
+        fetched = self.provider.get_range(
+            series, date(*pending[0], 1), date(*pending[-1], 1)
+        )
+        self.cache.set_many(series, fetched)
+        for period, value in fetched.items():
+            values.setdefault(period, value)
+        return values
+
+    def missing_periods(
+        self, series: str, periods: Iterable[Tuple[int, int]]
+    ) -> List[Tuple[int, int]]:
+        pending = [
+            (year, month)
+            for year, month in sorted(set(periods))
+            if self.cache.get(series, year, month) is None
+        ]
+        if not pending:
+            return []
+        return self.provider.missing_periods(series, pending)
+
+
+class ChainedIndexProvider(IndexProvider):
+    """Consulta varias fuentes en orden y devuelve el primer valor encontrado."""
+
+    def __init__(self, providers: Sequence[IndexProvider]) -> None:
+        """
+        :param providers: Fuentes a consultar, de la mas a la menos preferida.
+        """
+        if not providers:
+            raise ValueError("At least one index provider is required.")
+        self.providers = list(providers)
+
+    def get_value(self, series: str, year: int, month: int) -> Optional[Decimal]:
+        for provider in self.providers:
+            value = provider.get_value(series, year, month)
+            if value is not None:
+                return value
+        return None
+
+    async def aget_value(
+        self, series: str, year: int, month: int
+    ) -> Optional[Decimal]:
+        for provider in self.providers:
+            value = await provider.aget_value(series, year, month)
+            if value is not None:
+                return value
+        return None
+
+    def get_range(
+        self, series: str, start_date: date, end_date: date
+    ) -> Dict[Tuple[int, int], Decimal]:
+        values: Dict[Tuple[int, int], Decimal] = {}
+        for provider in self.providers:
+            pending = [
+                period
+                for period in _months(start_date, end_date)
+                if period not in values
+            ]
+            if not pending:
+                break
+            fetched = provider.get_range(
+                series, date(*pending[0], 1), date(*pending[-1], 1)
+            )
+            for period, value in fetched.items():
+                values.setdefault(period, value)
+        return values
+
+    def missing_periods(
+        self, series: str, periods: Iterable[Tuple[int, int]]
+    ) -> List[Tuple[int, int]]:
+        pending = sorted(set(periods))
+        for provider in self.providers:
+            if not pending:
+                break
+            pending = provider.missing_periods(series, pending)
+        return pending
+
+
+class StaleWhileRevalidateIndexProvider(IndexProvider):
+    """
+    Cache delante de otra fuente que, para los meses recientes (los unicos que
+    pueden faltar o cambiar), sirve al instante el ultimo valor conocido y lo
+    refresca en segundo plano.
+
+    - Un valor reciente con menos de max_age segundos se sirve sin mas.
+    - Entre max_age y max_stale se sirve y se pide de nuevo en un hilo
+      auxiliar, sin bloquear al que llama.
+    - Con mas de max_stale se vuelve a pedir antes de responder.
+
+    Los valores de meses anteriores no caducan. Tambien se recuerda que un mes
+    aun no esta publicado, de modo que se detecta su publicacion sin pedirlo
+    en cada calculo. Las peticiones de refresco usan get_range() de la fuente,
+    que se salta los caches de IneClient.
+    """
+
+    def __init__(
+        self,
+        provider: IndexProvider,
+        max_age: float = 3600,
+        max_stale: float = 86400,
+        recent_months: int = 2,
+        executor: Optional[Executor] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        :param provider: Fuente a la que se piden los valores.
+        :param max_age: Segundos durante los que un valor reciente se sirve
+            sin refrescarlo.
+        :param max_stale: Segundos maximos de antiguedad de un valor
+            reciente servido mientras se refresca.
+        :param recent_months: Numero de meses, contando el actual, que se
+            consideran recientes.
+        :param executor: Ejecutor de los refrescos. Por defecto un pool de
+            dos hilos creado en el primer refresco.
+        :param clock: Reloj monotono en segundos.
+        """
+        if max_age < 0 or max_stale < max_age:
+            raise ValueError("Max stale must be greater than or equal to max age.")
+        if recent_months < 0:
+            raise ValueError("Recent months cannot be negative.")
+        self.provider = provider
+        self.max_age = max_age
+        self.max_stale = max_stale
+        self.recent_months = recent_months
+        self._executor = executor
+        self._clock = clock
+        # (serie, ano, mes) -> (valor o None si no estaba publicado, instante).
+        self._entries: Dict[Tuple[str, int, int], Tuple[Optional[Decimal], float]] = {}
+        self._refreshing: Set[Tuple[str, int, int]] = set()
+        self._lock = threading.Lock()
+
+    def _is_recent(self, year: int, month: int) -> bool:
+        today = date.today()
+        months_ago = (today.year - year) * 12 + (today.month - month)
+        return months_ago < self.recent_months
+
+    def _store(
+        self, series: str, year: int, month: int, value: Optional[Decimal]
+    ) -> None:
+        # Los meses antiguos sin dato no se recuerdan: no se van a publicar.
+        if value is None and not self._is_recent(year, month):
+            return
+        with self._lock:
+            self._entries[(series, year, month)] = (value, self._clock())
+
+    def _fetch_fresh(self, series: str, year: int, month: int) -> Optional[Decimal]:
+        query_date = date(year, month, 1)
+        value = self.provider.get_range(series, query_date, query_date).get(
+            (year, month)
+        )
+        self._store(series, year, month, value)
+        return value
+
+    def _refresh(self, key: Tuple[str, int, int]) -> None:
+        try:
+            self._fetch_fresh(*key)
+        except Exception as err:
+            logging.warning("Could not refresh %s %d-%02d: %s", *key, err)
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
+
+    def _schedule_refresh(self, key: Tuple[str, int, int]) -> None:
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+            if self._executor is None:
+                from concurrent.futures import ThreadPoolExecutor
+
+                self._executor = ThreadPoolExecutor(
+                    max_workers=2, thread_name_prefix="arrendatools-revalidate"
+                )
+            executor = self._executor
+        executor.submit(self._refresh, key)
+
+    def get_value(self, series: str, year: int, month: int) -> Optional[Decimal]:
+        key = (series, year, month)
+        entry = self._entries.get(key)
+        if entry is None:
+            value = self.provider.get_value(series, year, month)
+            self._store(series, year, month, value)
+            return value
+        value, fetched_at = entry
+        if not self._is_recent(year, month):
+            return value
+        age = self._clock() - fetched_at
+        if age <= self.max_age:
+            return value
+        if age <= self.max_stale:
+            self._schedule_refresh(key)
+            return value
+        return self._fetch_fresh(series, year, month)
+
+    def get_range(
+        self, series: str, start_date: date, end_date: date
+    ) -> Dict[Tuple[int, int], Decimal]:
+        values = self.provider.get_range(series, start_date, end_date)
+        for (year, month), value in values.items():
+            self._store(series, year, month, value)
+        return values
+
+    def missing_periods(
+        self, series: str, periods: Iterable[Tuple[int, int]]
+    ) -> List[Tuple[int, int]]:
+        pending = [
+            (year, month)
+            for year, month in sorted(set(periods))
+            if (series, year, month) not in self._entries
+        ]
+        if not pending:
+            return []
+        return self.provider.missing_periods(series, pending)
+
+
+class StaticIndexProvider(IndexProvider):
+    """
+    Fuente de indices con valores fijos en memoria, sin entrada/salida.
+
+    Se puede serializar con pickle, por lo que sirve para enviar a otros
+    procesos los indices ya resueltos.
+    """
+
+    def __init__(
+        self,
+        values: Optional[Dict[str, Dict[Tuple[int, int], Decimal]]] = None,
+    ) -> None:
+        """
+        :param values: Valores por codigo de serie y (ano, mes).
+        """
+        self.values = {
+            series: dict(periods) for series, periods in (values or {}).items()
+        }
+
+    def get_value(self, series: str, year: int, month: int) -> Optional[Decimal]:
+        return self.values.get(series, {}).get((year, month))
+
+    async def aget_value(
+        self, series: str, year: int, month: int
+    ) -> Optional[Decimal]:
+        return self.get_value(series, year, month)
+
+    def missing_periods(
+        self, series: str, periods: Iterable[Tuple[int, int]]
+    ) -> List[Tuple[int, int]]:
+        # Lo que no esta no se puede obtener de ningun otro sitio.
+        return []
+
+
+def default_index_provider(
+    client: Optional[IneClient] = None,
+    async_client: Optional[AsyncIneClient] = None,
+    use_snapshot: bool = True,
+) -> IndexProvider:
+    """
+    Devuelve la fuente de indices usada por defecto por las estrategias: la
+    copia local incluida en el paquete y, para lo que falte, la API del INE.
+
+    :param client: Cliente del INE. Por defecto el compartido.
+    :param async_client: Cliente asincrono del INE.
+    :param use_snapshot: Si es False se consulta solo la API del INE.
+    """
+    ine_provider = IneIndexProvider(client, async_client)
+    if not use_snapshot:
+        return ine_provider
+    return ChainedIndexProvider([BundledIndexProvider(), ine_provider])
@@ -1,22 +1,383 @@
+from __future__ import annotations
+
+import functools
 import json
 import logging
-from datetime import date
+import random
+import threading
+import time
+from datetime import date, datetime, timezone
+from email.utils import parsedate_to_datetime
+from decimal import Decimal
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+from arrendatools.rent_update import instrumentation
+from arrendatools.rent_update.deadline import Deadline, DeadlineExceeded, current_deadline
+from arrendatools.rent_update.index_cache import DiskIndexCache, MemoryIndexCache
+from arrendatools.rent_update.ine_payload import (
+    JSON_BACKENDS,
+    SeriesValues,
+    decode_series_values,
+    default_json_backend,
+)
+from arrendatools.rent_update.instrumentation import (
+    CACHE_COALESCED,
+    CACHE_DISK,
+    CACHE_MEMORY,
+    CACHE_MISS,
+    OUTCOME_ERROR,
+    OUTCOME_OK,
+    IneRequestEvent,
+)
+from arrendatools.rent_update.resilience import (
+    CircuitBreaker,
+    RateLimiter,
+    SingleFlight,
+)
+
+
+if TYPE_CHECKING:
+    import requests
+
+
+def __getattr__(name: str):
+    # requests se importa bajo demanda, pero sigue accesible como
+    # ine_client.requests, como antes de ser IneClient instanciable.
+    if name == "requests":
+        import requests
+
+        return requests
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+class _DefaultClientMethod:
+    """
+    Metodo de instancia que, llamado sobre la clase, se ejecuta con el
+    cliente compartido IneClient.default(). Mantiene la forma estatica
+    IneClient.fetch_series_data(...) anterior a los clientes instanciables.
+    """
 
-import requests
+    def __init__(self, func: Callable) -> None:
+        self._func = func
+        functools.update_wrapper(self, func)
+
+    def __get__(self, instance, owner=None):
+        if instance is not None:
+            return self._func.__get__(instance, owner)
+
+        @functools.wraps(self._func)
+        def call_default(*args, **kwargs):
+            return self._func(owner.default(), *args, **kwargs)
+
+        return call_default
 
 
 class IneClient:
     """Clase para conexion con la API del INE."""
 
     _BASE_URL = "https://servicios.ine.es/wstempus/js/ES/DATOS_SERIE"
+    _RETRY_STATUSES = (429, 500, 502, 503, 504)
+    _memory_cache: Optional[MemoryIndexCache] = MemoryIndexCache()
+    _disk_cache: Optional[DiskIndexCache] = None
+    _default: Optional["IneClient"] = None
+    _default_lock = threading.Lock()
+
+    def __init__(
+        self,
+        base_url: str = _BASE_URL,
+        timeout: float = 30,
+        pool_size: int = 10,
+        max_retries: int = 0,
+        backoff_factor: float = 0.5,
+        keep_alive: bool = True,
+        session: Optional[requests.Session] = None,
+        backoff_max: float = 10.0,
+        jitter: bool = True,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+        fallback_to_cache: bool = True,
+        rate_limiter: Optional[RateLimiter] = None,
+        coalesce: bool = True,
+        connect_timeout: Optional[float] = None,
+        json_backend: Optional[str] = None,
+    ) -> None:
+        """
+        Args:
+            base_url (str): URL base del servicio DATOS_SERIE del INE.
+            timeout (float): Segundos maximos de espera de la respuesta en
+                cada peticion (y de la conexion, si no se indica
+                connect_timeout). Dentro de un bloque deadline() se reduce a
+                lo que quede del plazo.
+            pool_size (int): Conexiones maximas mantenidas en el pool.
+            max_retries (int): Reintentos ante timeouts, errores de conexion o
+                estados 429/5xx.
+            backoff_factor (float): Espera base entre reintentos; se dobla en
+                cada intento.
+            keep_alive (bool): Si es False se cierra la conexion tras cada
+                peticion.
+            session (requests.Session | None): Sesion a reutilizar. Si no se
+                indica se crea una con el pool configurado.
+            backoff_max (float): Espera maxima entre reintentos. Si el INE pide
+                en Retry-After esperar mas, no se reintenta.
+            jitter (bool): Si es True cada espera es un valor aleatorio entre
+                0 y la espera exponencial, para no sincronizar reintentos.
+            circuit_breaker (CircuitBreaker | None): Circuito que corta las
+                peticiones tras varios fallos seguidos. Por defecto ninguno.
+            fallback_to_cache (bool): Si es True, cuando falla una peticion
+                por rango, prefetch_series devuelve los valores del rango que
+                haya en los caches en lugar de propagar el error.
+            rate_limiter (RateLimiter | None): Limitador de peticiones al INE,
+                que se puede compartir entre clientes. Por defecto ninguno.
+            coalesce (bool): Si es True las peticiones concurrentes a la misma
+                URL comparten una unica peticion en curso.
+            connect_timeout (float | None): Segundos maximos para establecer la
+                conexion. Por defecto, timeout.
+            json_backend (str | None): Decodificador usado por
+                fetch_series_values: "json" (biblioteca estandar) o "msgspec".
+                Por defecto "msgspec" si esta instalado.
+        """
+        if pool_size < 1:
+            raise ValueError("Pool size must be at least 1.")
+        if max_retries < 0:
+            raise ValueError("Max retries cannot be negative.")
+        if backoff_factor < 0 or backoff_max < 0:
+            raise ValueError("Backoff cannot be negative.")
+        if timeout <= 0 or (connect_timeout is not None and connect_timeout <= 0):
+            raise ValueError("Timeout must be greater than 0.")
+        if json_backend is None:
+            json_backend = default_json_backend()
+        elif json_backend not in JSON_BACKENDS:
+            raise ValueError(
+                f"Unknown JSON backend: {json_backend}. "
+                f"Available: {', '.join(JSON_BACKENDS)}"
+            )
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.connect_timeout = connect_timeout
+        self.json_backend = json_backend
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.backoff_max = backoff_max
+        self.jitter = jitter
+        self.circuit_breaker = circuit_breaker
+        self.fallback_to_cache = fallback_to_cache
+        self.rate_limiter = rate_limiter
+        self._single_flight = SingleFlight() if coalesce else None
+        if session is None:
+            # requests se importa al crear el primer cliente, no al importar
+            # el modulo, para no penalizar a quien no consulta el INE.
+            # Los reintentos los hace _get_json, no urllib3.
+            import requests
+            from requests.adapters import HTTPAdapter
+
+            session = requests.Session()
+            adapter = HTTPAdapter(
+                pool_connections=pool_size,
+                pool_maxsize=pool_size,
+                max_retries=0,
+            )
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+        if not keep_alive:
+            session.headers["Connection"] = "close"
+        self.session = session
+
+    def __enter__(self) -> "IneClient":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Cierra la sesion HTTP y sus conexiones."""
+        self.session.close()
+
+    @staticmethod
+    def default() -> "IneClient":
+        """Devuelve el cliente compartido usado cuando no se inyecta ninguno."""
+        if IneClient._default is None:
+            with IneClient._default_lock:
+                if IneClient._default is None:
+                    IneClient._default = IneClient()
+        return IneClient._default
+
+    @staticmethod
+    def set_default(client: Optional["IneClient"]) -> None:
+        """
+        Sustituye el cliente compartido.
+
+        Args:
+            client (IneClient | None): Cliente a usar o None para crear uno
+                nuevo con la configuracion por defecto en el siguiente uso.
+        """
+        IneClient._default = client
+
+    @staticmethod
+    def set_memory_cache(cache: Optional[MemoryIndexCache]) -> None:
+        """
+        Configura el cache en memoria compartido usado por fetch_series_value.
+
+        Args:
+            cache (MemoryIndexCache | None): Cache a usar o None para desactivarlo.
+        """
+        IneClient._memory_cache = cache
 
     @staticmethod
+    def set_disk_cache(cache: Optional[DiskIndexCache]) -> None:
+        """
+        Configura el cache persistente usado por fetch_series_value.
+
+        Args:
+            cache (DiskIndexCache | None): Cache a usar o None para desactivarlo.
+        """
+        IneClient._disk_cache = cache
+
+    def fetch_series_value(
+        self, series: str, year: int, month: int
+    ) -> Optional[Decimal]:
+        """
+        Obtiene el valor de una serie del INE para un ano y mes.
+
+        Consulta primero el cache en memoria y despues el persistente, si
+        estan configurados.
+
+        Args:
+            series (str): Codigo de la serie temporal.
+            year (int): Ano del dato.
+            month (int): Mes del dato.
+
+        Returns:
+            Decimal | None: Valor publicado o None si el INE no devuelve datos.
+        """
+        started = time.perf_counter() if instrumentation.enabled() else None
+        memory_cache = IneClient._memory_cache
+        if memory_cache is not None:
+            value = memory_cache.get(series, year, month)
+            if value is not None:
+                if started is not None:
+                    _emit_cache_hit(series, year, month, CACHE_MEMORY, started)
+                return value
+
+        disk_cache = IneClient._disk_cache
+        value = None
+        if disk_cache is not None:
+            value = disk_cache.get(series, year, month)
+            if value is not None and started is not None:
+                _emit_cache_hit(series, year, month, CACHE_DISK, started)
+
+        if value is None:
+            query_date = date(year, month, 1)
+            value = self.fetch_series_values(query_date, query_date, series).get(
+                (year, month)
+            )
+            if value is None:
+                return None
+            if disk_cache is not None:
+                disk_cache.set(series, year, month, value)
+
+        if memory_cache is not None:
+            memory_cache.set(series, year, month, value)
+        return value
+
+    def missing_periods(
+        self, series: str, periods: Iterable[Tuple[int, int]]
+    ) -> List[Tuple[int, int]]:
+        """
+        Devuelve los periodos (ano, mes) que no estan en ningun cache.
+
+        Args:
+            series (str): Codigo de la serie temporal.
+            periods (Iterable[tuple[int, int]]): Periodos a comprobar.
+
+        Returns:
+            list[tuple[int, int]]: Periodos sin valor en cache, ordenados.
+        """
+        memory_cache = IneClient._memory_cache
+        disk_cache = IneClient._disk_cache
+        missing = []
+        for year, month in sorted(set(periods)):
+            if memory_cache is not None and (series, year, month) in memory_cache:
+                continue
+            if disk_cache is not None:
+                value = disk_cache.get(series, year, month)
+                if value is not None:
+                    if memory_cache is not None:
+                        memory_cache.set(series, year, month, value)
+                    continue
+            missing.append((year, month))
+        return missing
+
+    def prefetch_series(
+        self, series: str, start_date: date, end_date: date
+    ) -> Dict[Tuple[int, int], Decimal]:
+        """
+        Obtiene en una sola peticion todos los valores mensuales de una serie
+        entre dos fechas y los guarda en los caches configurados.
+
+        Args:
+            series (str): Codigo de la serie temporal.
+            start_date (date): Fecha de inicio de la ventana.
+            end_date (date): Fecha de fin de la ventana.
+
+        Returns:
+            dict[tuple[int, int], Decimal]: Valores por (ano, mes).
+
+        Raises:
+            ValueError: Si las fechas no son validas.
+            ConnectionError: Si hay un problema con la conexion a la API.
+            DeadlineExceeded: Si se agota el plazo fijado con deadline().
+            json.JSONDecodeError: Si la respuesta de la API no es JSON valido.
+        """
+        try:
+            fetched = self.fetch_series_values(start_date, end_date, series)
+        except ConnectionError as err:
+            cached = self._cached_range(series, start_date, end_date)
+            if not (self.fallback_to_cache and cached):
+                raise
+            logging.warning(
+                "INE API unavailable (%s); using %d cached values of %s.",
+                err,
+                len(cached),
+                series,
+            )
+            return cached
+        memory_cache = IneClient._memory_cache
+        disk_cache = IneClient._disk_cache
+        values = dict(fetched)
+        if memory_cache is not None:
+            memory_cache.set_many(series, values)
+        if disk_cache is not None:
+            disk_cache.set_many(series, values)
+        return values
+
+    def _cached_range(
+        self, series: str, start_date: date, end_date: date
+    ) -> Dict[Tuple[int, int], Decimal]:
+        """Devuelve los valores de la serie entre dos fechas que hay en cache."""
+        memory_cache = IneClient._memory_cache
+        disk_cache = IneClient._disk_cache
+        values = {}
+        year, month = start_date.year, start_date.month
+        while (year, month) <= (end_date.year, end_date.month):
+            value = None
+            if memory_cache is not None:
+                value = memory_cache.get(series, year, month)
+            if value is None and disk_cache is not None:
+                value = disk_cache.get(series, year, month)
+            if value is not None:
+                values[(year, month)] = value
+            year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+        return values
+
+    @_DefaultClientMethod
     def fetch_series_data(
-        start_date: date, end_date: date, series: str
+        self, start_date: date, end_date: date, series: str
     ) -> dict:
         """
         Obtiene datos de una serie del INE.
 
+        Llamado sobre la clase, IneClient.fetch_series_data(...), usa el
+        cliente compartido IneClient.default().
+
         Args:
             start_date (date): Fecha de inicio para la serie.
             end_date (date): Fecha de fin para la serie.
@@ -27,9 +388,65 @@ class IneClient:
 
         Raises:
             ValueError: Si las fechas no son validas.
-            ConnectionError: Si hay un problema con la conexion a la API.
+            ConnectionError: Si hay un problema con la conexion a la API tras
+                los reintentos configurados.
+            CircuitOpenError: Si el circuito esta abierto; es un
+                ConnectionError.
+            DeadlineExceeded: Si se agota el plazo fijado con deadline(); es
+                un TimeoutError.
             json.JSONDecodeError: Si la respuesta de la API no es JSON valido.
         """
+        return self._fetch(start_date, end_date, series)
+
+    def fetch_series_values(
+        self, start_date: date, end_date: date, series: str
+    ) -> SeriesValues:
+        """
+        Obtiene los valores de una serie del INE entre dos fechas, ya
+        decodificados.
+
+        A diferencia de fetch_series_data no devuelve la respuesta completa:
+        solo se leen el periodo y el valor de cada dato, y el valor se
+        convierte a Decimal desde el texto del JSON, sin pasar por float.
+
+        Args:
+            start_date (date): Fecha de inicio para la serie.
+            end_date (date): Fecha de fin para la serie.
+            series (str): Codigo de la serie temporal.
+
+        Returns:
+            SeriesValues: Valores por (ano, mes); los meses sin dato no se
+                incluyen.
+
+        Raises:
+            ValueError: Si las fechas no son validas.
+            ConnectionError: Si hay un problema con la conexion a la API tras
+                los reintentos configurados.
+            CircuitOpenError: Si el circuito esta abierto; es un
+                ConnectionError.
+            DeadlineExceeded: Si se agota el plazo fijado con deadline(); es
+                un TimeoutError.
+            json.JSONDecodeError: Si la respuesta de la API no es JSON valido
+                o no tiene la estructura esperada.
+        """
+
+        def decode(content: bytes) -> SeriesValues:
+            return decode_series_values(content, series, self.json_backend)
+
+        return self._fetch(start_date, end_date, series, decode)
+
+    def _fetch(
+        self,
+        start_date: date,
+        end_date: date,
+        series: str,
+        decode: Optional[Callable[[bytes], SeriesValues]] = None,
+    ):
+        """
+        Hace la consulta de fetch_series_data o fetch_series_values,
+        notificando el evento de instrumentacion. Sin decode se devuelve la
+        respuesta JSON completa.
+        """
         if start_date > end_date:
             raise ValueError(
                 "Start date cannot be later than end date."
@@ -38,25 +455,208 @@ class IneClient:
         start_date_str = start_date.strftime("%Y%m%d")
         end_date_str = end_date.strftime("%Y%m%d")
         url = (
-            f"{IneClient._BASE_URL}/{series}?date={start_date_str}:{end_date_str}"
+            f"{self.base_url}/{series}?date={start_date_str}:{end_date_str}"
         )
 
+        # Las respuestas completas y las decodificadas no se comparten.
+        key = url if decode is None else (url, self.json_backend)
+        leader = False
+
+        def request():
+            nonlocal leader
+            leader = True
+            return self._get_json(url, decode)
+
+        if not instrumentation.enabled():
+            return self._coalesce(key, request)
+        started = time.perf_counter()
+        try:
+            data = self._coalesce(key, request)
+        except Exception as err:
+            instrumentation.emit(
+                IneRequestEvent(
+                    series=series,
+                    start_date=start_date,
+                    end_date=end_date,
+                    duration=time.perf_counter() - started,
+                    outcome=OUTCOME_ERROR,
+                    cache=CACHE_MISS if leader else CACHE_COALESCED,
+                    error=instrumentation.error_name(err),
+                )
+            )
+            raise
+        instrumentation.emit(
+            IneRequestEvent(
+                series=series,
+                start_date=start_date,
+                end_date=end_date,
+                duration=time.perf_counter() - started,
+                outcome=OUTCOME_OK,
+                cache=CACHE_MISS if leader else CACHE_COALESCED,
+            )
+        )
+        return data
+
+    def _coalesce(self, key, request):
+        """
+        Ejecuta la peticion o, si ya hay una en curso para la misma clave,
+        espera y devuelve su resultado (el mismo objeto para todos).
+
+        Si la peticion compartida falla porque se agoto el plazo de quien la
+        lanzo, las que esperaban no reciben ese error: vuelven a intentarlo,
+        cada una con su propio plazo.
+        """
+        if self._single_flight is None:
+            return request()
+        deadline = current_deadline()
+        while True:
+            ran = False
+
+            def run():
+                nonlocal ran
+                ran = True
+                return request()
+
+            try:
+                if deadline is None:
+                    return self._single_flight.do(key, run)[0]
+                return self._single_flight.do(key, run, deadline.check())[0]
+            except DeadlineExceeded:
+                if ran:
+                    raise
+            except TimeoutError as err:
+                raise deadline.exceeded("a shared INE API request") from err
+
+    def _get_json(self, url: str, decode: Optional[Callable[[bytes], SeriesValues]] = None):
+        """
+        Hace la peticion GET, con los reintentos y el circuito configurados,
+        y devuelve la respuesta JSON decodificada, con decode si se indica. Dentro de un bloque
+        deadline() no empieza intentos ni esperas que no quepan en el plazo.
+        """
+        deadline = current_deadline()
+        if deadline is not None:
+            deadline.check()
+        breaker = self.circuit_breaker
+        if breaker is not None:
+            breaker.before_request()
+        try:
+            return self._get_json_attempts(url, deadline, decode)
+        except DeadlineExceeded:
+            # Agotar el plazo del llamante no dice nada de la salud del INE.
+            if breaker is not None:
+                breaker.release()
+            raise
+
+    def _get_json_attempts(
+        self,
+        url: str,
+        deadline: Optional[Deadline],
+        decode: Optional[Callable[[bytes], SeriesValues]],
+    ):
+        """Bucle de intentos de _get_json."""
+        breaker = self.circuit_breaker
+        attempt = 0
+        while True:
+            if self.rate_limiter is not None:
+                self._acquire_rate_limit(deadline)
+            try:
+                data = self._get_json_once(url, self._request_timeout(deadline), decode)
+            except (ConnectionError, json.JSONDecodeError) as err:
+                cause = err.__cause__
+                if deadline is not None and deadline.expired() and _is_timeout(cause):
+                    raise deadline.exceeded("the INE API request") from cause
+                retry_after = _retry_after(cause)
+                if attempt < self.max_retries and _is_retryable(cause):
+                    delay = self._backoff(attempt, retry_after)
+                    if delay is not None and (
+                        deadline is None or delay < deadline.remaining()
+                    ):
+                        attempt += 1
+                        logging.warning(
+                            "Retrying INE API request in %.2f s (%d/%d).",
+                            delay,
+                            attempt,
+                            self.max_retries,
+                        )
+                        time.sleep(delay)
+                        continue
+                if breaker is not None:
+                    if _is_server_failure(cause):
+                        breaker.record_failure(retry_after)
+                    else:
+                        breaker.record_success()
+                raise
+            if breaker is not None:
+                breaker.record_success()
+            return data
+
+    def _acquire_rate_limit(self, deadline: Optional[Deadline]) -> None:
+        """Espera turno en el limitador sin pasarse del plazo."""
+        if deadline is None:
+            self.rate_limiter.acquire()
+            return
+        try:
+            self.rate_limiter.acquire(deadline.check())
+        except TimeoutError as err:
+            raise deadline.exceeded("the INE API rate limit wait") from err
+
+    def _request_timeout(
+        self, deadline: Optional[Deadline]
+    ) -> Union[float, Tuple[float, float]]:
+        """
+        Timeout a pasar a requests: un numero o (conexion, lectura), limitados
+        a lo que quede del plazo.
+        """
+        read_timeout = self.timeout
+        connect_timeout = self.connect_timeout
+        if deadline is not None:
+            remaining = deadline.check()
+            read_timeout = min(read_timeout, remaining)
+            if connect_timeout is not None:
+                connect_timeout = min(connect_timeout, remaining)
+        if connect_timeout is None:
+            return read_timeout
+        return (connect_timeout, read_timeout)
+
+    def _backoff(self, attempt: int, retry_after: Optional[float]) -> Optional[float]:
+        """
+        Devuelve la espera antes del siguiente intento, o None si no se debe
+        reintentar porque el INE pide esperar mas de backoff_max.
+        """
+        if retry_after is not None:
+            return retry_after if retry_after <= self.backoff_max else None
+        delay = min(self.backoff_max, self.backoff_factor * (2 ** attempt))
+        if self.jitter:
+            delay = random.uniform(0, delay)
+        return delay
+
+    def _get_json_once(
+        self,
+        url: str,
+        timeout: Union[float, Tuple[float, float]],
+        decode: Optional[Callable[[bytes], SeriesValues]] = None,
+    ):
+        """Hace un unico intento de la peticion GET."""
+        import requests
+
         try:
             logging.info("Requesting INE API: %s", url)
-            response = requests.get(url, timeout=30)
+            response = self.session.get(url, timeout=timeout)
             response.raise_for_status()
-        except requests.exceptions.Timeout:
+        except requests.exceptions.Timeout as err:
             logging.error("INE API request timed out.")
-            raise ConnectionError("The request timed out.")
+            raise ConnectionError("The request timed out.") from err
         except requests.exceptions.HTTPError as err:
             logging.error("HTTP error while calling INE API: %s", err)
-            raise ConnectionError(f"HTTP error while calling INE API: {err}")
+            raise ConnectionError(f"HTTP error while calling INE API: {err}") from err
         except requests.exceptions.RequestException as err:
             logging.error("Connection error while calling INE API: %s", err)
-            raise ConnectionError(f"Connection error while calling INE API: {err}")
+            raise ConnectionError(
+                f"Connection error while calling INE API: {err}"
+            ) from err
 
         try:
-            data = response.json()
+            data = response.json() if decode is None else decode(response.content)
             logging.info("INE API response parsed successfully.")
             return data
         except json.JSONDecodeError as err:
@@ -65,4 +665,74 @@ class IneClient:
                 f"Invalid JSON response: {err}",
                 response.text,
                 0,
-            )
+            ) from err
+
+
+def _emit_cache_hit(
+    series: str, year: int, month: int, cache: str, started: float
+) -> None:
+    query_date = date(year, month, 1)
+    instrumentation.emit(
+        IneRequestEvent(
+            series=series,
+            start_date=query_date,
+            end_date=query_date,
+            duration=time.perf_counter() - started,
+            outcome=OUTCOME_OK,
+            cache=cache,
+        )
+    )
+
+
+def _status_code(err: Optional[BaseException]) -> Optional[int]:
+    response = getattr(err, "response", None)
+    return getattr(response, "status_code", None)
+
+
+def _is_retryable(err: Optional[BaseException]) -> bool:
+    """Indica si el error de requests es transitorio."""
+    import requests
+
+    if isinstance(err, requests.exceptions.HTTPError):
+        return _status_code(err) in IneClient._RETRY_STATUSES
+    return isinstance(
+        err, (requests.exceptions.Timeout, requests.exceptions.ConnectionError)
+    )
+
+
+def _is_timeout(err: Optional[BaseException]) -> bool:
+    """Indica si el error de requests es un timeout de conexion o lectura."""
+    import requests
+
+    return isinstance(err, requests.exceptions.Timeout)
+
+
+def _is_server_failure(err: Optional[BaseException]) -> bool:
+    """
+    Indica si el error cuenta como fallo del INE para el circuito. Los errores
+    4xx (salvo 429) demuestran que el servicio responde.
+    """
+    status = _status_code(err)
+    return status is None or status >= 500 or status == 429
+
+
+def _retry_after(err: Optional[BaseException]) -> Optional[float]:
+    """Segundos de la cabecera Retry-After de la respuesta, si la hay."""
+    response = getattr(err, "response", None)
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+    value = headers.get("Retry-After")
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
@@ -0,0 +1,168 @@
+"""
+Decodificacion compacta de las respuestas de la API DATOS_SERIE del INE.
+
+Cada dato de la respuesta trae metadatos (Fecha, FK_TipoDato, Secreto...)
+que no se usan; aqui solo se leen Anyo, FK_Periodo y Valor, y Valor se
+convierte a Decimal a partir del texto del JSON, sin pasar por float. Si
+msgspec esta instalado se usa para decodificar solo esos campos.
+"""
+
+import json
+from decimal import Decimal
+from functools import lru_cache
+from typing import Iterable, Iterator, List, Mapping, Optional, Tuple, Union
+
+JSON_BACKEND_STDLIB = "json"
+JSON_BACKEND_MSGSPEC = "msgspec"
+JSON_BACKENDS = (JSON_BACKEND_STDLIB, JSON_BACKEND_MSGSPEC)
+
+Period = Tuple[int, int]
+
+
+class SeriesValues(Mapping):
+    """
+    Valores mensuales de una serie del INE por periodo (ano, mes).
+
+    Es un Mapping de solo lectura que guarda el primer periodo y una tupla
+    con el valor de cada mes consecutivo (None en los meses sin dato), en
+    lugar de un dict con una clave por mes.
+    """
+
+    __slots__ = ("series", "_start", "_values", "_count")
+
+    def __init__(
+        self,
+        series: str,
+        values: Union[Mapping[Period, Decimal], Iterable[Tuple[Period, Decimal]]] = (),
+    ) -> None:
+        """
+        Args:
+            series (str): Codigo de la serie temporal.
+            values (Mapping | Iterable): Valores por (ano, mes), como mapping
+                o como pares ((ano, mes), valor). Los valores None se ignoran.
+        """
+        if isinstance(values, Mapping):
+            values = values.items()
+        by_month = {
+            year * 12 + month - 1: value
+            for (year, month), value in values
+            if value is not None
+        }
+        self.series = series
+        self._start = min(by_month, default=0)
+        slots: List[Optional[Decimal]] = [None] * (
+            max(by_month, default=-1) - self._start + 1
+        )
+        for index, value in by_month.items():
+            slots[index - self._start] = value
+        self._values = tuple(slots)
+        self._count = len(by_month)
+
+    def __getitem__(self, period: Period) -> Decimal:
+        year, month = period
+        offset = year * 12 + month - 1 - self._start
+        if 0 <= offset < len(self._values):
+            value = self._values[offset]
+            if value is not None:
+                return value
+        raise KeyError(period)
+
+    def __iter__(self) -> Iterator[Period]:
+        for offset, value in enumerate(self._values):
+            if value is not None:
+                year, month = divmod(self._start + offset, 12)
+                yield (year, month + 1)
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __repr__(self) -> str:
+        return f"SeriesValues({self.series!r}, {dict(self)!r})"
+
+
+def default_json_backend() -> str:
+    """Devuelve JSON_BACKEND_MSGSPEC si msgspec esta instalado y, si no, JSON_BACKEND_STDLIB."""
+    return JSON_BACKEND_MSGSPEC if _msgspec_available() else JSON_BACKEND_STDLIB
+
+
+@lru_cache(maxsize=None)
+def _msgspec_available() -> bool:
+    from importlib.util import find_spec
+
+    return find_spec("msgspec") is not None
+
+
+def decode_series_values(
+    content: Union[bytes, str], series: str, backend: str = JSON_BACKEND_STDLIB
+) -> SeriesValues:
+    """
+    Decodifica una respuesta de DATOS_SERIE a SeriesValues.
+
+    Args:
+        content (bytes | str): Cuerpo de la respuesta.
+        series (str): Codigo de la serie temporal.
+        backend (str): JSON_BACKEND_STDLIB o JSON_BACKEND_MSGSPEC.
+
+    Returns:
+        SeriesValues: Valores publicados; los datos sin Valor se omiten.
+
+    Raises:
+        json.JSONDecodeError: Si el cuerpo no es JSON valido o no tiene la
+            estructura esperada.
+    """
+    if backend == JSON_BACKEND_MSGSPEC:
+        return SeriesValues(series, _decode_msgspec(content))
+    try:
+        payload = json.loads(content, parse_float=Decimal)
+        return SeriesValues(
+            series,
+            (
+                ((int(item["Anyo"]), int(item["FK_Periodo"])), _to_decimal(item["Valor"]))
+                for item in payload.get("Data", [])
+                if item.get("Valor") is not None
+            ),
+        )
+    except json.JSONDecodeError:
+        raise
+    except (AttributeError, KeyError, TypeError, ValueError, ArithmeticError) as err:
+        raise _payload_error(content, err) from err
+
+
+def _to_decimal(value) -> Decimal:
+    """Convierte Valor a Decimal; los numeros JSON ya llegan como Decimal o int."""
+    return value if isinstance(value, Decimal) else Decimal(str(value))
+
+
+def _decode_msgspec(content: Union[bytes, str]) -> List[Tuple[Period, Decimal]]:
+    decoder, error = _msgspec_decoder()
+    try:
+        payload = decoder.decode(content)
+    except error as err:
+        raise _payload_error(content, err) from err
+    return [
+        ((item.Anyo, item.FK_Periodo), item.Valor)
+        for item in payload.Data
+        if item.Valor is not None
+    ]
+
+
+@lru_cache(maxsize=None)
+def _msgspec_decoder():
+    """Crea, la primera vez que se usa, el decoder de msgspec con los campos necesarios."""
+    import msgspec
+
+    class Item(msgspec.Struct):
+        Anyo: int
+        FK_Periodo: int
+        Valor: Optional[Decimal] = None
+
+    class Payload(msgspec.Struct):
+        Data: List[Item] = []
+
+    return msgspec.json.Decoder(Payload), msgspec.MsgspecError
+
+
+def _payload_error(content: Union[bytes, str], err: BaseException) -> json.JSONDecodeError:
+    if isinstance(content, bytes):
+        content = content.decode("utf-8", "replace")
+    return json.JSONDecodeError(f"Unexpected INE API response: {err}", content, 0)
@@ -0,0 +1,83 @@
+# Copia local de las series del INE usadas por las estrategias.
+# Generado por "python -m arrendatools.rent_update.snapshot". No editar a mano.
+
+SNAPSHOT_VERSION = 1
+
+SNAPSHOT_DATE = "2026-10-17"
+
+SERIES = {
+    "IPC290751": {
+        2002: [
+            "58.717",
+            None,
+            None,
+            None,
+            None,
+            None,
+            None,
+            "60.030",
+            None,
+            None,
+            None,
+            None,
+        ],
+        2003: [
+            None,
+            None,
+            None,
+            None,
+            None,
+            None,
+            None,
+            "61.827",
+            None,
+            None,
+            None,
+            None,
+        ],
+        2025: [
+            "98.579",
+            None,
+            None,
+            None,
+            None,
+            None,
+            None,
+            None,
+            None,
+            None,
+            None,
+            None,
+        ],
+        2026: [
+            "100.836",
+            None,
+            None,
+            None,
+            None,
+            None,
+            None,
+            None,
+            None,
+            None,
+            None,
+            None,
+        ],
+    },
+    "IRAV1": {
+        2024: [
+            None,
+            None,
+            None,
+            None,
+            None,
+            None,
+            None,
+            None,
+            None,
+            None,
+            "2.2",
+            None,
+        ],
+    },
+}
@@ -0,0 +1,248 @@
+"""
+Instrumentacion de los calculos y de las consultas al INE.
+
+Los listeners registrados con add_listener() reciben un evento por cada
+calculo (CalculationEvent), por cada consulta de indices al INE
+(IneRequestEvent) y por cada estrategia creada por RentUpdateFactory
+(StrategyCreatedEvent). Sin listeners registrados no se mide nada: el coste es una
+comprobacion por llamada.
+"""
+
+import functools
+import logging
+import threading
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+from datetime import date
+from typing import Callable, List, Optional, Tuple, Union
+
+OUTCOME_OK = "ok"
+OUTCOME_ERROR = "error"
+
+# Origen del valor en las consultas al INE.
+CACHE_MEMORY = "memory"
+CACHE_DISK = "disk"
+CACHE_MISS = "miss"
+# Respuesta compartida de otra peticion identica en curso.
+CACHE_COALESCED = "coalesced"
+
+
+@dataclass(frozen=True)
+class CalculationEvent:
+    """Un calculo de una estrategia: calculate(), calculate_many() o acalculate()."""
+
+    strategy: str
+    operation: str
+    count: int
+    duration: float
+    outcome: str
+    error: Optional[str] = None
+
+
+@dataclass(frozen=True)
+class IneRequestEvent:
+    """
+    Una consulta de una serie del INE. Las respuestas servidas por los caches
+    de IneClient se notifican con cache CACHE_MEMORY o CACHE_DISK; las
+    peticiones a la API, con CACHE_MISS, y las que esperaron a otra peticion
+    identica en curso, con CACHE_COALESCED.
+    """
+
+    series: str
+    start_date: date
+    end_date: date
+    duration: float
+    outcome: str
+    cache: str = CACHE_MISS
+    error: Optional[str] = None
+
+
+@dataclass(frozen=True)
+class StrategyCreatedEvent:
+    """Una llamada a RentUpdateFactory.create()."""
+
+    strategy: str
+    shared: bool
+    outcome: str
+    error: Optional[str] = None
+
+
+Event = Union[CalculationEvent, IneRequestEvent, StrategyCreatedEvent]
+Listener = Callable[[Event], None]
+
+# Flag CO_COROUTINE de los objetos code; se evita importar inspect.
+_CO_COROUTINE = 0x80
+
+_listeners: Tuple[Listener, ...] = ()
+_listeners_lock = threading.Lock()
+# Evita notificar los calculos anidados (calculate() que llama a
+# calculate_many(), estrategias compuestas...): solo cuenta el exterior.
+_in_calculation: ContextVar[bool] = ContextVar("_in_calculation", default=False)
+
+
+def add_listener(listener: Listener) -> None:
+    """
+    Registra una funcion que recibira todos los eventos.
+
+    Los listeners se llaman de forma sincrona en el hilo que hace el
+    calculo, por lo que deben ser rapidos. Sus excepciones se registran en el
+    log y no interrumpen el calculo.
+
+    :param listener: Funcion que recibe cada evento.
+    """
+    global _listeners
+    with _listeners_lock:
+        _listeners = _listeners + (listener,)
+
+
+def remove_listener(listener: Listener) -> None:
+    """
+    Elimina un listener registrado con add_listener().
+
+    :param listener: Funcion a eliminar.
+    :raises ValueError: Si el listener no estaba registrado.
+    """
+    global _listeners
+    with _listeners_lock:
+        if listener not in _listeners:
+            raise ValueError("Listener is not registered.")
+        listeners = list(_listeners)
+        listeners.remove(listener)
+        _listeners = tuple(listeners)
+
+
+def enabled() -> bool:
+    """Indica si hay algun listener registrado."""
+    return bool(_listeners)
+
+
+def emit(event: Event) -> None:
+    """
+    Envia un evento a todos los listeners registrados.
+
+    :param event: Evento a enviar.
+    """
+    for listener in _listeners:
+        try:
+            listener(event)
+        except Exception:
+            logging.exception("Instrumentation listener failed.")
+
+
+def error_name(err: BaseException) -> str:
+    """Nombre del tipo de error; si se encadeno con 'from', el del original."""
+    return type(err.__cause__ or err).__name__
+
+
+class EventCollector:
+    """
+    Listener que guarda los eventos en memoria. Se registra al entrar en el
+    bloque with y se elimina al salir.
+    """
+
+    def __init__(self) -> None:
+        self.events: List[Event] = []
+        self._lock = threading.Lock()
+
+    def __call__(self, event: Event) -> None:
+        with self._lock:
+            self.events.append(event)
+
+    def __enter__(self) -> "EventCollector":
+        add_listener(self)
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        remove_listener(self)
+
+    def calculations(self) -> List[CalculationEvent]:
+        """Devuelve los eventos de calculo recibidos."""
+        return [event for event in self.events if isinstance(event, CalculationEvent)]
+
+    def ine_requests(self) -> List[IneRequestEvent]:
+        """Devuelve los eventos de consulta al INE recibidos."""
+        return [event for event in self.events if isinstance(event, IneRequestEvent)]
+
+
+def _strategy_name(method) -> str:
+    return getattr(method, "key", None) or type(method).__name__
+
+
+def _count(operation: str, args, result) -> int:
+    if not operation.endswith("_many"):
+        return 1
+    for value in (result, args[0] if args else None):
+        if hasattr(value, "__len__"):
+            return len(value)
+    return 0
+
+
+def instrument_calculation(func: Callable) -> Callable:
+    """
+    Decora un metodo de calculo de RentUpdateMethod para notificar un
+    CalculationEvent por llamada. RentUpdateMethod lo aplica automaticamente a
+    calculate(), calculate_many() y acalculate() de sus subclases.
+    """
+    if getattr(func, "_instrumented", False):
+        return func
+    operation = func.__name__
+
+    if func.__code__.co_flags & _CO_COROUTINE:
+        @functools.wraps(func)
+        async def async_wrapper(self, *args, **kwargs):
+            if not _listeners or _in_calculation.get():
+                return await func(self, *args, **kwargs)
+            token = _in_calculation.set(True)
+            started = time.perf_counter()
+            try:
+                result = await func(self, *args, **kwargs)
+            except Exception as err:
+                _emit_calculation(self, operation, args, None, started, err)
+                raise
+            finally:
+                _in_calculation.reset(token)
+            _emit_calculation(self, operation, args, result, started)
+            return result
+
+        async_wrapper._instrumented = True
+        return async_wrapper
+
+    @functools.wraps(func)
+    def wrapper(self, *args, **kwargs):
+        if not _listeners or _in_calculation.get():
+            return func(self, *args, **kwargs)
+        token = _in_calculation.set(True)
+        started = time.perf_counter()
+        try:
+            result = func(self, *args, **kwargs)
+        except Exception as err:
+            _emit_calculation(self, operation, args, None, started, err)
+            raise
+        finally:
+            _in_calculation.reset(token)
+        _emit_calculation(self, operation, args, result, started)
+        return result
+
+    wrapper._instrumented = True
+    return wrapper
+
+
+def _emit_calculation(
+    method,
+    operation: str,
+    args,
+    result,
+    started: float,
+    err: Optional[BaseException] = None,
+) -> None:
+    emit(
+        CalculationEvent(
+            strategy=_strategy_name(method),
+            operation=operation,
+            count=_count(operation, args, result),
+            duration=time.perf_counter() - started,
+            outcome=OUTCOME_OK if err is None else OUTCOME_ERROR,
+            error=None if err is None else error_name(err),
+        )
+    )
@@ -0,0 +1,369 @@
+"""
+Metricas de las actualizaciones de renta en formato de texto de Prometheus.
+
+Las metricas se alimentan de los eventos de instrumentation: enable_metrics()
+registra un listener que actualiza contadores e histogramas con cada calculo,
+cada consulta al INE y cada estrategia creada por RentUpdateFactory.
+exposition() devuelve el texto que puede servir un endpoint /metrics. No
+depende de ninguna libreria de Prometheus.
+"""
+
+import bisect
+import math
+import threading
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from arrendatools.rent_update import instrumentation
+from arrendatools.rent_update.instrumentation import (
+    CACHE_MISS,
+    OUTCOME_ERROR,
+    CalculationEvent,
+    Event,
+    IneRequestEvent,
+    StrategyCreatedEvent,
+)
+
+# Limites, en segundos, de los histogramas de latencia.
+DEFAULT_BUCKETS = (
+    0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0,
+)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values))
+    return "{" + pairs + "}"
+
+
+def _format_value(value: float) -> str:
+    if isinstance(value, int):
+        return str(value)
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(value)
+
+
+class _Metric:
+    """Base de las metricas: nombre, ayuda, etiquetas y valores por etiqueta."""
+
+    type_name = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _label_values(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(
+                f"Metric {self.name} expects labels: {', '.join(self.labelnames)}."
+            )
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def samples(self) -> List[Tuple[str, str, float]]:
+        """Devuelve las muestras (nombre, etiquetas formateadas, valor)."""
+        raise NotImplementedError
+
+    def expose(self) -> str:
+        lines = [
+            f"# HELP {self.name} {_escape(self.documentation)}",
+            f"# TYPE {self.name} {self.type_name}",
+        ]
+        for name, labels, value in self.samples():
+            lines.append(f"{name}{labels} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+class Counter(_Metric):
+    """Contador que solo puede crecer."""
+
+    type_name = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        """
+        Incrementa el contador.
+
+        :param amount: Cantidad a sumar; no puede ser negativa.
+        :param labels: Valor de cada etiqueta.
+        """
+        if amount < 0:
+            raise ValueError("Counters can only be incremented.")
+        key = self._label_values(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels: str) -> float:
+        """Devuelve el valor actual para unas etiquetas (0 si no existe)."""
+        return self._values.get(self._label_values(labels), 0)
+
+    def samples(self) -> List[Tuple[str, str, float]]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [
+            (self.name, _format_labels(self.labelnames, key), value)
+            for key, value in items
+        ]
+
+
+class Gauge(_Metric):
+    """Valor que puede subir o bajar."""
+
+    type_name = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def set(self, value: float, **labels: str) -> None:
+        """Fija el valor para unas etiquetas."""
+        key = self._label_values(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def value(self, **labels: str) -> float:
+        """Devuelve el valor actual para unas etiquetas (0 si no existe)."""
+        return self._values.get(self._label_values(labels), 0)
+
+    def samples(self) -> List[Tuple[str, str, float]]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [
+            (self.name, _format_labels(self.labelnames, key), value)
+            for key, value in items
+        ]
+
+
+class Histogram(_Metric):
+    """Histograma acumulativo con limites fijos."""
+
+    type_name = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Iterable[float] = DEFAULT_BUCKETS,
+    ) -> None:
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        if not self.buckets:
+            raise ValueError("At least one bucket is required.")
+        # Por etiquetas: observaciones por intervalo (el ultimo es +Inf) y suma.
+        self._counts: Dict[Tuple[str, ...], List[int]] = {}
+        self._sums: Dict[Tuple[str, ...], float] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        """Registra una observacion."""
+        key = self._label_values(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            counts = self._counts.get(key)
+            if counts is None:
+                counts = self._counts[key] = [0] * (len(self.buckets) + 1)
+                self._sums[key] = 0.0
+            counts[index] += 1
+            self._sums[key] += value
+
+    def count(self, **labels: str) -> int:
+        """Devuelve el numero de observaciones para unas etiquetas."""
+        return sum(self._counts.get(self._label_values(labels), ()))
+
+    def samples(self) -> List[Tuple[str, str, float]]:
+        with self._lock:
+            items = sorted((key, list(counts)) for key, counts in self._counts.items())
+            sums = dict(self._sums)
+        labelnames = self.labelnames + ("le",)
+        samples = []
+        for key, counts in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), counts):
+                cumulative += count
+                labels = _format_labels(labelnames, key + (_format_value(float(bound)),))
+                samples.append((f"{self.name}_bucket", labels, cumulative))
+            labels = _format_labels(self.labelnames, key)
+            samples.append((f"{self.name}_sum", labels, sums[key]))
+            samples.append((f"{self.name}_count", labels, cumulative))
+        return samples
+
+
+class MetricsRegistry:
+    """Conjunto de metricas que se exponen juntas."""
+
+    def __init__(self) -> None:
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _add(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                if type(existing) is not type(metric) or existing.labelnames != metric.labelnames:
+                    raise ValueError(f"Metric {metric.name} is already registered.")
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        """Crea, o devuelve si ya existe, un contador."""
+        return self._add(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        """Crea, o devuelve si ya existe, un gauge."""
+        return self._add(Gauge(name, documentation, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Iterable[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        """Crea, o devuelve si ya existe, un histograma."""
+        return self._add(Histogram(name, documentation, labelnames, buckets))
+
+    def get(self, name: str) -> Optional[_Metric]:
+        """Devuelve la metrica con ese nombre, o None."""
+        return self._metrics.get(name)
+
+    def expose(self) -> str:
+        """Devuelve todas las metricas en el formato de texto de Prometheus."""
+        with self._lock:
+            metrics = sorted(self._metrics.values(), key=lambda metric: metric.name)
+        return "".join(metric.expose() for metric in metrics)
+
+
+class RentUpdateMetrics:
+    """
+    Listener de instrumentation que mantiene las metricas de calculos,
+    peticiones al INE, caches de indices y estrategias creadas.
+    """
+
+    def __init__(self, registry: Optional[MetricsRegistry] = None) -> None:
+        """
+        :param registry: Registro donde crear las metricas. Por defecto uno
+            nuevo.
+        """
+        self.registry = registry if registry is not None else MetricsRegistry()
+        self.calculations = self.registry.counter(
+            "arrendatools_calculations_total",
+            "Rents calculated, by strategy and outcome.",
+            ("strategy", "outcome"),
+        )
+        self.calculation_seconds = self.registry.histogram(
+            "arrendatools_calculation_duration_seconds",
+            "Duration of calculate/calculate_many/acalculate calls.",
+            ("strategy", "operation"),
+        )
+        self.ine_requests = self.registry.counter(
+            "arrendatools_ine_requests_total",
+            "Requests sent to the INE API, by series and outcome.",
+            ("series", "outcome"),
+        )
+        self.ine_failures = self.registry.counter(
+            "arrendatools_ine_failures_total",
+            "Failed INE API requests, by error type.",
+            ("error",),
+        )
+        self.ine_request_seconds = self.registry.histogram(
+            "arrendatools_ine_request_duration_seconds",
+            "Duration of INE API requests.",
+            ("series",),
+        )
+        self.index_lookups = self.registry.counter(
+            "arrendatools_index_lookups_total",
+            "INE series lookups, by what served them (memory, disk, coalesced or miss).",
+            ("cache",),
+        )
+        self.cache_hit_ratio = self.registry.gauge(
+            "arrendatools_index_cache_hit_ratio",
+            "Share of INE series lookups served without a new INE request.",
+        )
+        self.strategies_created = self.registry.counter(
+            "arrendatools_strategies_created_total",
+            "Strategies created by RentUpdateFactory, by key, sharing and outcome.",
+            ("strategy", "shared", "outcome"),
+        )
+        self._lookups = 0
+        self._hits = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, event: Event) -> None:
+        if isinstance(event, CalculationEvent):
+            self._on_calculation(event)
+        elif isinstance(event, IneRequestEvent):
+            self._on_ine_request(event)
+        elif isinstance(event, StrategyCreatedEvent):
+            self.strategies_created.inc(
+                strategy=event.strategy,
+                shared=str(event.shared).lower(),
+                outcome=event.outcome,
+            )
+
+    def _on_calculation(self, event: CalculationEvent) -> None:
+        self.calculations.inc(event.count, strategy=event.strategy, outcome=event.outcome)
+        self.calculation_seconds.observe(
+            event.duration, strategy=event.strategy, operation=event.operation
+        )
+
+    def _on_ine_request(self, event: IneRequestEvent) -> None:
+        self.index_lookups.inc(cache=event.cache)
+        with self._lock:
+            self._lookups += 1
+            if event.cache != CACHE_MISS:
+                self._hits += 1
+            self.cache_hit_ratio.set(self._hits / self._lookups)
+        if event.cache != CACHE_MISS:
+            return
+        self.ine_requests.inc(series=event.series, outcome=event.outcome)
+        self.ine_request_seconds.observe(event.duration, series=event.series)
+        if event.outcome == OUTCOME_ERROR:
+            self.ine_failures.inc(error=event.error or "unknown")
+
+
+_enabled: Optional[RentUpdateMetrics] = None
+_enabled_lock = threading.Lock()
+
+
+def enable_metrics(registry: Optional[MetricsRegistry] = None) -> RentUpdateMetrics:
+    """
+    Empieza a recoger metricas. Si ya estaban activas, devuelve el listener
+    existente.
+
+    :param registry: Registro donde crear las metricas. Por defecto uno nuevo.
+    :return: Listener con las metricas.
+    """
+    global _enabled
+    with _enabled_lock:
+        if _enabled is None:
+            _enabled = RentUpdateMetrics(registry)
+            instrumentation.add_listener(_enabled)
+        return _enabled
+
+
+def disable_metrics() -> None:
+    """Deja de recoger metricas; las recogidas hasta ahora se descartan."""
+    global _enabled
+    with _enabled_lock:
+        if _enabled is not None:
+            instrumentation.remove_listener(_enabled)
+            _enabled = None
+
+
+def exposition() -> str:
+    """
+    Devuelve las metricas activas en el formato de texto de Prometheus, o una
+    cadena vacia si no se llamo a enable_metrics().
+    """
+    metrics = _enabled
+    return metrics.registry.expose() if metrics is not None else ""
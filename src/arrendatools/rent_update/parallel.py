@@ -0,0 +1,178 @@
+"""Calculo de lotes grandes de rentas repartido entre varios procesos."""
+
+import copy
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+from decimal import Decimal
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+from arrendatools.rent_update.base import (
+    RentUpdateInput,
+    RentUpdateMethod,
+    RentUpdateResult,
+)
+from arrendatools.rent_update.factory import RentUpdateFactory
+from arrendatools.rent_update.index_provider import (
+    IndexProvider,
+    StaticIndexProvider,
+    default_index_provider,
+)
+
+
+def resolve_indices(
+    method: RentUpdateMethod,
+    inputs: Iterable[RentUpdateInput],
+    provider: Optional[IndexProvider] = None,
+) -> StaticIndexProvider:
+    """
+    Obtiene todos los indices que necesita un conjunto de calculos.
+
+    Para cada serie se pide en una sola consulta por rango lo que la fuente
+    no tiene a mano, y el resto se lee de la fuente.
+
+    :param method: Estrategia que hara los calculos.
+    :param inputs: Datos de entrada de cada renta.
+    :param provider: Fuente de indices. Por defecto la de la estrategia o, si
+        no tiene, default_index_provider().
+    :return: Fuente estatica con los indices encontrados.
+    """
+    if provider is None:
+        provider = getattr(method, "provider", None) or default_index_provider()
+    values: Dict[str, Dict[Tuple[int, int], Decimal]] = {}
+    for series, periods in method.index_periods(inputs).items():
+        missing = provider.missing_periods(series, periods)
+        fetched: Dict[Tuple[int, int], Decimal] = {}
+        if len(missing) > 1:
+            fetched = provider.get_range(
+                series, date(*missing[0], 1), date(*missing[-1], 1)
+            )
+        series_values = values.setdefault(series, {})
+        for year, month in periods:
+            value = fetched.get((year, month))
+            if value is None:
+                value = provider.get_value(series, year, month)
+            if value is not None:
+                series_values[(year, month)] = value
+    return StaticIndexProvider(values)
+
+
+def _calculate_chunk(
+    method: RentUpdateMethod, chunk: List[RentUpdateInput]
+) -> List[RentUpdateResult]:
+    return method.calculate_many(chunk)
+
+
+def _with_provider(
+    method: RentUpdateMethod, provider: StaticIndexProvider
+) -> RentUpdateMethod:
+    """
+    Copia la estrategia, con su configuracion, usando provider como fuente de
+    indices. La estrategia original no se modifica.
+    """
+    method = copy.copy(method)
+    if method.uses_index_provider:
+        method.provider = provider
+    return method
+
+
+class ParallelExecutor:
+    """
+    Reparte el calculo de un lote de rentas entre varios procesos.
+
+    Los indices se resuelven antes en el proceso principal y se envian a los
+    procesos, junto con una copia de la estrategia, en una StaticIndexProvider,
+    de modo que estos nunca acceden a la red. Cada proceso ejecuta calculate_many() sobre un trozo contiguo de las
+    entradas, por lo que los resultados son identicos a los del calculo
+    secuencial y se devuelven en el mismo orden.
+    """
+
+    def __init__(
+        self, workers: Optional[int] = None, chunk_size: Optional[int] = None
+    ) -> None:
+        """
+        :param workers: Numero de procesos. Por defecto, uno por CPU.
+        :param chunk_size: Entradas por tarea. Por defecto se reparten en
+            cuatro tareas por proceso.
+        """
+        workers = workers if workers is not None else os.cpu_count() or 1
+        if workers < 1:
+            raise ValueError("Workers must be at least 1.")
+        if chunk_size is not None and chunk_size < 1:
+            raise ValueError("Chunk size must be at least 1.")
+        self.workers = workers
+        self.chunk_size = chunk_size
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def __enter__(self) -> "ParallelExecutor":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Detiene los procesos del pool, si se llegaron a crear."""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def calculate_many(
+        self,
+        method: Union[str, RentUpdateMethod],
+        inputs: Iterable[RentUpdateInput],
+        provider: Optional[IndexProvider] = None,
+    ) -> List[RentUpdateResult]:
+        """
+        Calcula la actualizacion de un conjunto de rentas en paralelo.
+
+        :param method: Estrategia o clave registrada en RentUpdateFactory.
+        :param inputs: Datos de entrada de cada renta.
+        :param provider: Fuente de indices con la que resolverlos. Por defecto
+            la de la estrategia.
+        :return: Resultados en el mismo orden que las entradas.
+        """
+        if isinstance(method, str):
+            method = RentUpdateFactory.create(method, provider)
+        inputs = list(inputs)
+        if self.workers == 1 or len(inputs) < 2:
+            return method.calculate_many(inputs)
+
+        static_provider = resolve_indices(method, inputs, provider)
+        chunk_size = self.chunk_size or math.ceil(len(inputs) / (self.workers * 4))
+        chunks = [
+            inputs[start:start + chunk_size]
+            for start in range(0, len(inputs), chunk_size)
+        ]
+        worker_method = _with_provider(method, static_provider)
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers)
+        futures = [
+            self._executor.submit(_calculate_chunk, worker_method, chunk)
+            for chunk in chunks
+        ]
+        results: List[RentUpdateResult] = []
+        for future in futures:
+            results.extend(future.result())
+        return results
+
+
+def calculate_parallel(
+    method: Union[str, RentUpdateMethod],
+    inputs: Iterable[RentUpdateInput],
+    workers: Optional[int] = None,
+    chunk_size: Optional[int] = None,
+    provider: Optional[IndexProvider] = None,
+) -> List[RentUpdateResult]:
+    """
+    Atajo para calcular un lote con un ParallelExecutor de un solo uso.
+
+    :param method: Estrategia o clave registrada en RentUpdateFactory.
+    :param inputs: Datos de entrada de cada renta.
+    :param workers: Numero de procesos. Por defecto, uno por CPU.
+    :param chunk_size: Entradas por tarea.
+    :param provider: Fuente de indices con la que resolverlos.
+    :return: Resultados en el mismo orden que las entradas.
+    """
+    with ParallelExecutor(workers, chunk_size) as executor:
+        return executor.calculate_many(method, inputs, provider)
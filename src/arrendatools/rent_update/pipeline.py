@@ -0,0 +1,333 @@
+"""Recalculo masivo de rentas leyendo y escribiendo ficheros CSV o JSONL."""
+
+import csv
+import json
+import os
+from dataclasses import dataclass
+from decimal import Decimal, InvalidOperation, getcontext
+from itertools import islice
+from typing import IO, Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from arrendatools.rent_update.base import (
+    RentUpdateInput,
+    RentUpdateMethod,
+    RentUpdateResult,
+)
+from arrendatools.rent_update.factory import RentUpdateFactory
+from arrendatools.rent_update.index_provider import IndexProvider
+
+FORMAT_CSV = "csv"
+FORMAT_JSONL = "jsonl"
+_FORMATS = {".csv": FORMAT_CSV, ".jsonl": FORMAT_JSONL, ".ndjson": FORMAT_JSONL}
+
+# Columnas que se anaden a cada fila de salida.
+RESULT_COLUMNS = (
+    "updated_amount",
+    "variation_rate",
+    "index_start",
+    "index_end",
+    "error",
+)
+
+PathOrFile = Union[str, os.PathLike, IO[str]]
+
+
+@dataclass(frozen=True)
+class PipelineStats:
+    rows: int
+    errors: int
+
+
+def detect_format(path: Union[str, os.PathLike]) -> str:
+    """
+    Deduce el formato de un fichero a partir de su extension.
+
+    :param path: Ruta del fichero.
+    :return: "csv" o "jsonl".
+    :raises ValueError: Si la extension no es conocida.
+    """
+    extension = os.path.splitext(os.fspath(path))[1].lower()
+    if extension not in _FORMATS:
+        raise ValueError(
+            f"Unknown file format: {extension or os.fspath(path)}. "
+            f"Available: {', '.join(sorted(_FORMATS))}"
+        )
+    return _FORMATS[extension]
+
+
+def _resolve_format(source: PathOrFile, file_format: Optional[str]) -> str:
+    if file_format is not None:
+        if file_format not in (FORMAT_CSV, FORMAT_JSONL):
+            raise ValueError(
+                f"Unknown file format: {file_format}. "
+                f"Available: {FORMAT_CSV}, {FORMAT_JSONL}"
+            )
+        return file_format
+    if hasattr(source, "read") or hasattr(source, "write"):
+        raise ValueError("File format is required when passing a file object.")
+    return detect_format(source)
+
+
+def _parse_rows(handle: IO[str], file_format: str) -> Iterator[Dict[str, Any]]:
+    if file_format == FORMAT_CSV:
+        yield from csv.DictReader(handle)
+        return
+    for line in handle:
+        if line.strip():
+            yield json.loads(line, parse_float=Decimal)
+
+
+def read_rows(
+    source: PathOrFile, file_format: Optional[str] = None
+) -> Iterator[Dict[str, Any]]:
+    """
+    Lee las filas de un fichero CSV o JSONL de una en una.
+
+    :param source: Ruta o fichero abierto en modo texto.
+    :param file_format: "csv" o "jsonl". Por defecto se deduce de la extension.
+    :return: Iterador de filas (diccionarios).
+    """
+    file_format = _resolve_format(source, file_format)
+    if hasattr(source, "read"):
+        yield from _parse_rows(source, file_format)
+        return
+    with open(source, newline="", encoding="utf-8") as handle:
+        yield from _parse_rows(handle, file_format)
+
+
+def _to_decimal(row: Dict[str, Any], field: str) -> Optional[Decimal]:
+    value = row.get(field)
+    if value is None or value == "":
+        return None
+    if not isinstance(value, Decimal):
+        try:
+            value = Decimal(str(value).strip())
+        except InvalidOperation:
+            raise ValueError(f"Field '{field}' must be a decimal number: {value}")
+    # NaN e Infinity no son importes validos, y un valor con mas digitos
+    # enteros que la precision del contexto no se puede redondear a centimos.
+    if not value.is_finite():
+        raise ValueError(f"Field '{field}' must be a finite decimal number: {value}")
+    if value and value.adjusted() >= getcontext().prec - 2:
+        raise ValueError(f"Field '{field}' is out of range: {value}")
+    return value
+
+
+def _to_int(row: Dict[str, Any], field: str) -> Optional[int]:
+    value = row.get(field)
+    if value is None or value == "":
+        return None
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"Field '{field}' must be an integer: {value}")
+
+
+def iter_batches(
+    rows: Iterable[Dict[str, Any]], batch_size: int
+) -> Iterator[List[Dict[str, Any]]]:
+    """Agrupa las filas en listas de hasta batch_size elementos."""
+    rows = iter(rows)
+    while True:
+        batch = list(islice(rows, batch_size))
+        if not batch:
+            return
+        yield batch
+
+
+def row_to_input(row: Dict[str, Any]) -> RentUpdateInput:
+    """
+    Convierte una fila en un RentUpdateInput.
+
+    Usa las columnas amount, data, month, year_start y year_end; las vacias se
+    consideran no informadas.
+
+    :raises ValueError: Si algun valor no es valido.
+    """
+    amount = _to_decimal(row, "amount")
+    if amount is None:
+        raise ValueError("Field 'amount' is required.")
+    return RentUpdateInput(
+        amount=amount,
+        data=_to_decimal(row, "data"),
+        month=_to_int(row, "month"),
+        year_start=_to_int(row, "year_start"),
+        year_end=_to_int(row, "year_end"),
+    )
+
+
+class RentUpdatePipeline:
+    """
+    Calcula la actualizacion de un flujo de filas sin cargarlo en memoria.
+
+    Las filas se procesan por lotes de tamano fijo; dentro de cada lote se
+    agrupan por estrategia y se calculan con calculate_many() para obtener
+    cada indice una sola vez. Los errores de una fila no detienen el proceso:
+    se informan en la columna "error" de su fila de salida.
+    """
+
+    def __init__(
+        self,
+        method: Optional[str] = None,
+        method_column: Optional[str] = "method",
+        provider: Optional[IndexProvider] = None,
+        batch_size: int = 1000,
+    ) -> None:
+        """
+        :param method: Estrategia (clave de RentUpdateFactory) para todas las
+            filas. Si se indica, tiene prioridad sobre method_column.
+        :param method_column: Columna con la estrategia de cada fila.
+        :param provider: Fuente de indices a inyectar en las estrategias.
+        :param batch_size: Numero de filas que se calculan juntas.
+        """
+        if method is None and method_column is None:
+            raise ValueError("A method or a method column is required.")
+        if batch_size < 1:
+            raise ValueError("Batch size must be at least 1.")
+        self.method = method
+        self.method_column = method_column
+        self.provider = provider
+        self.batch_size = batch_size
+        self._strategies: Dict[str, RentUpdateMethod] = {}
+
+    def _strategy(self, row: Dict[str, Any]) -> Tuple[str, RentUpdateMethod]:
+        key = self.method
+        if key is None:
+            key = row.get(self.method_column) or ""
+            if not key:
+                raise ValueError(f"Field '{self.method_column}' is required.")
+        if key not in self._strategies:
+            self._strategies[key] = RentUpdateFactory.create(key, self.provider)
+        return key, self._strategies[key]
+
+    @staticmethod
+    def _output(
+        row: Dict[str, Any],
+        result: Optional[RentUpdateResult] = None,
+        error: Optional[Exception] = None,
+    ) -> Dict[str, Any]:
+        output = dict(row)
+        for column in RESULT_COLUMNS[:-1]:
+            output[column] = getattr(result, column) if result is not None else None
+        output["error"] = str(error) if error is not None else None
+        return output
+
+    def process(self, rows: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+        """
+        Calcula la actualizacion de cada fila.
+
+        :param rows: Filas de entrada; se consumen de forma perezosa.
+        :return: Iterador con las filas de entrada mas RESULT_COLUMNS, en el
+            mismo orden.
+        """
+        for batch in iter_batches(rows, self.batch_size):
+            yield from self.process_batch(batch)
+
+    def process_batch(self, batch: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Calcula la actualizacion de un lote de filas.
+
+        :param batch: Filas de entrada.
+        :return: Filas de salida, en el mismo orden.
+        """
+        outputs: List[Optional[Dict[str, Any]]] = [None] * len(batch)
+        groups: Dict[str, List[Tuple[int, RentUpdateInput]]] = {}
+        for position, row in enumerate(batch):
+            try:
+                key, _ = self._strategy(row)
+                groups.setdefault(key, []).append((position, row_to_input(row)))
+            except ValueError as err:
+                outputs[position] = self._output(row, error=err)
+
+        for key, items in groups.items():
+            strategy = self._strategies[key]
+            try:
+                results = strategy.calculate_many([item for _, item in items])
+            except ValueError:
+                # Alguna fila no es valida: se calculan una a una para
+                # informar el error solo en las que fallan.
+                results = None
+            for index, (position, item) in enumerate(items):
+                row = batch[position]
+                if results is not None:
+                    outputs[position] = self._output(row, results[index])
+                    continue
+                try:
+                    outputs[position] = self._output(row, strategy.calculate(item))
+                except ValueError as err:
+                    outputs[position] = self._output(row, error=err)
+        return outputs
+
+
+def _serialize(value: Any) -> Any:
+    if isinstance(value, Decimal):
+        return str(value)
+    return value
+
+
+def _write(handle: IO[str], rows: Iterable[Dict[str, Any]], file_format: str) -> PipelineStats:
+    count = errors = 0
+    writer = None
+    for row in rows:
+        count += 1
+        if row.get("error"):
+            errors += 1
+        if file_format == FORMAT_JSONL:
+            handle.write(json.dumps(row, default=_serialize, ensure_ascii=False) + "\n")
+            continue
+        if writer is None:
+            writer = csv.DictWriter(handle, fieldnames=list(row), extrasaction="ignore")
+            writer.writeheader()
+        writer.writerow(
+            {key: "" if value is None else _serialize(value) for key, value in row.items()}
+        )
+    return PipelineStats(rows=count, errors=errors)
+
+
+def write_rows(
+    rows: Iterable[Dict[str, Any]],
+    destination: PathOrFile,
+    file_format: Optional[str] = None,
+) -> PipelineStats:
+    """
+    Escribe las filas en un fichero CSV o JSONL a medida que se generan.
+
+    :param rows: Filas a escribir.
+    :param destination: Ruta o fichero abierto en modo texto.
+    :param file_format: "csv" o "jsonl". Por defecto se deduce de la extension.
+    :return: Numero de filas escritas y de filas con error.
+    """
+    file_format = _resolve_format(destination, file_format)
+    if hasattr(destination, "write"):
+        return _write(destination, rows, file_format)
+    with open(destination, "w", newline="", encoding="utf-8") as handle:
+        return _write(handle, rows, file_format)
+
+
+def run_pipeline(
+    source: PathOrFile,
+    destination: PathOrFile,
+    method: Optional[str] = None,
+    method_column: Optional[str] = "method",
+    provider: Optional[IndexProvider] = None,
+    batch_size: int = 1000,
+    input_format: Optional[str] = None,
+    output_format: Optional[str] = None,
+) -> PipelineStats:
+    """
+    Lee las rentas de source, calcula su actualizacion y escribe el resultado
+    en destination, fila a fila y con memoria constante.
+
+    :param source: Fichero de entrada (CSV o JSONL).
+    :param destination: Fichero de salida (CSV o JSONL).
+    :param method: Estrategia para todas las filas.
+    :param method_column: Columna con la estrategia de cada fila.
+    :param provider: Fuente de indices a inyectar en las estrategias.
+    :param batch_size: Numero de filas que se calculan juntas.
+    :param input_format: Formato de entrada. Por defecto segun la extension.
+    :param output_format: Formato de salida. Por defecto segun la extension.
+    :return: Numero de filas escritas y de filas con error.
+    """
+    pipeline = RentUpdatePipeline(method, method_column, provider, batch_size)
+    rows = read_rows(source, input_format)
+    return write_rows(pipeline.process(rows), destination, output_format)
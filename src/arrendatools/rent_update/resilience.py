@@ -0,0 +1,255 @@
+"""Proteccion frente a caidas y sobrecarga de la API del INE."""
+
+import threading
+import time
+from typing import Callable, Dict, Hashable, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+
+STATE_CLOSED = "closed"
+STATE_OPEN = "open"
+STATE_HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(ConnectionError):
+    """La peticion no se hace porque el circuito esta abierto."""
+
+
+class CircuitBreaker:
+    """
+    Circuito que deja de hacer peticiones tras varios fallos seguidos.
+
+    Con el circuito abierto las peticiones fallan al instante con
+    CircuitOpenError. Pasado reset_timeout se deja pasar una unica peticion de
+    prueba: si va bien el circuito se cierra y, si falla, se vuelve a abrir.
+    Es seguro entre hilos y se puede compartir entre varios clientes.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        Args:
+            failure_threshold (int): Fallos seguidos que abren el circuito.
+            reset_timeout (float): Segundos que el circuito permanece abierto
+                antes de probar otra vez.
+            clock (Callable[[], float]): Reloj monotono en segundos.
+        """
+        if failure_threshold < 1:
+            raise ValueError("Failure threshold must be at least 1.")
+        if reset_timeout < 0:
+            raise ValueError("Reset timeout cannot be negative.")
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self._failures = 0
+        self._opened_until: Optional[float] = None
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        """Estado actual: STATE_CLOSED, STATE_OPEN o STATE_HALF_OPEN."""
+        with self._lock:
+            if self._opened_until is None:
+                return STATE_CLOSED
+            if self._trial_in_flight or self._clock() >= self._opened_until:
+                return STATE_HALF_OPEN
+            return STATE_OPEN
+
+    def before_request(self) -> None:
+        """
+        Comprueba si se puede hacer una peticion.
+
+        Raises:
+            CircuitOpenError: Si el circuito esta abierto, o semiabierto con
+                la peticion de prueba aun en curso.
+        """
+        with self._lock:
+            if self._opened_until is None:
+                return
+            remaining = self._opened_until - self._clock()
+            if remaining > 0:
+                raise CircuitOpenError(
+                    f"INE API circuit is open; retrying in {remaining:.1f} s."
+                )
+            if self._trial_in_flight:
+                raise CircuitOpenError(
+                    "INE API circuit is half-open; a trial request is in flight."
+                )
+            self._trial_in_flight = True
+
+    def record_success(self) -> None:
+        """Registra una peticion correcta y cierra el circuito."""
+        with self._lock:
+            self._failures = 0
+            self._opened_until = None
+            self._trial_in_flight = False
+
+    def record_failure(self, retry_after: Optional[float] = None) -> None:
+        """
+        Registra una peticion fallida.
+
+        Args:
+            retry_after (float | None): Segundos indicados por el servidor en
+                la cabecera Retry-After. Si se indican, el circuito se abre de
+                inmediato durante al menos ese tiempo.
+        """
+        with self._lock:
+            self._failures += 1
+            half_open = self._trial_in_flight
+            self._trial_in_flight = False
+            if (
+                retry_after is None
+                and not half_open
+                and self._failures < self.failure_threshold
+            ):
+                return
+            timeout = self.reset_timeout
+            if retry_after is not None:
+                timeout = max(timeout, retry_after)
+            self._opened_until = self._clock() + timeout
+
+    def release(self) -> None:
+        """
+        Libera la peticion de prueba sin registrar resultado, por ejemplo si
+        se abandono por agotarse el plazo del llamante y no por un fallo del
+        INE. En otro estado no hace nada.
+        """
+        with self._lock:
+            self._trial_in_flight = False
+
+    def reset(self) -> None:
+        """Cierra el circuito y olvida los fallos registrados."""
+        self.record_success()
+
+
+class RateLimiter:
+    """
+    Limitador de peticiones por cubo de fichas (token bucket), seguro entre
+    hilos. Permite rafagas de hasta burst peticiones y, de media, rate
+    peticiones por segundo; quien supera el limite espera su turno.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: int = 1,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        """
+        Args:
+            rate (float): Peticiones por segundo.
+            burst (int): Peticiones que se pueden hacer seguidas sin esperar.
+            clock (Callable[[], float]): Reloj monotono en segundos.
+            sleep (Callable[[float], None]): Funcion de espera.
+        """
+        if rate <= 0:
+            raise ValueError("Rate must be greater than 0.")
+        if burst < 1:
+            raise ValueError("Burst must be at least 1.")
+        self.rate = rate
+        self.burst = burst
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = float(burst)
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def acquire(self, timeout: Optional[float] = None) -> float:
+        """
+        Toma una ficha, esperando si no hay ninguna disponible.
+
+        Las fichas se reservan en orden de llegada: el saldo puede quedar en
+        negativo y cada llamada espera lo que falta para cubrir el suyo.
+
+        Args:
+            timeout (float | None): Espera maxima. Si hiciera falta esperar
+                mas, no se reserva la ficha.
+
+        Returns:
+            float: Segundos esperados.
+
+        Raises:
+            TimeoutError: Si la espera necesaria supera timeout.
+        """
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(
+                self.burst, self._tokens + (now - self._updated) * self.rate
+            )
+            self._updated = now
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+            if timeout is not None and wait > timeout:
+                self._tokens += 1
+                raise TimeoutError(
+                    f"Rate limit wait of {wait:.2f} s exceeds the timeout."
+                )
+        if wait > 0:
+            self._sleep(wait)
+        return wait
+
+
+class _Call:
+    """Peticion en curso de SingleFlight."""
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """
+    Agrupa llamadas concurrentes identicas: mientras hay una en curso para
+    una clave, el resto espera y recibe su mismo resultado (o excepcion).
+    """
+
+    def __init__(self) -> None:
+        self._calls: Dict[Hashable, _Call] = {}
+        self._lock = threading.Lock()
+
+    def do(
+        self, key: Hashable, func: Callable[[], T], timeout: Optional[float] = None
+    ) -> Tuple[T, bool]:
+        """
+        Ejecuta func, o espera a la ejecucion en curso para la misma clave.
+
+        Args:
+            key (Hashable): Identificador de la llamada.
+            func (Callable): Funcion sin argumentos a ejecutar.
+            timeout (float | None): Espera maxima por la ejecucion en curso de
+                otra llamada. No limita la ejecucion propia de func.
+
+        Returns:
+            tuple: Resultado y True si se compartio el de otra llamada.
+
+        Raises:
+            TimeoutError: Si la ejecucion en curso no termina en timeout.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+        if not leader:
+            if not call.done.wait(timeout):
+                raise TimeoutError("Timed out waiting for an identical call in flight.")
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+        try:
+            call.result = func()
+        except BaseException as err:
+            call.error = err
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result, False
@@ -0,0 +1,152 @@
+"""Copia local (snapshot) de las series del INE incluida en el paquete."""
+
+import argparse
+import sys
+from datetime import date
+from decimal import Decimal
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from arrendatools.rent_update.ine_client import IneClient
+from arrendatools.rent_update import ine_snapshot
+
+# Primer mes de cada serie incluido en el snapshot.
+SERIES_START = {
+    "IPC290751": date(2002, 1, 1),
+    "IRAV1": date(2024, 11, 1),
+}
+
+
+def snapshot_value(series: str, year: int, month: int) -> Optional[Decimal]:
+    """
+    Devuelve el valor de la serie incluido en el snapshot.
+
+    Args:
+        series (str): Codigo de la serie temporal.
+        year (int): Ano del dato.
+        month (int): Mes del dato.
+
+    Returns:
+        Decimal | None: Valor o None si el snapshot no lo incluye.
+    """
+    months = ine_snapshot.SERIES.get(series, {}).get(year)
+    if months is None or months[month - 1] is None:
+        return None
+    # Los valores se guardan como texto para convertirlos a Decimal sin
+    # pasar por float.
+    return Decimal(months[month - 1])
+
+
+def snapshot_last_period(series: str) -> Optional[Tuple[int, int]]:
+    """Devuelve el ultimo (ano, mes) de la serie incluido en el snapshot."""
+    years = ine_snapshot.SERIES.get(series, {})
+    for year in sorted(years, reverse=True):
+        for month in range(12, 0, -1):
+            if years[year][month - 1] is not None:
+                return year, month
+    return None
+
+
+def build_snapshot(
+    client: Optional[IneClient] = None,
+    end_date: Optional[date] = None,
+) -> Dict[str, Dict[int, List[Optional[Decimal]]]]:
+    """
+    Descarga del INE la historia completa de las series del snapshot, con una
+    peticion por serie.
+
+    Args:
+        client (IneClient | None): Cliente a usar. Por defecto el compartido.
+        end_date (date | None): Ultima fecha a incluir. Por defecto hoy.
+
+    Returns:
+        dict: Valores por serie, ano y mes (None si no esta publicado).
+    """
+    client = client if client is not None else IneClient.default()
+    end_date = end_date if end_date is not None else date.today()
+    series_values: Dict[str, Dict[int, List[Optional[Decimal]]]] = {}
+    for series, start_date in SERIES_START.items():
+        values = client.fetch_series_values(start_date, end_date, series)
+        years: Dict[int, List[Optional[Decimal]]] = {}
+        for (year, month), value in values.items():
+            years.setdefault(year, [None] * 12)[month - 1] = value
+        series_values[series] = dict(sorted(years.items()))
+    return series_values
+
+
+def render_snapshot(
+    series_values: Dict[str, Dict[int, List[Optional[Decimal]]]],
+    version: int,
+    snapshot_date: date,
+) -> str:
+    """Genera el codigo fuente del modulo ine_snapshot, con los valores como texto."""
+    lines = [
+        "# Copia local de las series del INE usadas por las estrategias.",
+        '# Generado por "python -m arrendatools.rent_update.snapshot". '
+        "No editar a mano.",
+        "",
+        f"SNAPSHOT_VERSION = {version}",
+        "",
+        f'SNAPSHOT_DATE = "{snapshot_date.isoformat()}"',
+        "",
+        "SERIES = {",
+    ]
+    for series, years in series_values.items():
+        if not years:
+            lines.append(f'    "{series}": {{}},')
+            continue
+        lines.append(f'    "{series}": {{')
+        for year, months in years.items():
+            lines.append(f"        {year}: [")
+            lines.extend(
+                "            None," if value is None else f'            "{value}",'
+                for value in months
+            )
+            lines.append("        ],")
+        lines.append("    },")
+    lines.append("}")
+    return "\n".join(lines) + "\n"
+
+
+def refresh_snapshot(
+    path: Optional[str] = None,
+    client: Optional[IneClient] = None,
+    snapshot_date: Optional[date] = None,
+) -> str:
+    """
+    Descarga las series del INE y reescribe el modulo ine_snapshot.
+
+    Args:
+        path (str | None): Fichero a escribir. Por defecto el del paquete.
+        client (IneClient | None): Cliente a usar. Por defecto el compartido.
+        snapshot_date (date | None): Fecha del snapshot. Por defecto hoy.
+
+    Returns:
+        str: Ruta del fichero escrito.
+    """
+    path = path if path is not None else ine_snapshot.__file__
+    snapshot_date = snapshot_date if snapshot_date is not None else date.today()
+    series_values = build_snapshot(client, snapshot_date)
+    source = render_snapshot(
+        series_values, ine_snapshot.SNAPSHOT_VERSION + 1, snapshot_date
+    )
+    with open(path, "w", encoding="utf-8") as snapshot_file:
+        snapshot_file.write(source)
+    return path
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Actualiza la copia local de las series del INE."
+    )
+    parser.add_argument(
+        "--output",
+        help="Fichero a escribir (por defecto el modulo ine_snapshot del paquete).",
+    )
+    args = parser.parse_args(argv)
+    path = refresh_snapshot(args.output)
+    print(f"Snapshot written to {path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,15 +1,29 @@
 """Estrategias de actualizacion de renta."""
 
-from arrendatools.rent_update.strategies.fixed_amount import FixedAmountUpdate
-from arrendatools.rent_update.strategies.ipc import IpcUpdate
-from arrendatools.rent_update.strategies.ipc_then_percentage import (
-    IpcThenPercentageUpdate,
-)
-from arrendatools.rent_update.strategies.irav import IravUpdate
-from arrendatools.rent_update.strategies.min_ipc_or_percentage import (
-    MinIpcOrPercentageUpdate,
-)
-from arrendatools.rent_update.strategies.percentage import PercentageUpdate
+from importlib import import_module
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from arrendatools.rent_update.strategies.fixed_amount import FixedAmountUpdate
+    from arrendatools.rent_update.strategies.ipc import IpcUpdate
+    from arrendatools.rent_update.strategies.ipc_then_percentage import (
+        IpcThenPercentageUpdate,
+    )
+    from arrendatools.rent_update.strategies.irav import IravUpdate
+    from arrendatools.rent_update.strategies.min_ipc_or_percentage import (
+        MinIpcOrPercentageUpdate,
+    )
+    from arrendatools.rent_update.strategies.percentage import PercentageUpdate
+
+# Submodulo de cada estrategia; se importa la primera vez que se usa.
+_LAZY_ATTRIBUTES = {
+    "FixedAmountUpdate": "fixed_amount",
+    "IpcUpdate": "ipc",
+    "IpcThenPercentageUpdate": "ipc_then_percentage",
+    "IravUpdate": "irav",
+    "MinIpcOrPercentageUpdate": "min_ipc_or_percentage",
+    "PercentageUpdate": "percentage",
+}
 
 __all__ = [
     "FixedAmountUpdate",
@@ -19,3 +33,16 @@ __all__ = [
     "MinIpcOrPercentageUpdate",
     "PercentageUpdate",
 ]
+
+
+def __getattr__(name: str):
+    module = _LAZY_ATTRIBUTES.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(f"{__name__}.{module}"), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
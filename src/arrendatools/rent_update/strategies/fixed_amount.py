@@ -10,6 +10,8 @@ from arrendatools.rent_update.base import (
 class FixedAmountUpdate(RentUpdateMethod):
     """Implementacion de actualizacion por cantidad fija."""
 
+    key = "fixed_amount"
+
     def calculate(
         self,
         inputs: RentUpdateInput,
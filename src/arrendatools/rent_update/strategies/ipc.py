@@ -1,6 +1,11 @@
+from __future__ import annotations
+
 import logging
+import threading
 from datetime import date
 from decimal import ROUND_HALF_UP, Decimal
+from functools import lru_cache
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, List, Optional, Tuple
 
 from arrendatools.rent_update.base import (
     RentUpdateInput,
@@ -8,25 +13,95 @@ from arrendatools.rent_update.base import (
     RentUpdateResult,
 )
 from arrendatools.rent_update.date_utils import DateUtils
+from arrendatools.rent_update.index_provider import (
+    IndexProvider,
+    default_index_provider,
+)
 from arrendatools.rent_update.ine_client import IneClient
 from arrendatools.rent_update.strategies.ipc_data import (
     COEFFICIENTS_LAU_BASE_2021,
-    IPC_TABLE_BASE_1992,
+    IPC_BASE_1992_FIRST_YEAR,
+    IPC_BASE_1992_LAST_YEAR,
+    ipc_base_1992,
 )
 
+if TYPE_CHECKING:
+    from concurrent.futures import ThreadPoolExecutor
+
+    from arrendatools.rent_update.async_ine_client import AsyncIneClient
+
+
+def _variation_rate(dividend: Decimal, divisor: Decimal) -> Decimal:
+    # INE rounding: compute (dividend / divisor - 1) and round to 3 decimals.
+    return ((dividend / divisor) - Decimal(1)).quantize(
+        Decimal("0.001"), rounding=ROUND_HALF_UP
+    )
+
+
+@lru_cache(maxsize=None)
+def _variation_rate_base_1992(year_start: int, year_end: int, month: int) -> Decimal:
+    """Tasa de variacion entre dos meses de la base 1992 (solo depende de la tabla)."""
+    return _variation_rate(
+        ipc_base_1992(year_end, month), ipc_base_1992(year_start, month)
+    )
+
 
 class IpcUpdate(RentUpdateMethod):
     """Actualizacion de renta basada en IPC."""
 
+    key = "ipc"
+    uses_index_provider = True
+
     # IPC series: base 2025.
     _SERIES_IPC = "IPC290751"
 
+    # Modos de obtencion de los dos indices en el caso 2002+.
+    FETCH_SEQUENTIAL = "sequential"
+    FETCH_PARALLEL = "parallel"
+    FETCH_RANGE = "range"
+    _FETCH_MODES = (FETCH_SEQUENTIAL, FETCH_PARALLEL, FETCH_RANGE)
+    # Hilos del pool compartido del modo "parallel"; cada calculo usa dos.
+    _FETCH_WORKERS = 4
+    _executor: Optional[ThreadPoolExecutor] = None
+    _executor_lock = threading.Lock()
+
+    def __init__(
+        self,
+        provider: Optional[IndexProvider] = None,
+        client: Optional[IneClient] = None,
+        async_client: Optional[AsyncIneClient] = None,
+        use_snapshot: bool = True,
+        fetch_mode: str = FETCH_SEQUENTIAL,
+    ) -> None:
+        """
+        :param provider: Fuente de los indices. Si no se indica se usa
+            default_index_provider() con client, async_client y use_snapshot.
+        :param client: Cliente del INE a usar. Si no se indica se usa el
+            cliente compartido IneClient.default().
+        :param async_client: Cliente asincrono usado por acalculate(). Si no se
+            indica se envuelve el cliente sincrono.
+        :param use_snapshot: Si es True se consulta primero la copia local de
+            la serie incluida en el paquete y solo se pide al INE lo que falte.
+        :param fetch_mode: Como obtener los indices inicial y final cuando
+            ambos son de 2002 en adelante: uno detras de otro ("sequential"),
+            en paralelo en dos hilos ("parallel") o en una unica peticion por
+            rango que cubre ambos meses ("range").
+        """
+        if fetch_mode not in self._FETCH_MODES:
+            raise ValueError(
+                f"Unknown fetch mode: {fetch_mode}. "
+                f"Available: {', '.join(self._FETCH_MODES)}"
+            )
+        if provider is None:
+            provider = default_index_provider(client, async_client, use_snapshot)
+        self.provider = provider
+        self.fetch_mode = fetch_mode
+
     def _fetch_ipc(self, year: int, month: int) -> Decimal:
         """Obtiene el IPC del INE para el ano y mes indicado."""
-        query_date = date(year, month, 1)
-        payload = IneClient.fetch_series_data(query_date, query_date, self._SERIES_IPC)
-        if len(payload.get("Data", [])) > 0:
-            return Decimal(payload["Data"][0]["Valor"])
+        value = self.provider.get_value(self._SERIES_IPC, year, month)
+        if value is not None:
+            return value
         raise ValueError(
             "Rent not updated: Could not fetch IPC data for "
             f"{DateUtils.month_name_es(month)} {year}."
@@ -36,6 +111,177 @@ class IpcUpdate(RentUpdateMethod):
         self,
         inputs: RentUpdateInput,
     ) -> RentUpdateResult:
+        if self.fetch_mode == self.FETCH_RANGE:
+            return self.calculate_many([inputs])[0]
+        return self._calculate(inputs, self._fetch_ipc)
+
+    def calculate_many(
+        self,
+        inputs: Iterable[RentUpdateInput],
+    ) -> List[RentUpdateResult]:
+        inputs = list(inputs)
+        fetched = self._prefetch_ipc(inputs)
+
+        def fetch_once(year: int, month: int) -> Decimal:
+            key = (year, month)
+            if key not in fetched:
+                fetched[key] = self._fetch_ipc(year, month)
+            return fetched[key]
+
+        return [self._calculate(item, fetch_once) for item in inputs]
+
+    def prefetch(self, inputs: Iterable[RentUpdateInput]) -> None:
+        """
+        Pide en una sola consulta los IPC de las entradas que la fuente no
+        tiene a mano, para que los calculos posteriores no consulten al INE.
+
+        :param inputs: Entradas que se van a calcular.
+        """
+        self._prefetch_ipc(list(inputs))
+
+    def index_periods(
+        self, inputs: Iterable[RentUpdateInput]
+    ) -> Dict[str, List[Tuple[int, int]]]:
+        """
+        Devuelve los meses de la serie del IPC que necesitan las entradas.
+
+        :param inputs: Entradas que se van a calcular.
+        :return: Periodos (ano, mes) ordenados, por codigo de serie.
+        """
+        periods = {period for item in inputs for period in self._index_periods(item)}
+        return {self._SERIES_IPC: sorted(periods)}
+
+    def _prefetch_ipc(
+        self, inputs: List[RentUpdateInput]
+    ) -> Dict[Tuple[int, int], Decimal]:
+        """Pide en una sola consulta todos los IPC que la fuente no tiene a mano."""
+        periods = [
+            period for item in inputs for period in self._index_periods(item)
+        ]
+        missing = self.provider.missing_periods(self._SERIES_IPC, periods)
+        if len(missing) < 2:
+            return {}
+        (start_year, start_month), (end_year, end_month) = missing[0], missing[-1]
+        return self.provider.get_range(
+            self._SERIES_IPC,
+            date(start_year, start_month, 1),
+            date(end_year, end_month, 1),
+        )
+
+    @staticmethod
+    def _index_periods(inputs: RentUpdateInput) -> List[Tuple[int, int]]:
+        """Devuelve los meses (ano, mes) que hay que consultar al INE."""
+        if inputs.year_start is None or inputs.month is None or inputs.year_end is None:
+            return []
+        if inputs.year_end < 2002:
+            return []
+        if inputs.year_start < 2002:
+            return [(inputs.year_end, inputs.month)]
+        return [(inputs.year_end, inputs.month), (inputs.year_start, inputs.month)]
+
+    async def acalculate(
+        self,
+        inputs: RentUpdateInput,
+    ) -> RentUpdateResult:
+        self._validate(inputs)
+        periods = self._index_periods(inputs)
+        try:
+            import asyncio
+
+            values = await asyncio.gather(
+                *(self._afetch_ipc(year, month) for year, month in periods)
+            )
+        except ConnectionError as err:
+            logging.getLogger(__name__).error("INE IPC fetch failed: %s", err)
+            raise
+        return self._compute(inputs, dict(zip(periods, values)))
+
+    async def _afetch_ipc(self, year: int, month: int) -> Decimal:
+        """Version asincrona de _fetch_ipc."""
+        value = await self.provider.aget_value(self._SERIES_IPC, year, month)
+        if value is not None:
+            return value
+        raise ValueError(
+            "Rent not updated: Could not fetch IPC data for "
+            f"{DateUtils.month_name_es(month)} {year}."
+        )
+
+    def _calculate(
+        self,
+        inputs: RentUpdateInput,
+        fetch_ipc: Callable[[int, int], Decimal],
+    ) -> RentUpdateResult:
+        self._validate(inputs)
+        periods = self._index_periods(inputs)
+        try:
+            missing = []
+            if self.fetch_mode == self.FETCH_PARALLEL and len(set(periods)) > 1:
+                missing = self.provider.missing_periods(self._SERIES_IPC, periods)
+            indices = {}
+            if len(missing) > 1:
+                from contextvars import copy_context
+
+                # Solo van a hilos los indices que requieren entrada/salida;
+                # cada hilo recibe una copia del contexto para que el plazo de
+                # deadline() llegue tambien a sus peticiones.
+                futures = [
+                    self._fetch_executor().submit(copy_context().run, fetch_ipc, *period)
+                    for period in missing
+                ]
+                indices = {
+                    period: future.result() for period, future in zip(missing, futures)
+                }
+            for year, month in periods:
+                if (year, month) not in indices:
+                    indices[(year, month)] = fetch_ipc(year, month)
+        except ConnectionError as err:
+            logging.getLogger(__name__).error("INE IPC fetch failed: %s", err)
+            raise
+        return self._compute(inputs, indices)
+
+    def _fetch_executor(self) -> ThreadPoolExecutor:
+        """Devuelve el pool de hilos del modo "parallel", creado en el primer uso."""
+        if self._executor is None:
+            with self._executor_lock:
+                if self._executor is None:
+                    from concurrent.futures import ThreadPoolExecutor
+
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self._FETCH_WORKERS,
+                        thread_name_prefix="ipc-fetch",
+                    )
+        return self._executor
+
+    def __getstate__(self) -> dict:
+        # El pool de hilos no se copia ni se envia a otros procesos.
+        state = self.__dict__.copy()
+        state.pop("_executor", None)
+        return state
+
+    @staticmethod
+    def precompute_base_1992() -> int:
+        """
+        Calcula de antemano la tasa de variacion de todos los pares de meses
+        con ambas fechas en la base 1992 (anteriores a 2002). Es opcional: sin
+        llamarlo, cada par se calcula la primera vez que se usa y se memoriza.
+
+        :return: Numero de pares disponibles.
+        """
+        count = 0
+        for month in range(1, 13):
+            years = [
+                year
+                for year in range(IPC_BASE_1992_FIRST_YEAR, IPC_BASE_1992_LAST_YEAR + 1)
+                if ipc_base_1992(year, month) is not None
+            ]
+            for position, year_start in enumerate(years):
+                for year_end in years[position:]:
+                    _variation_rate_base_1992(year_start, year_end, month)
+                    count += 1
+        return count
+
+    @staticmethod
+    def _validate(inputs: RentUpdateInput) -> None:
         if inputs.year_start is None:
             raise ValueError("Year start is required.")
         if inputs.month is None:
@@ -47,62 +293,56 @@ class IpcUpdate(RentUpdateMethod):
         ):
             raise ValueError("IPC data is only available from March 1954 onward.")
 
+    @staticmethod
+    def _index(
+        indices: Dict[Tuple[int, int], Decimal], year: int, month: int
+    ) -> Decimal:
+        """Devuelve el indice obtenido del INE para el ano y mes indicado."""
+        index_ipc = indices.get((year, month))
+        if index_ipc is None or index_ipc.is_nan():
+            raise ValueError(
+                "Rent not updated: Could not fetch IPC data for "
+                f"{DateUtils.month_name_es(month)} {year}."
+            )
+        return index_ipc
+
+    def _compute(
+        self,
+        inputs: RentUpdateInput,
+        indices: Dict[Tuple[int, int], Decimal],
+    ) -> RentUpdateResult:
+        """Calcula la actualizacion a partir de los indices ya obtenidos."""
         amount = Decimal(inputs.amount).quantize(
             Decimal("0.01"), rounding=ROUND_HALF_UP
         )
-        dividend = Decimal(0)
-        divisor = Decimal(0)
-        try:
-            if inputs.year_start < 2002 and inputs.year_end >= 2002:
-                index_ipc = self._fetch_ipc(inputs.year_end, inputs.month)
-                if index_ipc is None or index_ipc.is_nan():
-                    raise ValueError(
-                        "Rent not updated: Could not fetch IPC data for "
-                        f"{DateUtils.month_name_es(inputs.month)} {inputs.year_end}."
-                    )
-                # Cross-base update: before 2002 to 2002+.
-                dividend = (
-                    index_ipc * Decimal(COEFFICIENTS_LAU_BASE_2021[inputs.month - 1])
-                ).quantize(Decimal("0.001"), rounding=ROUND_HALF_UP)
-
-                divisor = Decimal(
-                    IPC_TABLE_BASE_1992[inputs.year_start][inputs.month - 1]
-                ).quantize(Decimal("0.001"), rounding=ROUND_HALF_UP)
-
-            elif inputs.year_start < 2002 and inputs.year_end < 2002:
-                # Both dates in pre-2002 base.
-                dividend = Decimal(
-                    IPC_TABLE_BASE_1992[inputs.year_end][inputs.month - 1]
-                ).quantize(Decimal("0.001"), rounding=ROUND_HALF_UP)
-
-                divisor = Decimal(
-                    IPC_TABLE_BASE_1992[inputs.year_start][inputs.month - 1]
-                ).quantize(Decimal("0.001"), rounding=ROUND_HALF_UP)
-
-            else:
-                # Both dates in 2002+ base.
-                index_ipc = self._fetch_ipc(inputs.year_end, inputs.month)
-                if index_ipc is None or index_ipc.is_nan():
-                    raise ValueError(
-                        "Rent not updated: Could not fetch IPC data for "
-                        f"{DateUtils.month_name_es(inputs.month)} {inputs.year_end}."
-                    )
-                dividend = index_ipc.quantize(Decimal("0.001"), rounding=ROUND_HALF_UP)
-                index_ipc = self._fetch_ipc(inputs.year_start, inputs.month)
-                if index_ipc is None or index_ipc.is_nan():
-                    raise ValueError(
-                        "Rent not updated: Could not fetch IPC data for "
-                        f"{DateUtils.month_name_es(inputs.month)} {inputs.year_start}."
-                    )
-                divisor = index_ipc.quantize(Decimal("0.001"), rounding=ROUND_HALF_UP)
-        except ConnectionError as err:
-            logging.getLogger(__name__).error("INE IPC fetch failed: %s", err)
-            raise
+        if inputs.year_start < 2002 and inputs.year_end >= 2002:
+            index_ipc = self._index(indices, inputs.year_end, inputs.month)
+            # Cross-base update: before 2002 to 2002+.
+            dividend = (
+                index_ipc * Decimal(COEFFICIENTS_LAU_BASE_2021[inputs.month - 1])
+            ).quantize(Decimal("0.001"), rounding=ROUND_HALF_UP)
 
-        # INE rounding: compute (dividend / divisor - 1) and round to 3 decimals.
-        variation_rate = ((dividend / divisor) - Decimal(1)).quantize(
-            Decimal("0.001"), rounding=ROUND_HALF_UP
-        )
+            divisor = ipc_base_1992(inputs.year_start, inputs.month)
+
+        elif inputs.year_start < 2002 and inputs.year_end < 2002:
+            # Both dates in pre-2002 base.
+            dividend = ipc_base_1992(inputs.year_end, inputs.month)
+            divisor = ipc_base_1992(inputs.year_start, inputs.month)
+            variation_rate = _variation_rate_base_1992(
+                inputs.year_start, inputs.year_end, inputs.month
+            )
+
+        else:
+            # Both dates in 2002+ base.
+            dividend = self._index(
+                indices, inputs.year_end, inputs.month
+            ).quantize(Decimal("0.001"), rounding=ROUND_HALF_UP)
+            divisor = self._index(
+                indices, inputs.year_start, inputs.month
+            ).quantize(Decimal("0.001"), rounding=ROUND_HALF_UP)
+
+        if inputs.year_end >= 2002:
+            variation_rate = _variation_rate(dividend, divisor)
 
         updated_amount = (amount + (amount * variation_rate)).quantize(
             Decimal("0.01"), rounding=ROUND_HALF_UP
@@ -0,0 +1,126 @@
+import copy
+from abc import abstractmethod
+from decimal import ROUND_HALF_UP, Decimal
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from arrendatools.rent_update.base import (
+    RentUpdateInput,
+    RentUpdateMethod,
+    RentUpdateResult,
+)
+from arrendatools.rent_update.index_provider import IndexProvider
+from arrendatools.rent_update.strategies.ipc import IpcUpdate
+
+
+class IpcCompositeUpdate(RentUpdateMethod):
+    """
+    Base de las actualizaciones que combinan el IPC con un porcentaje.
+
+    Calcula la actualizacion por IPC de todas las rentas con una unica
+    llamada a ipc_update.calculate_many() y deja a las subclases combinar
+    cada resultado con el porcentaje en _combine().
+    """
+
+    uses_index_provider = True
+
+    def __init__(
+        self,
+        provider: Optional[IndexProvider] = None,
+        ipc_update: Optional[IpcUpdate] = None,
+    ) -> None:
+        """
+        :param provider: Fuente de los indices del IPC. Si no se indica se usa
+            la fuente por defecto de IpcUpdate.
+        :param ipc_update: Estrategia del IPC a reutilizar en todos los
+            calculos. Si no se indica se crea una con provider.
+        """
+        if ipc_update is None:
+            ipc_update = IpcUpdate(provider=provider)
+        elif provider is not None and provider is not ipc_update.provider:
+            raise ValueError("Provider must match the provider of ipc_update.")
+        self.ipc_update = ipc_update
+
+    @property
+    def provider(self) -> IndexProvider:
+        """Fuente de los indices del IPC, la de ipc_update."""
+        return self.ipc_update.provider
+
+    @provider.setter
+    def provider(self, provider: IndexProvider) -> None:
+        # Se sustituye ipc_update por una copia para no cambiar la fuente de
+        # una estrategia que puede estar compartida con otras.
+        ipc_update = copy.copy(self.ipc_update)
+        ipc_update.provider = provider
+        self.ipc_update = ipc_update
+
+    def calculate(
+        self,
+        inputs: RentUpdateInput,
+    ) -> RentUpdateResult:
+        return self.calculate_many([inputs])[0]
+
+    def calculate_many(
+        self,
+        inputs: Iterable[RentUpdateInput],
+    ) -> List[RentUpdateResult]:
+        inputs = list(inputs)
+        for item in inputs:
+            self._validate(item)
+        ipc_results = self.ipc_update.calculate_many(
+            [self._ipc_input(item) for item in inputs]
+        )
+        return [
+            self._combine(item, ipc_data)
+            for item, ipc_data in zip(inputs, ipc_results)
+        ]
+
+    def index_periods(
+        self, inputs: Iterable[RentUpdateInput]
+    ) -> Dict[str, List[Tuple[int, int]]]:
+        return self.ipc_update.index_periods(inputs)
+
+    @staticmethod
+    def _validate(inputs: RentUpdateInput) -> None:
+        if inputs.year_start is None:
+            raise ValueError("Year start is required.")
+        if inputs.month is None:
+            raise ValueError("Month is required.")
+        if inputs.year_end is None:
+            raise ValueError("Year end is required.")
+        if (inputs.year_start < 1954) or (
+            inputs.year_start == 1954 and inputs.month < 3
+        ):
+            raise ValueError("IPC data is only available from March 1954 onward.")
+        if inputs.data is None:
+            raise ValueError("Field 'data' is required.")
+        if not (Decimal("-1.0") <= inputs.data <= Decimal("1.0")):
+            raise ValueError(
+                "Data must be a percentage between -1 (-100%) and 1 (100%)."
+            )
+
+    @staticmethod
+    def _ipc_input(inputs: RentUpdateInput) -> RentUpdateInput:
+        amount = Decimal(inputs.amount).quantize(
+            Decimal("0.01"), rounding=ROUND_HALF_UP
+        )
+        return RentUpdateInput(
+            amount=amount,
+            month=inputs.month,
+            year_start=inputs.year_start,
+            year_end=inputs.year_end,
+        )
+
+    @staticmethod
+    @abstractmethod
+    def _combine(
+        inputs: RentUpdateInput,
+        ipc_data: RentUpdateResult,
+    ) -> RentUpdateResult:
+        """
+        Combina la actualizacion por IPC de una renta con su porcentaje.
+
+        :param inputs: Datos de entrada de la renta.
+        :param ipc_data: Resultado de la actualizacion por IPC.
+        :return: Resultado final.
+        """
+        raise NotImplementedError
@@ -1,3 +1,8 @@
+from array import array
+from decimal import Decimal
+from functools import lru_cache
+from typing import Optional, Tuple
+
 COEFFICIENTS_LAU_BASE_2021 = [
     2.341468,
     2.34873,
@@ -13,677 +18,203 @@ COEFFICIENTS_LAU_BASE_2021 = [
     2.329675,
 ]
 
-IPC_TABLE_BASE_1992 = {
-    1954: [
-        0,
-        0,
-        3.282,
-        3.289,
-        3.289,
-        3.277,
-        3.28,
-        3.267,
-        3.269,
-        3.286,
-        3.314,
-        3.344,
-    ],
-    1955: [
-        3.365,
-        3.376,
-        3.389,
-        3.408,
-        3.41,
-        3.401,
-        3.401,
-        3.408,
-        3.431,
-        3.459,
-        3.474,
-        3.485,
-    ],
-    1956: [
-        3.489,
-        3.532,
-        3.566,
-        3.604,
-        3.621,
-        3.609,
-        3.598,
-        3.604,
-        3.63,
-        3.662,
-        3.713,
-        3.779,
-    ],
-    1957: [
-        3.848,
-        3.869,
-        3.889,
-        3.906,
-        3.916,
-        3.906,
-        3.967,
-        4.023,
-        4.08,
-        4.166,
-        4.234,
-        4.279,
-    ],
-    1958: [
-        4.309,
-        4.313,
-        4.397,
-        4.491,
-        4.52,
-        4.514,
-        4.544,
-        4.574,
-        4.646,
-        4.689,
-        4.732,
-        4.787,
-    ],
-    1959: [
-        4.794,
-        4.817,
-        4.843,
-        4.873,
-        4.888,
-        4.86,
-        4.86,
-        4.868,
-        4.894,
-        4.909,
-        4.926,
-        4.969,
-    ],
-    1960: [
-        4.93,
-        4.926,
-        4.92,
-        4.924,
-        4.909,
-        4.905,
-        4.903,
-        4.913,
-        4.943,
-        4.956,
-        4.962,
-        4.999,
-    ],
-    1961: [
-        5.02,
-        4.979,
-        4.957,
-        4.97,
-        4.957,
-        4.93,
-        4.93,
-        4.938,
-        4.942,
-        4.961,
-        5.038,
-        5.047,
-    ],
-    1962: [
-        5.038,
-        5.061,
-        5.105,
-        5.177,
-        5.243,
-        5.27,
-        5.27,
-        5.257,
-        5.289,
-        5.34,
-        5.477,
-        5.547,
-    ],
-    1963: [
-        5.56,
-        5.604,
-        5.713,
-        5.709,
-        5.741,
-        5.635,
-        5.695,
-        5.754,
-        5.741,
-        5.757,
-        5.829,
-        5.851,
-    ],
-    1964: [
-        5.842,
-        5.846,
-        5.864,
-        5.886,
-        5.901,
-        5.98,
-        6.109,
-        6.205,
-        6.266,
-        6.369,
-        6.516,
-        6.592,
-    ],
-    1965: [
-        6.657,
-        6.771,
-        6.824,
-        6.874,
-        6.902,
-        6.871,
-        6.88,
-        6.915,
-        6.981,
-        7.018,
-        7.169,
-        7.21,
-    ],
-    1966: [
-        7.197,
-        7.191,
-        7.191,
-        7.26,
-        7.366,
-        7.38,
-        7.376,
-        7.389,
-        7.366,
-        7.411,
-        7.54,
-        7.589,
-    ],
-    1967: [
-        7.593,
-        7.652,
-        7.684,
-        7.791,
-        7.818,
-        7.75,
-        7.755,
-        7.868,
-        7.89,
-        7.922,
-        8.087,
-        8.087,
-    ],
-    1968: [
-        8.11,
-        8.11,
-        8.193,
-        8.265,
-        8.238,
-        8.261,
-        8.193,
-        8.198,
-        8.185,
-        8.211,
-        8.265,
-        8.32,
-    ],
-    1969: [
-        8.301,
-        8.251,
-        8.301,
-        8.399,
-        8.399,
-        8.301,
-        8.366,
-        8.392,
-        8.408,
-        8.44,
-        8.515,
-        8.605,
-    ],
-    1970: [
-        8.646,
-        8.613,
-        8.679,
-        8.727,
-        8.67,
-        8.703,
-        8.867,
-        9.007,
-        9.048,
-        9.138,
-        9.162,
-        9.188,
-    ],
-    1971: [
-        9.285,
-        9.278,
-        9.376,
-        9.475,
-        9.533,
-        9.573,
-        9.573,
-        9.59,
-        9.704,
-        9.811,
-        9.944,
-        10.074,
-    ],
-    1972: [
-        10.082,
-        10.074,
-        10.172,
-        10.172,
-        10.222,
-        10.246,
-        10.386,
-        10.493,
-        10.641,
-        10.714,
-        10.731,
-        10.814,
-    ],
-    1973: [
-        10.895,
-        10.912,
-        11.002,
-        11.158,
-        11.322,
-        11.494,
-        11.617,
-        11.808,
-        12.012,
-        12.202,
-        12.217,
-        12.35,
-    ],
-    1974: [
-        12.423,
-        12.465,
-        12.736,
-        13.015,
-        13.179,
-        13.236,
-        13.393,
-        13.614,
-        13.828,
-        13.975,
-        14.361,
-        14.558,
-    ],
-    1975: [
-        14.762,
-        14.903,
-        15,
-        15.264,
-        15.452,
-        15.494,
-        15.74,
-        15.987,
-        16.241,
-        16.241,
-        16.347,
-        16.61,
-    ],
-    1976: [
-        16.807,
-        16.997,
-        17.391,
-        17.743,
-        18.556,
-        18.442,
-        18.556,
-        18.713,
-        19.065,
-        19.329,
-        19.69,
-        19.894,
-    ],
-    1977: [
-        20.542,
-        20.849,
-        21.348,
-        21.736,
-        21.926,
-        22.539,
-        23.278,
-        24.033,
-        24.368,
-        24.747,
-        24.947,
-        25.144,
-    ],
-    1978: [
-        25.545,
-        25.796,
-        26.127,
-        26.677,
-        26.944,
-        27.216,
-        27.806,
-        28.291,
-        28.524,
-        28.785,
-        28.911,
-        29.303,
-    ],
-    1979: [
-        29.806,
-        30.037,
-        30.349,
-        30.807,
-        31.167,
-        31.442,
-        32.121,
-        32.437,
-        32.864,
-        33.305,
-        33.385,
-        33.872,
-    ],
-    1980: [
-        34.804,
-        35.115,
-        35.304,
-        35.645,
-        35.892,
-        36.449,
-        36.964,
-        37.397,
-        37.795,
-        38.098,
-        38.487,
-        39.025,
-    ],
-    1981: [
-        39.818,
-        40.02,
-        40.817,
-        41.223,
-        41.415,
-        41.451,
-        42.263,
-        42.778,
-        43.118,
-        43.603,
-        43.981,
-        44.647,
-    ],
-    1982: [
-        45.572,
-        45.927,
-        46.378,
-        46.988,
-        47.668,
-        48.126,
-        48.744,
-        49.082,
-        49.139,
-        49.631,
-        49.793,
-        50.901,
-    ],
-    1983: [
-        51.761,
-        52.021,
-        52.337,
-        53.056,
-        53.276,
-        53.588,
-        53.779,
-        54.501,
-        54.937,
-        55.682,
-        56.249,
-        57.122,
-    ],
-    1984: [
-        58.007,
-        58.227,
-        58.696,
-        58.973,
-        59.292,
-        59.712,
-        60.629,
-        61.05,
-        61.174,
-        61.543,
-        61.859,
-        62.278,
-    ],
-    1985: [
-        63.438,
-        63.898,
-        64.296,
-        64.959,
-        65.163,
-        65.052,
-        65.422,
-        65.52,
-        66.239,
-        66.58,
-        67.093,
-        67.371,
-    ],
-    1986: [
-        69.308,
-        69.617,
-        69.852,
-        70.022,
-        70.217,
-        70.862,
-        71.57,
-        71.773,
-        72.516,
-        72.787,
-        72.62,
-        72.93,
-    ],
-    1987: [
-        73.489,
-        73.802,
-        74.231,
-        74.399,
-        74.307,
-        74.325,
-        75.078,
-        75.045,
-        75.737,
-        76.187,
-        76.012,
-        76.284,
-    ],
-    1988: [
-        76.768,
-        76.978,
-        77.536,
-        77.266,
-        77.262,
-        77.562,
-        78.586,
-        79.363,
-        80.06,
-        80.15,
-        80.105,
-        80.742,
-    ],
-    1989: [
-        81.68,
-        81.738,
-        82.26,
-        82.481,
-        82.598,
-        83.048,
-        84.396,
-        84.59,
-        85.485,
-        85.83,
-        85.969,
-        86.304,
-    ],
-    1990: [
-        87.144,
-        87.697,
-        88.018,
-        88.218,
-        88.211,
-        88.483,
-        89.672,
-        90.065,
-        91.013,
-        91.821,
-        91.729,
-        91.955,
-    ],
-    1991: [
-        93.025,
-        92.895,
-        93.197,
-        93.399,
-        93.664,
-        93.934,
-        95.1,
-        95.453,
-        96.233,
-        96.838,
-        96.985,
-        97.038,
-    ],
-    1992: [
-        98.576,
-        99.233,
-        99.592,
-        99.485,
-        99.745,
-        99.726,
-        100.05,
-        100.962,
-        101.795,
-        101.856,
-        101.921,
-        102.227,
-    ],
-    1993: [
-        103.185,
-        103.218,
-        103.581,
-        104.035,
-        104.322,
-        104.581,
-        104.955,
-        105.583,
-        106.18,
-        106.576,
-        106.755,
-        107.262,
-    ],
-    1994: [
-        108.346,
-        108.385,
-        108.743,
-        109.171,
-        109.394,
-        109.512,
-        109.941,
-        110.651,
-        110.988,
-        111.229,
-        111.422,
-        111.914,
-    ],
-    1995: [
-        113.074,
-        113.628,
-        114.29,
-        114.896,
-        114.942,
-        115.051,
-        115.069,
-        115.394,
-        115.848,
-        116.064,
-        116.372,
-        116.748,
-    ],
-    1996: [
-        117.462,
-        117.782,
-        118.2,
-        118.871,
-        119.281,
-        119.181,
-        119.34,
-        119.678,
-        119.97,
-        120.134,
-        120.141,
-        120.497,
-    ],
-    1997: [
-        120.847,
-        120.765,
-        120.825,
-        120.869,
-        121.045,
-        121.041,
-        121.263,
-        121.798,
-        122.401,
-        122.356,
-        122.599,
-        122.925,
-    ],
-    1998: [
-        123.215,
-        122.927,
-        122.984,
-        123.289,
-        123.45,
-        123.53,
-        123.986,
-        124.318,
-        124.41,
-        124.421,
-        124.309,
-        124.653,
-    ],
-    1999: [
-        125.111,
-        125.185,
-        125.737,
-        126.202,
-        126.198,
-        126.225,
-        126.772,
-        127.312,
-        127.557,
-        127.509,
-        127.714,
-        128.29,
-    ],
-    2000: [
-        128.712,
-        128.894,
-        129.405,
-        129.943,
-        130.159,
-        130.553,
-        131.346,
-        131.897,
-        132.238,
-        132.576,
-        132.906,
-        133.366,
-    ],
-    2001: [
-        133.413,
-        133.851,
-        134.415,
-        135.113,
-        135.624,
-        136.081,
-        136.415,
-        136.745,
-        136.726,
-        136.585,
-        136.483,
-        136.978,
-    ],
-}
+# Primer y ultimo ano de la tabla del IPC base 1992.
+IPC_BASE_1992_FIRST_YEAR = 1954
+IPC_BASE_1992_LAST_YEAR = 2001
+
+# IPC base 1992 en milesimas (valor redondeado a 3 decimales * 1000), mes a
+# mes desde enero de IPC_BASE_1992_FIRST_YEAR: el de (ano, mes) esta en la
+# posicion (ano - IPC_BASE_1992_FIRST_YEAR) * 12 + mes - 1. Un 0 indica que
+# el dato no esta publicado.
+IPC_THOUSANDTHS_BASE_1992 = array(
+    "i",
+    [
+        # 1954
+        0, 0, 3282, 3289, 3289, 3277,
+        3280, 3267, 3269, 3286, 3314, 3344,
+        # 1955
+        3365, 3376, 3389, 3408, 3410, 3401,
+        3401, 3408, 3431, 3459, 3474, 3485,
+        # 1956
+        3489, 3532, 3566, 3604, 3621, 3609,
+        3598, 3604, 3630, 3662, 3713, 3779,
+        # 1957
+        3848, 3869, 3889, 3906, 3916, 3906,
+        3967, 4023, 4080, 4166, 4234, 4279,
+        # 1958
+        4309, 4313, 4397, 4491, 4520, 4514,
+        4544, 4574, 4646, 4689, 4732, 4787,
+        # 1959
+        4794, 4817, 4843, 4873, 4888, 4860,
+        4860, 4868, 4894, 4909, 4926, 4969,
+        # 1960
+        4930, 4926, 4920, 4924, 4909, 4905,
+        4903, 4913, 4943, 4956, 4962, 4999,
+        # 1961
+        5020, 4979, 4957, 4970, 4957, 4930,
+        4930, 4938, 4942, 4961, 5038, 5047,
+        # 1962
+        5038, 5061, 5105, 5177, 5243, 5270,
+        5270, 5257, 5289, 5340, 5477, 5547,
+        # 1963
+        5560, 5604, 5713, 5709, 5741, 5635,
+        5695, 5754, 5741, 5757, 5829, 5851,
+        # 1964
+        5842, 5846, 5864, 5886, 5901, 5980,
+        6109, 6205, 6266, 6369, 6516, 6592,
+        # 1965
+        6657, 6771, 6824, 6874, 6902, 6871,
+        6880, 6915, 6981, 7018, 7169, 7210,
+        # 1966
+        7197, 7191, 7191, 7260, 7366, 7380,
+        7376, 7389, 7366, 7411, 7540, 7589,
+        # 1967
+        7593, 7652, 7684, 7791, 7818, 7750,
+        7755, 7868, 7890, 7922, 8087, 8087,
+        # 1968
+        8110, 8110, 8193, 8265, 8238, 8261,
+        8193, 8198, 8185, 8211, 8265, 8320,
+        # 1969
+        8301, 8251, 8301, 8399, 8399, 8301,
+        8366, 8392, 8408, 8440, 8515, 8605,
+        # 1970
+        8646, 8613, 8679, 8727, 8670, 8703,
+        8867, 9007, 9048, 9138, 9162, 9188,
+        # 1971
+        9285, 9278, 9376, 9475, 9533, 9573,
+        9573, 9590, 9704, 9811, 9944, 10074,
+        # 1972
+        10082, 10074, 10172, 10172, 10222, 10246,
+        10386, 10493, 10641, 10714, 10731, 10814,
+        # 1973
+        10895, 10912, 11002, 11158, 11322, 11494,
+        11617, 11808, 12012, 12202, 12217, 12350,
+        # 1974
+        12423, 12465, 12736, 13015, 13179, 13236,
+        13393, 13614, 13828, 13975, 14361, 14558,
+        # 1975
+        14762, 14903, 15000, 15264, 15452, 15494,
+        15740, 15987, 16241, 16241, 16347, 16610,
+        # 1976
+        16807, 16997, 17391, 17743, 18556, 18442,
+        18556, 18713, 19065, 19329, 19690, 19894,
+        # 1977
+        20542, 20849, 21348, 21736, 21926, 22539,
+        23278, 24033, 24368, 24747, 24947, 25144,
+        # 1978
+        25545, 25796, 26127, 26677, 26944, 27216,
+        27806, 28291, 28524, 28785, 28911, 29303,
+        # 1979
+        29806, 30037, 30349, 30807, 31167, 31442,
+        32121, 32437, 32864, 33305, 33385, 33872,
+        # 1980
+        34804, 35115, 35304, 35645, 35892, 36449,
+        36964, 37397, 37795, 38098, 38487, 39025,
+        # 1981
+        39818, 40020, 40817, 41223, 41415, 41451,
+        42263, 42778, 43118, 43603, 43981, 44647,
+        # 1982
+        45572, 45927, 46378, 46988, 47668, 48126,
+        48744, 49082, 49139, 49631, 49793, 50901,
+        # 1983
+        51761, 52021, 52337, 53056, 53276, 53588,
+        53779, 54501, 54937, 55682, 56249, 57122,
+        # 1984
+        58007, 58227, 58696, 58973, 59292, 59712,
+        60629, 61050, 61174, 61543, 61859, 62278,
+        # 1985
+        63438, 63898, 64296, 64959, 65163, 65052,
+        65422, 65520, 66239, 66580, 67093, 67371,
+        # 1986
+        69308, 69617, 69852, 70022, 70217, 70862,
+        71570, 71773, 72516, 72787, 72620, 72930,
+        # 1987
+        73489, 73802, 74231, 74399, 74307, 74325,
+        75078, 75045, 75737, 76187, 76012, 76284,
+        # 1988
+        76768, 76978, 77536, 77266, 77262, 77562,
+        78586, 79363, 80060, 80150, 80105, 80742,
+        # 1989
+        81680, 81738, 82260, 82481, 82598, 83048,
+        84396, 84590, 85485, 85830, 85969, 86304,
+        # 1990
+        87144, 87697, 88018, 88218, 88211, 88483,
+        89672, 90065, 91013, 91821, 91729, 91955,
+        # 1991
+        93025, 92895, 93197, 93399, 93664, 93934,
+        95100, 95453, 96233, 96838, 96985, 97038,
+        # 1992
+        98576, 99233, 99592, 99485, 99745, 99726,
+        100050, 100962, 101795, 101856, 101921, 102227,
+        # 1993
+        103185, 103218, 103581, 104035, 104322, 104581,
+        104955, 105583, 106180, 106576, 106755, 107262,
+        # 1994
+        108346, 108385, 108743, 109171, 109394, 109512,
+        109941, 110651, 110988, 111229, 111422, 111914,
+        # 1995
+        113074, 113628, 114290, 114896, 114942, 115051,
+        115069, 115394, 115848, 116064, 116372, 116748,
+        # 1996
+        117462, 117782, 118200, 118871, 119281, 119181,
+        119340, 119678, 119970, 120134, 120141, 120497,
+        # 1997
+        120847, 120765, 120825, 120869, 121045, 121041,
+        121263, 121798, 122401, 122356, 122599, 122925,
+        # 1998
+        123215, 122927, 122984, 123289, 123450, 123530,
+        123986, 124318, 124410, 124421, 124309, 124653,
+        # 1999
+        125111, 125185, 125737, 126202, 126198, 126225,
+        126772, 127312, 127557, 127509, 127714, 128290,
+        # 2000
+        128712, 128894, 129405, 129943, 130159, 130553,
+        131346, 131897, 132238, 132576, 132906, 133366,
+        # 2001
+        133413, 133851, 134415, 135113, 135624, 136081,
+        136415, 136745, 136726, 136585, 136483, 136978,
+    ],
+)
+
+
+def ipc_base_1992(year: int, month: int) -> Optional[Decimal]:
+    """
+    Devuelve el IPC base 1992 de un mes, redondeado a 3 decimales.
+
+    :param year: Ano del dato.
+    :param month: Mes del dato.
+    :return: Indice o None si no esta publicado.
+    """
+    if not (
+        IPC_BASE_1992_FIRST_YEAR <= year <= IPC_BASE_1992_LAST_YEAR
+        and 1 <= month <= 12
+    ):
+        return None
+    return _decimals_base_1992()[(year - IPC_BASE_1992_FIRST_YEAR) * 12 + month - 1]
+
+
+@lru_cache(maxsize=None)
+def _decimals_base_1992() -> Tuple[Optional[Decimal], ...]:
+    return tuple(
+        Decimal(value).scaleb(-3) if value else None
+        for value in IPC_THOUSANDTHS_BASE_1992
+    )
+
+
+def __getattr__(name: str):
+    # IPC_TABLE_BASE_1992 (ano -> lista de 12 floats, 0 si no hay dato) se
+    # mantiene por compatibilidad; solo se construye si se usa.
+    if name == "IPC_TABLE_BASE_1992":
+        table = {
+            year: [
+                value / 1000 if value else 0
+                for value in IPC_THOUSANDTHS_BASE_1992[
+                    (year - IPC_BASE_1992_FIRST_YEAR) * 12:
+                    (year - IPC_BASE_1992_FIRST_YEAR + 1) * 12
+                ]
+            ]
+            for year in range(IPC_BASE_1992_FIRST_YEAR, IPC_BASE_1992_LAST_YEAR + 1)
+        }
+        globals()[name] = table
+        return table
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,6 +1,9 @@
+from __future__ import annotations
+
 import logging
 from datetime import date
 from decimal import ROUND_HALF_UP, Decimal
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, List, Optional, Tuple
 
 from arrendatools.rent_update.base import (
     RentUpdateInput,
@@ -8,23 +11,50 @@ from arrendatools.rent_update.base import (
     RentUpdateResult,
 )
 from arrendatools.rent_update.date_utils import DateUtils
+from arrendatools.rent_update.index_provider import (
+    IndexProvider,
+    default_index_provider,
+)
 from arrendatools.rent_update.ine_client import IneClient
 
+if TYPE_CHECKING:
+    from arrendatools.rent_update.async_ine_client import AsyncIneClient
+
 
 class IravUpdate(RentUpdateMethod):
     """Actualizacion basada en el Indice de Rentas de Alquiler de Viviendas (IRAV)."""
 
+    key = "irav"
+    uses_index_provider = True
+
     _SERIES_IRAV = "IRAV1"
 
+    def __init__(
+        self,
+        provider: Optional[IndexProvider] = None,
+        client: Optional[IneClient] = None,
+        async_client: Optional[AsyncIneClient] = None,
+        use_snapshot: bool = True,
+    ) -> None:
+        """
+        :param provider: Fuente de los indices. Si no se indica se usa
+            default_index_provider() con client, async_client y use_snapshot.
+        :param client: Cliente del INE a usar. Si no se indica se usa el
+            cliente compartido IneClient.default().
+        :param async_client: Cliente asincrono usado por acalculate(). Si no se
+            indica se envuelve el cliente sincrono.
+        :param use_snapshot: Si es True se consulta primero la copia local de
+            la serie incluida en el paquete y solo se pide al INE lo que falte.
+        """
+        if provider is None:
+            provider = default_index_provider(client, async_client, use_snapshot)
+        self.provider = provider
+
     def _fetch_irav(self, year: int, month: int) -> Decimal:
         """Obtiene el IRAV del INE para el ano y mes indicado."""
-        query_date = date(year, month, 1)
-        payload = IneClient.fetch_series_data(query_date, query_date, self._SERIES_IRAV)
-        if len(payload.get("Data", [])) > 0:
-            value = Decimal(payload["Data"][0]["Valor"])
-            return (value / Decimal("100")).quantize(
-                Decimal("0.001"), rounding=ROUND_HALF_UP
-            )
+        value = self.provider.get_value(self._SERIES_IRAV, year, month)
+        if value is not None:
+            return self._to_rate(value)
         raise ValueError(
             "Rent not updated: Could not fetch IRAV data for "
             f"{DateUtils.month_name_es(month)} {year}."
@@ -34,6 +64,102 @@ class IravUpdate(RentUpdateMethod):
         self,
         inputs: RentUpdateInput,
     ) -> RentUpdateResult:
+        return self._calculate(inputs, self._fetch_irav)
+
+    def calculate_many(
+        self,
+        inputs: Iterable[RentUpdateInput],
+    ) -> List[RentUpdateResult]:
+        inputs = list(inputs)
+        fetched = {
+            period: self._to_rate(value)
+            for period, value in self._prefetch_irav(inputs).items()
+        }
+
+        def fetch_once(year: int, month: int) -> Decimal:
+            key = (year, month)
+            if key not in fetched:
+                fetched[key] = self._fetch_irav(year, month)
+            return fetched[key]
+
+        return [self._calculate(item, fetch_once) for item in inputs]
+
+    def prefetch(self, inputs: Iterable[RentUpdateInput]) -> None:
+        self._prefetch_irav(list(inputs))
+
+    def index_periods(
+        self, inputs: Iterable[RentUpdateInput]
+    ) -> Dict[str, List[Tuple[int, int]]]:
+        periods = {
+            (item.year_start, item.month)
+            for item in inputs
+            if item.year_start is not None and item.month is not None
+        }
+        return {self._SERIES_IRAV: sorted(periods)}
+
+    def _prefetch_irav(
+        self, inputs: List[RentUpdateInput]
+    ) -> Dict[Tuple[int, int], Decimal]:
+        """Pide en una sola consulta todos los IRAV que la fuente no tiene a mano."""
+        periods = [
+            (item.year_start, item.month)
+            for item in inputs
+            if item.year_start is not None and item.month is not None
+        ]
+        missing = self.provider.missing_periods(self._SERIES_IRAV, periods)
+        if len(missing) < 2:
+            return {}
+        (start_year, start_month), (end_year, end_month) = missing[0], missing[-1]
+        return self.provider.get_range(
+            self._SERIES_IRAV,
+            date(start_year, start_month, 1),
+            date(end_year, end_month, 1),
+        )
+
+    @staticmethod
+    def _to_rate(value: Decimal) -> Decimal:
+        """Convierte el IRAV publicado (porcentaje) en tasa de variacion."""
+        return (value / Decimal("100")).quantize(
+            Decimal("0.001"), rounding=ROUND_HALF_UP
+        )
+
+    async def acalculate(
+        self,
+        inputs: RentUpdateInput,
+    ) -> RentUpdateResult:
+        self._validate(inputs)
+        try:
+            variation_rate = await self._afetch_irav(inputs.year_start, inputs.month)
+        except ConnectionError as err:
+            logging.getLogger(__name__).error("INE IRAV fetch failed: %s", err)
+            raise
+        return self._compute(inputs, variation_rate)
+
+    async def _afetch_irav(self, year: int, month: int) -> Decimal:
+        """Version asincrona de _fetch_irav."""
+        value = await self.provider.aget_value(self._SERIES_IRAV, year, month)
+        if value is not None:
+            return self._to_rate(value)
+        raise ValueError(
+            "Rent not updated: Could not fetch IRAV data for "
+            f"{DateUtils.month_name_es(month)} {year}."
+        )
+
+    def _calculate(
+        self,
+        inputs: RentUpdateInput,
+        fetch_irav: Callable[[int, int], Decimal],
+    ) -> RentUpdateResult:
+        self._validate(inputs)
+        try:
+            variation_rate = fetch_irav(inputs.year_start, inputs.month)
+        except ConnectionError as err:
+            logging.getLogger(__name__).error("INE IRAV fetch failed: %s", err)
+            raise
+        return self._compute(inputs, variation_rate)
+
+    @staticmethod
+    def _validate(inputs: RentUpdateInput) -> None:
         if inputs.year_start is None:
             raise ValueError("Year start is required.")
         if inputs.month is None:
@@ -42,22 +168,24 @@ class IravUpdate(RentUpdateMethod):
             inputs.year_start == 2024 and inputs.month < 11
         ):
             raise ValueError("IRAV data is only available from November 2024 onward.")
-        try:
-            amount = Decimal(inputs.amount).quantize(
-                Decimal("0.01"), rounding=ROUND_HALF_UP
-            )
-            variation_rate = self._fetch_irav(inputs.year_start, inputs.month)
-            if variation_rate is None or variation_rate.is_nan():
-                raise ValueError(
-                    "Rent not updated: Could not fetch IRAV data for "
-                    f"{DateUtils.month_name_es(inputs.month)} {inputs.year_start}."
-                )
-            updated_amount = (amount * (Decimal("1") + variation_rate)).quantize(
-                Decimal("0.01"), rounding=ROUND_HALF_UP
+
+    @staticmethod
+    def _compute(
+        inputs: RentUpdateInput,
+        variation_rate: Optional[Decimal],
+    ) -> RentUpdateResult:
+        """Calcula la actualizacion a partir del IRAV ya obtenido."""
+        if variation_rate is None or variation_rate.is_nan():
+            raise ValueError(
+                "Rent not updated: Could not fetch IRAV data for "
+                f"{DateUtils.month_name_es(inputs.month)} {inputs.year_start}."
             )
-        except ConnectionError as err:
-            logging.getLogger(__name__).error("INE IRAV fetch failed: %s", err)
-            raise
+        amount = Decimal(inputs.amount).quantize(
+            Decimal("0.01"), rounding=ROUND_HALF_UP
+        )
+        updated_amount = (amount * (Decimal("1") + variation_rate)).quantize(
+            Decimal("0.01"), rounding=ROUND_HALF_UP
+        )
         return RentUpdateResult(
             amount=amount,
             year_start=inputs.year_start,
@@ -10,6 +10,8 @@ from arrendatools.rent_update.base import (
 class PercentageUpdate(RentUpdateMethod):
     """Implementacion de actualizacion por porcentaje."""
 
+    key = "percentage"
+
     def calculate(
         self,
         inputs: RentUpdateInput,
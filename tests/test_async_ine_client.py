@@ -0,0 +1,162 @@
+import json
+import threading
+import unittest
+from datetime import date
+from decimal import Decimal
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from arrendatools.rent_update.async_ine_client import AsyncIneClient
+from arrendatools.rent_update.base import RentUpdateInput, RentUpdateResult
+from arrendatools.rent_update.ine_client import IneClient
+from arrendatools.rent_update.strategies.ipc import IpcUpdate
+from arrendatools.rent_update.strategies.irav import IravUpdate
+
+
+class _StubIneHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        url = urlparse(self.path)
+        series = url.path.rsplit("/", 1)[-1]
+        start, _ = parse_qs(url.query)["date"][0].split(":")
+        self.server.requests.append((series, start))
+        if self.server.barrier is not None:
+            try:
+                self.server.barrier.wait()
+            except threading.BrokenBarrierError:
+                self.send_error(500)
+                return
+        value = self.server.values.get((series, start))
+        data = []
+        if value is not None:
+            data.append(
+                {"Anyo": int(start[:4]), "FK_Periodo": int(start[4:6]), "Valor": value}
+            )
+        body = json.dumps({"Data": data}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TestAsyncIneClient(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), _StubIneHandler)
+        self.server.requests = []
+        self.server.barrier = None
+        self.server.values = {
+            ("IPC290751", "20020801"): 60.03,
+            ("IPC290751", "20030801"): 61.827,
+            ("IRAV1", "20241101"): 2.2,
+        }
+        self._thread = threading.Thread(
+            target=self.server.serve_forever,
+            kwargs={"poll_interval": 0.01},
+            daemon=True,
+        )
+        self._thread.start()
+        self._memory_cache = IneClient._memory_cache
+        self._disk_cache = IneClient._disk_cache
+        IneClient.set_memory_cache(None)
+        IneClient.set_disk_cache(None)
+        host, port = self.server.server_address
+        self.client = IneClient(base_url=f"http://{host}:{port}/DATOS_SERIE", timeout=5)
+        self.async_client = AsyncIneClient(self.client)
+
+    def tearDown(self):
+        IneClient.set_memory_cache(self._memory_cache)
+        IneClient.set_disk_cache(self._disk_cache)
+        self.client.close()
+        self.server.shutdown()
+        self.server.server_close()
+
+    async def test_fetch_series_data(self):
+        payload = await self.async_client.fetch_series_data(
+            date(2003, 8, 1), date(2003, 8, 1), "IPC290751"
+        )
+        self.assertEqual(
+            payload, {"Data": [{"Anyo": 2003, "FK_Periodo": 8, "Valor": 61.827}]}
+        )
+
+    async def test_fetch_series_value(self):
+        value = await self.async_client.fetch_series_value("IRAV1", 2024, 11)
+        self.assertEqual(value, Decimal("2.2"))
+        self.assertIsNone(await self.async_client.fetch_series_value("IRAV1", 2030, 1))
+
+    async def test_ipc_acalculate_fetches_indices_concurrently(self):
+        self.server.barrier = threading.Barrier(2, timeout=5)
+        rent_update = IpcUpdate(async_client=self.async_client, use_snapshot=False)
+
+        result = await rent_update.acalculate(
+            RentUpdateInput(
+                amount=Decimal("400.00"), year_start=2002, year_end=2003, month=8
+            )
+        )
+
+        expected = RentUpdateResult(
+            amount=Decimal("400.00"),
+            updated_amount=Decimal("412.00"),
+            index_start=Decimal("60.030"),
+            index_end=Decimal("61.827"),
+            month="agosto",
+            year_start=2002,
+            year_end=2003,
+            variation_rate=Decimal("0.03"),
+        )
+        self.assertEqual(result, expected)
+        self.assertCountEqual(
+            self.server.requests,
+            [("IPC290751", "20020801"), ("IPC290751", "20030801")],
+        )
+
+    async def test_ipc_acalculate_pre_2002_does_not_fetch(self):
+        rent_update = IpcUpdate(async_client=self.async_client)
+
+        result = await rent_update.acalculate(
+            RentUpdateInput(
+                amount=Decimal("400.00"), year_start=1999, year_end=2001, month=8
+            )
+        )
+
+        self.assertEqual(result.updated_amount, Decimal("429.60"))
+        self.assertEqual(self.server.requests, [])
+
+    async def test_ipc_acalculate_missing_data(self):
+        rent_update = IpcUpdate(async_client=self.async_client)
+
+        with self.assertRaises(ValueError) as context:
+            await rent_update.acalculate(
+                RentUpdateInput(
+                    amount=Decimal("400.00"), year_start=2003, year_end=2030, month=8
+                )
+            )
+        self.assertEqual(
+            str(context.exception),
+            "Rent not updated: Could not fetch IPC data for agosto 2030.",
+        )
+
+    async def test_irav_acalculate(self):
+        rent_update = IravUpdate(async_client=self.async_client)
+
+        result = await rent_update.acalculate(
+            RentUpdateInput(amount=Decimal("1000.00"), month=11, year_start=2024)
+        )
+
+        self.assertEqual(result.updated_amount, Decimal("1022.00"))
+        self.assertEqual(result.variation_rate, Decimal("0.022"))
+
+    async def test_acalculate_connection_error(self):
+        rent_update = IravUpdate(async_client=self.async_client, use_snapshot=False)
+        self.client.base_url = "http://127.0.0.1:9/DATOS_SERIE"
+
+        with self.assertRaises(ConnectionError):
+            await rent_update.acalculate(
+                RentUpdateInput(amount=Decimal("1000.00"), month=11, year_start=2024)
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,140 @@
+import csv
+import io
+import os
+import tempfile
+import unittest
+from datetime import date
+from decimal import Decimal
+from unittest.mock import patch
+
+from arrendatools.rent_update import cli
+from arrendatools.rent_update.index_cache import DiskIndexCache
+from arrendatools.rent_update.ine_client import IneClient
+
+_CSV = """method,amount,data,month,year_start,year_end
+percentage,100.00,0.10,,,
+fixed_amount,100.00,5,,,
+percentage,200.00,0.10,,,
+unknown,100.00,,,,
+fixed_amount,200.00,5,,,
+"""
+
+
+class TestCli(unittest.TestCase):
+    def setUp(self):
+        self._directory = tempfile.TemporaryDirectory()
+        self.directory = self._directory.name
+        self.source = os.path.join(self.directory, "leases.csv")
+        with open(self.source, "w", encoding="utf-8") as handle:
+            handle.write(_CSV)
+        self._memory_cache = IneClient._memory_cache
+        self._disk_cache = IneClient._disk_cache
+
+    def tearDown(self):
+        IneClient.set_memory_cache(self._memory_cache)
+        IneClient.set_disk_cache(self._disk_cache)
+        self._directory.cleanup()
+
+    def _main(self, *argv):
+        with patch("sys.stderr", new_callable=io.StringIO) as stderr:
+            code = cli.main(list(argv))
+        return code, stderr.getvalue()
+
+    def _read_output(self, path):
+        with open(path, encoding="utf-8") as handle:
+            return list(csv.DictReader(handle))
+
+    def test_single_process(self):
+        output = os.path.join(self.directory, "results.csv")
+
+        code, stderr = self._main(self.source, "-o", output)
+
+        rows = self._read_output(output)
+        self.assertEqual(code, 0)
+        self.assertEqual(stderr, "Processed 5 rows (1 with errors).\n")
+        self.assertEqual(
+            [row["updated_amount"] for row in rows],
+            ["110.00", "105.00", "220.00", "", "205.00"],
+        )
+        self.assertIn("Unknown update type", rows[3]["error"])
+
+    def test_method_for_all_rows(self):
+        output = os.path.join(self.directory, "results.csv")
+
+        self._main(self.source, "-o", output, "--method", "fixed_amount")
+
+        rows = self._read_output(output)
+        self.assertEqual(rows[0]["updated_amount"], "100.10")
+        self.assertEqual(rows[3]["error"], "Field 'data' is required.")
+
+    def test_workers_keep_row_order(self):
+        output = os.path.join(self.directory, "results.csv")
+
+        code, _ = self._main(
+            self.source, "-o", output, "--workers", "2", "--batch-size", "1", "--no-warm"
+        )
+
+        rows = self._read_output(output)
+        self.assertEqual(code, 0)
+        self.assertEqual(
+            [row["updated_amount"] for row in rows],
+            ["110.00", "105.00", "220.00", "", "205.00"],
+        )
+
+    def test_workers_share_disk_cache(self):
+        cache_dir = os.path.join(self.directory, "cache")
+        cache = DiskIndexCache(cache_dir)
+        cache.set("IPC290751", 2002, 8, Decimal("60.030"))
+        cache.set("IPC290751", 2003, 8, Decimal("61.827"))
+        source = os.path.join(self.directory, "ipc.jsonl")
+        with open(source, "w", encoding="utf-8") as handle:
+            for _ in range(4):
+                handle.write(
+                    '{"amount": "400.00", "month": 8, "year_start": 2002, "year_end": 2003}\n'
+                )
+        output = os.path.join(self.directory, "results.csv")
+        IneClient.set_memory_cache(None)
+
+        self._main(
+            source, "-o", output, "-m", "ipc", "-w", "2", "--batch-size", "1",
+            "--cache-dir", cache_dir, "--no-warm",
+        )
+
+        rows = self._read_output(output)
+        self.assertEqual([row["updated_amount"] for row in rows], ["412.00"] * 4)
+        self.assertEqual({row["error"] for row in rows}, {""})
+        self.assertIsNone(IneClient._disk_cache)
+
+    @patch("arrendatools.rent_update.ine_snapshot.SERIES", {})
+    def test_warm_index_cache(self):
+        with patch.object(IneClient, "prefetch_series", return_value={}) as prefetch:
+            cli.warm_index_cache(date(2025, 1, 1))
+        prefetch.assert_any_call("IPC290751", date(2002, 1, 1), date(2025, 1, 1))
+        prefetch.assert_any_call("IRAV1", date(2024, 11, 1), date(2025, 1, 1))
+
+    def test_warm_failure_is_logged(self):
+        output = os.path.join(self.directory, "results.csv")
+        with patch.object(cli, "warm_index_cache", side_effect=ConnectionError("down")):
+            with self.assertLogs(level="WARNING") as logs:
+                code, _ = self._main(self.source, "-o", output, "-w", "2")
+        self.assertEqual(code, 0)
+        self.assertIn("Could not warm the index cache: down", logs.output[0])
+
+    def test_stdout_defaults_to_csv(self):
+        with patch("sys.stdout", new_callable=io.StringIO) as stdout:
+            self._main(self.source, "--method", "percentage")
+        self.assertTrue(stdout.getvalue().startswith("method,amount,data"))
+
+    def test_invalid_arguments(self):
+        for argv in (
+            [self.source, "--workers", "0"],
+            [self.source, "--batch-size", "0"],
+            ["-"],
+        ):
+            with patch("sys.stderr", new_callable=io.StringIO):
+                with self.assertRaises(SystemExit):
+                    cli.main(argv)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,64 @@
+import asyncio
+import unittest
+
+from arrendatools.rent_update.deadline import (
+    Deadline,
+    DeadlineExceeded,
+    current_deadline,
+    deadline,
+)
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestDeadline(unittest.TestCase):
+    def test_remaining_and_check(self):
+        clock = _Clock()
+        budget = Deadline(2, clock=clock)
+        clock.now = 0.5
+        self.assertEqual(budget.check(), 1.5)
+        self.assertFalse(budget.expired())
+
+        clock.now = 3
+        self.assertEqual(budget.remaining(), 0.0)
+        self.assertTrue(budget.expired())
+        with self.assertRaises(DeadlineExceeded) as context:
+            budget.check("the IPC lookup")
+        self.assertIsInstance(context.exception, TimeoutError)
+        self.assertEqual(
+            str(context.exception), "Deadline of 2 s exceeded during the IPC lookup."
+        )
+
+    def test_negative_timeout(self):
+        with self.assertRaises(ValueError):
+            Deadline(-1)
+
+    def test_context_manager_and_nesting(self):
+        self.assertIsNone(current_deadline())
+        with deadline(10) as outer:
+            self.assertIs(current_deadline(), outer)
+            with deadline(60) as inner:
+                self.assertIs(inner, outer)
+            with deadline(1) as inner:
+                self.assertIsNot(inner, outer)
+                self.assertIs(current_deadline(), inner)
+            self.assertIs(current_deadline(), outer)
+        self.assertIsNone(current_deadline())
+
+    def test_propagates_to_worker_threads_of_to_thread(self):
+        async def run():
+            with deadline(5) as budget:
+                return budget, await asyncio.to_thread(current_deadline)
+
+        budget, seen = asyncio.run(run())
+        self.assertIs(seen, budget)
+
+
+if __name__ == "__main__":
+    unittest.main()
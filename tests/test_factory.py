@@ -1,5 +1,10 @@
+import json
+import os
+import tempfile
 import unittest
+from concurrent.futures import ThreadPoolExecutor
 from decimal import Decimal
+from unittest.mock import patch
 
 from arrendatools.rent_update.base import (
     RentUpdateInput,
@@ -7,6 +12,7 @@ from arrendatools.rent_update.base import (
     RentUpdateResult,
 )
 from arrendatools.rent_update.factory import RentUpdateFactory
+from arrendatools.rent_update.index_provider import BundledIndexProvider
 
 
 class TestRentUpdateFactory(unittest.TestCase):
@@ -27,22 +33,23 @@ class TestRentUpdateFactory(unittest.TestCase):
             return []
 
     class _DummyEntryPoint:
-        def __init__(self, name, klass):
+        def __init__(self, name, value):
             self.name = name
-            self._klass = klass
-
-        def load(self):
-            return self._klass
+            self.value = value
 
     def setUp(self):
         self._registry = RentUpdateFactory._registry.copy()
-        self._entry_points_loaded = RentUpdateFactory._entry_points_loaded
-        self._builtins_loaded = RentUpdateFactory._builtins_loaded
+        self._entry_point_paths = RentUpdateFactory._entry_point_paths
+        self._entry_point_cache = RentUpdateFactory._entry_point_cache
 
     def tearDown(self):
         RentUpdateFactory._registry = self._registry
-        RentUpdateFactory._entry_points_loaded = self._entry_points_loaded
-        RentUpdateFactory._builtins_loaded = self._builtins_loaded
+        RentUpdateFactory._entry_point_paths = self._entry_point_paths
+        RentUpdateFactory._entry_point_cache = self._entry_point_cache
+
+    def _reset_lazy_state(self):
+        RentUpdateFactory._registry = {}
+        RentUpdateFactory._entry_point_paths = None
 
     def test_create_unknown_type_raises(self):
         with self.assertRaises(ValueError) as context:
@@ -63,29 +70,23 @@ class TestRentUpdateFactory(unittest.TestCase):
         instance = RentUpdateFactory.create("ipc_then_percentage")
         self.assertIsInstance(instance, RentUpdateMethod)
 
-    def test_load_entry_points_select(self):
-        entry_point = self._DummyEntryPoint("custom_ep", self.CustomUpdate)
-        dummy_entry_points = self._DummyEntryPoints([entry_point])
-
-        RentUpdateFactory._registry = {}
-        RentUpdateFactory._entry_points_loaded = False
-        RentUpdateFactory._builtins_loaded = True
+    def test_entry_points_select(self):
+        self._reset_lazy_state()
+        path = f"{__name__}:TestRentUpdateFactory.CustomUpdate"
+        entry_point = self._DummyEntryPoint("custom_ep", path)
 
         with unittest.mock.patch(
             "arrendatools.rent_update.factory.metadata.entry_points",
-            return_value=dummy_entry_points,
+            return_value=self._DummyEntryPoints([entry_point]),
         ):
-            RentUpdateFactory._load_entry_points()
+            instance = RentUpdateFactory.create("custom_ep")
 
-        instance = RentUpdateFactory.create("custom_ep")
-        self.assertIsInstance(instance, RentUpdateMethod)
+        self.assertIsInstance(instance, self.CustomUpdate)
 
-    def test_load_entry_points_fallback(self):
-        entry_point = self._DummyEntryPoint("custom_ep", self.CustomUpdate)
-
-        RentUpdateFactory._registry = {}
-        RentUpdateFactory._entry_points_loaded = False
-        RentUpdateFactory._builtins_loaded = True
+    def test_entry_points_fallback(self):
+        self._reset_lazy_state()
+        path = f"{__name__}:TestRentUpdateFactory.CustomUpdate"
+        entry_point = self._DummyEntryPoint("custom_ep", path)
 
         class _FallbackEntryPoints:
             def get(self, group, default=None):
@@ -97,10 +98,127 @@ class TestRentUpdateFactory(unittest.TestCase):
             "arrendatools.rent_update.factory.metadata.entry_points",
             return_value=_FallbackEntryPoints(),
         ):
-            RentUpdateFactory._load_entry_points()
+            instance = RentUpdateFactory.create("custom_ep")
 
-        instance = RentUpdateFactory.create("custom_ep")
-        self.assertIsInstance(instance, RentUpdateMethod)
+        self.assertIsInstance(instance, self.CustomUpdate)
+
+    def test_create_injects_provider(self):
+        provider = BundledIndexProvider()
+        instance = RentUpdateFactory.create("ipc", provider=provider)
+        self.assertIs(instance.provider, provider)
+
+        composite = RentUpdateFactory.create("min_ipc_or_percentage", provider=provider)
+        self.assertIs(composite.provider, provider)
+
+    def test_create_ignores_provider_for_strategies_without_indices(self):
+        instance = RentUpdateFactory.create("percentage", provider=BundledIndexProvider())
+        self.assertFalse(hasattr(instance, "provider"))
+
+    def test_builtin_does_not_scan_entry_points(self):
+        self._reset_lazy_state()
+
+        with patch(
+            "arrendatools.rent_update.factory.metadata.entry_points"
+        ) as entry_points:
+            instance = RentUpdateFactory.create("percentage")
+
+        entry_points.assert_not_called()
+        self.assertEqual(type(instance).__name__, "PercentageUpdate")
+        self.assertEqual(list(RentUpdateFactory._registry), ["percentage"])
+
+    def test_entry_point_resolved_per_key(self):
+        self._reset_lazy_state()
+        path = f"{__name__}:TestRentUpdateFactory.CustomUpdate"
+        broken = self._DummyEntryPoint("broken", "missing.module:Broken")
+        entry_point = self._DummyEntryPoint("custom_ep", path)
+
+        with patch(
+            "arrendatools.rent_update.factory.metadata.entry_points",
+            return_value=self._DummyEntryPoints([broken, entry_point]),
+        ) as entry_points:
+            instance = RentUpdateFactory.create("custom_ep")
+            RentUpdateFactory.create("custom_ep")
+            with self.assertRaises(ValueError) as context:
+                RentUpdateFactory.create("unknown")
+
+        entry_points.assert_called_once_with()
+        self.assertIsInstance(instance, self.CustomUpdate)
+        self.assertNotIn("broken", RentUpdateFactory._registry)
+        self.assertIn("broken, custom_ep, fixed_amount", str(context.exception))
+
+    def test_entry_point_cache_is_shared(self):
+        self._reset_lazy_state()
+        path = f"{__name__}:TestRentUpdateFactory.CustomUpdate"
+        entry_point = self._DummyEntryPoint("custom_ep", path)
+
+        with tempfile.TemporaryDirectory() as directory:
+            cache = os.path.join(directory, "plugins", "entry_points.json")
+            RentUpdateFactory.set_entry_point_cache(cache)
+            with patch(
+                "arrendatools.rent_update.factory.metadata.entry_points",
+                return_value=self._DummyEntryPoints([entry_point]),
+            ):
+                self.assertEqual(RentUpdateFactory.entry_point_paths(), {"custom_ep": path})
+            with open(cache, encoding="utf-8") as handle:
+                self.assertEqual(json.load(handle)["entry_points"], {"custom_ep": path})
+
+            # Otro proceso con los mismos paquetes instalados lee el fichero.
+            RentUpdateFactory.set_entry_point_cache(cache)
+            with patch(
+                "arrendatools.rent_update.factory.metadata.entry_points"
+            ) as entry_points:
+                instance = RentUpdateFactory.create("custom_ep")
+            entry_points.assert_not_called()
+            self.assertIsInstance(instance, self.CustomUpdate)
+
+            # Si cambian los paquetes instalados se vuelve a buscar.
+            RentUpdateFactory.set_entry_point_cache(cache)
+            with patch(
+                "arrendatools.rent_update.factory._environment_fingerprint",
+                return_value=[["changed", 0]],
+            ), patch(
+                "arrendatools.rent_update.factory.metadata.entry_points",
+                return_value=self._DummyEntryPoints([]),
+            ) as entry_points:
+                self.assertEqual(RentUpdateFactory.entry_point_paths(), {})
+            entry_points.assert_called_once_with()
+
+    def test_shared_instances(self):
+        RentUpdateFactory.clear_shared_instances()
+        provider = BundledIndexProvider()
+
+        ipc = RentUpdateFactory.create("ipc", provider=provider, shared=True)
+
+        self.assertIs(RentUpdateFactory.create("IPC", provider=provider, shared=True), ipc)
+        self.assertIsNot(RentUpdateFactory.create("ipc", provider=provider), ipc)
+        self.assertIsNot(
+            RentUpdateFactory.create("ipc", provider=BundledIndexProvider(), shared=True),
+            ipc,
+        )
+        percentage = RentUpdateFactory.create("percentage", shared=True)
+        self.assertIs(
+            RentUpdateFactory.create("percentage", provider=provider, shared=True),
+            percentage,
+        )
+
+        RentUpdateFactory.clear_shared_instances()
+        self.assertIsNot(RentUpdateFactory.create("ipc", provider=provider, shared=True), ipc)
+        RentUpdateFactory.clear_shared_instances()
+
+    def test_shared_instance_is_created_once_across_threads(self):
+        RentUpdateFactory.clear_shared_instances()
+        provider = BundledIndexProvider()
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            instances = list(
+                executor.map(
+                    lambda _: RentUpdateFactory.create(
+                        "min_ipc_or_percentage", provider=provider, shared=True
+                    ),
+                    range(32),
+                )
+            )
+        self.assertEqual(len({id(instance) for instance in instances}), 1)
+        RentUpdateFactory.clear_shared_instances()
 
 
 if __name__ == "__main__":
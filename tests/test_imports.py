@@ -0,0 +1,95 @@
+import os
+import subprocess
+import sys
+import unittest
+
+# Modulos que no deben cargarse solo por importar el paquete.
+_HEAVY_MODULES = (
+    "requests",
+    "asyncio",
+    "sqlite3",
+    "arrendatools.rent_update.factory",
+    "arrendatools.rent_update.strategies.ipc",
+    "arrendatools.rent_update.strategies.ipc_data",
+)
+
+# Presupuestos holgados para maquinas lentas, en segundos. En una maquina de
+# desarrollo importar PercentageUpdate tarda ~30 ms (casi todo biblioteca
+# estandar) e IpcUpdate ~80 ms.
+_IMPORT_TIME_BUDGETS = {
+    "from arrendatools.rent_update import PercentageUpdate": 0.15,
+    "from arrendatools.rent_update import IpcUpdate": 0.3,
+}
+
+
+def _run_python(*args):
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path))
+    return subprocess.run(
+        [sys.executable, *args], capture_output=True, text=True, env=env, check=True
+    )
+
+
+def _loaded_modules(statement):
+    code = (
+        f"import sys\n{statement}\n"
+        f"print(','.join(m for m in {_HEAVY_MODULES!r} if m in sys.modules))"
+    )
+    output = _run_python("-c", code).stdout.strip()
+    return output.split(",") if output else []
+
+
+class TestLazyImports(unittest.TestCase):
+    def test_package_import_is_lazy(self):
+        self.assertEqual(_loaded_modules("import arrendatools.rent_update"), [])
+
+    def test_percentage_does_not_load_index_modules(self):
+        self.assertEqual(
+            _loaded_modules("from arrendatools.rent_update import PercentageUpdate"),
+            [],
+        )
+
+    def test_factory_imports_only_requested_strategy(self):
+        self.assertEqual(
+            _loaded_modules(
+                "from arrendatools.rent_update.factory import RentUpdateFactory\n"
+                "RentUpdateFactory.create('percentage')"
+            ),
+            ["arrendatools.rent_update.factory"],
+        )
+
+    def test_attributes_are_resolved_on_demand(self):
+        import arrendatools.rent_update as rent_update
+        from arrendatools.rent_update.strategies.ipc import IpcUpdate
+
+        self.assertIs(rent_update.IpcUpdate, IpcUpdate)
+        self.assertIn("IpcUpdate", dir(rent_update))
+        with self.assertRaises(AttributeError):
+            rent_update.UnknownUpdate
+
+    def test_ipc_does_not_load_requests_or_sqlite(self):
+        self.assertEqual(
+            _loaded_modules("from arrendatools.rent_update import IpcUpdate"),
+            [
+                "arrendatools.rent_update.strategies.ipc",
+                "arrendatools.rent_update.strategies.ipc_data",
+            ],
+        )
+
+    def test_import_time_budget(self):
+        # -X importtime no ve los modulos cargados con import_module desde el
+        # __getattr__ del paquete, asi que se mide el tiempo total de la
+        # sentencia en un interprete nuevo; se toma el mejor de tres.
+        for statement, budget in _IMPORT_TIME_BUDGETS.items():
+            with self.subTest(statement=statement):
+                code = (
+                    f"import time\nstarted = time.perf_counter()\n{statement}\n"
+                    "print(time.perf_counter() - started)"
+                )
+                elapsed = min(
+                    float(_run_python("-c", code).stdout) for _ in range(3)
+                )
+                self.assertLess(elapsed, budget)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,167 @@
+import os
+import tempfile
+import threading
+import unittest
+from datetime import date
+from decimal import Decimal
+
+from arrendatools.rent_update.index_cache import DiskIndexCache, MemoryIndexCache
+
+
+class TestMemoryIndexCache(unittest.TestCase):
+    def test_get_counts_hits_and_misses(self):
+        cache = MemoryIndexCache()
+        self.assertIsNone(cache.get("IPC290751", 2003, 8))
+        cache.set("IPC290751", 2003, 8, Decimal("61.827"))
+        self.assertEqual(cache.get("IPC290751", 2003, 8), Decimal("61.827"))
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+    def test_evicts_least_recently_used(self):
+        cache = MemoryIndexCache(maxsize=2)
+        cache.set("IPC290751", 2002, 8, Decimal("60.030"))
+        cache.set("IPC290751", 2003, 8, Decimal("61.827"))
+        cache.get("IPC290751", 2002, 8)
+        cache.set("IPC290751", 2004, 8, Decimal("63.671"))
+
+        self.assertEqual(len(cache), 2)
+        self.assertIsNone(cache.get("IPC290751", 2003, 8))
+        self.assertEqual(cache.get("IPC290751", 2002, 8), Decimal("60.030"))
+
+    def test_invalidate(self):
+        cache = MemoryIndexCache()
+        cache.set("IPC290751", 2002, 8, Decimal("60.030"))
+        cache.set("IPC290751", 2003, 8, Decimal("61.827"))
+        cache.set("IRAV1", 2024, 11, Decimal("2.2"))
+
+        cache.invalidate("IPC290751", year=2003)
+        self.assertIsNone(cache.get("IPC290751", 2003, 8))
+        self.assertIsNotNone(cache.get("IPC290751", 2002, 8))
+
+        cache.invalidate("IPC290751")
+        self.assertEqual(len(cache), 1)
+
+    def test_set_many(self):
+        cache = MemoryIndexCache(maxsize=2)
+        cache.set_many(
+            "IPC290751",
+            {(2002, 8): Decimal("60.030"), (2003, 8): Decimal("61.827"), (2004, 8): Decimal("63.0")},
+        )
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(cache.get("IPC290751", 2004, 8), Decimal("63.0"))
+        self.assertNotIn(("IPC290751", 2002, 8), cache)
+
+    def test_recent_values_expire(self):
+        now = [0.0]
+        cache = MemoryIndexCache(recent_ttl=60, clock=lambda: now[0])
+        today = date.today()
+        cache.set("IRAV1", today.year, today.month, Decimal("2.2"))
+        cache.set("IRAV1", 2024, 11, Decimal("2.2"))
+
+        now[0] = 59
+        self.assertEqual(cache.get("IRAV1", today.year, today.month), Decimal("2.2"))
+        now[0] = 60
+        self.assertNotIn(("IRAV1", today.year, today.month), cache)
+        self.assertIsNone(cache.get("IRAV1", today.year, today.month))
+        self.assertEqual(cache.get("IRAV1", 2024, 11), Decimal("2.2"))
+        self.assertEqual(len(cache), 1)
+
+        cache.set("IRAV1", today.year, today.month, Decimal("2.3"))
+        self.assertEqual(cache.get("IRAV1", today.year, today.month), Decimal("2.3"))
+
+    def test_clear_resets_counters(self):
+        cache = MemoryIndexCache()
+        cache.set("IPC290751", 2003, 8, Decimal("61.827"))
+        cache.get("IPC290751", 2003, 8)
+        cache.clear()
+        self.assertEqual((len(cache), cache.hits, cache.misses), (0, 0, 0))
+
+    def test_invalid_maxsize(self):
+        with self.assertRaises(ValueError) as context:
+            MemoryIndexCache(maxsize=0)
+        self.assertEqual(str(context.exception), "Max size must be at least 1.")
+        with self.assertRaises(ValueError):
+            MemoryIndexCache(recent_months=-1)
+        with self.assertRaises(ValueError):
+            MemoryIndexCache(recent_ttl=-1)
+
+
+class TestDiskIndexCache(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.directory = os.path.join(self._tmp.name, "cache")
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_get_missing_returns_none(self):
+        cache = DiskIndexCache(self.directory)
+        self.assertIsNone(cache.get("IPC290751", 2003, 8))
+
+    def test_set_and_get_historical_value(self):
+        cache = DiskIndexCache(self.directory, recent_ttl=0)
+        cache.set("IPC290751", 2003, 8, Decimal("61.827"))
+        self.assertEqual(cache.get("IPC290751", 2003, 8), Decimal("61.827"))
+
+    def test_values_persist_across_instances(self):
+        DiskIndexCache(self.directory).set("IRAV1", 2024, 11, Decimal("2.2"))
+        cache = DiskIndexCache(self.directory)
+        self.assertEqual(cache.get("IRAV1", 2024, 11), Decimal("2.2"))
+        self.assertIsNone(cache.get("IPC290751", 2024, 11))
+
+    def test_recent_value_expires_after_ttl(self):
+        today = date.today()
+        cache = DiskIndexCache(self.directory, recent_ttl=0)
+        cache.set("IPC290751", today.year, today.month, Decimal("100.0"))
+        self.assertIsNone(cache.get("IPC290751", today.year, today.month))
+
+    def test_recent_value_within_ttl(self):
+        today = date.today()
+        cache = DiskIndexCache(self.directory, recent_ttl=3600)
+        cache.set("IPC290751", today.year, today.month, Decimal("100.0"))
+        self.assertEqual(
+            cache.get("IPC290751", today.year, today.month), Decimal("100.0")
+        )
+
+    def test_set_many_in_one_transaction(self):
+        cache = DiskIndexCache(self.directory)
+        values = {(year, month): Decimal(f"{year}.{month}") for year in range(1990, 2027) for month in range(1, 13)}
+        statements = []
+        cache._connection().set_trace_callback(statements.append)
+
+        cache.set_many("IPC290751", values)
+
+        self.assertEqual(statements.count("COMMIT"), 1)
+        self.assertEqual(cache.get("IPC290751", 2003, 8), Decimal("2003.8"))
+        self.assertEqual(DiskIndexCache(self.directory).get("IPC290751", 1990, 1), Decimal("1990.1"))
+
+    def test_connection_is_reused_per_thread(self):
+        cache = DiskIndexCache(self.directory)
+        connection = cache._connection()
+        self.assertIs(cache._connection(), connection)
+
+        other = []
+        thread = threading.Thread(target=lambda: other.append(cache._connection()))
+        thread.start()
+        thread.join()
+        self.assertIsNot(other[0], connection)
+
+        cache.close()
+        self.assertIsNot(cache._connection(), connection)
+
+    def test_clear(self):
+        cache = DiskIndexCache(self.directory)
+        cache.set("IPC290751", 2003, 8, Decimal("61.827"))
+        cache.clear()
+        self.assertIsNone(cache.get("IPC290751", 2003, 8))
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(ValueError) as context:
+            DiskIndexCache(self.directory, recent_months=-1)
+        self.assertEqual(str(context.exception), "Recent months cannot be negative.")
+        with self.assertRaises(ValueError) as context:
+            DiskIndexCache(self.directory, recent_ttl=-1)
+        self.assertEqual(str(context.exception), "Recent TTL cannot be negative.")
+
+
+if __name__ == "__main__":
+    unittest.main()
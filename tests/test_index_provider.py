@@ -0,0 +1,375 @@
+import asyncio
+import pickle
+import unittest
+from datetime import date
+from decimal import Decimal
+from unittest.mock import Mock, patch
+
+from arrendatools.rent_update import ine_snapshot
+from arrendatools.rent_update.base import RentUpdateInput
+from arrendatools.rent_update.index_cache import MemoryIndexCache
+from arrendatools.rent_update.index_provider import (
+    SERIES_IPC_BASE_1992,
+    BundledIndexProvider,
+    CachingIndexProvider,
+    ChainedIndexProvider,
+    IndexProvider,
+    IneIndexProvider,
+    StaleWhileRevalidateIndexProvider,
+    StaticIndexProvider,
+    default_index_provider,
+)
+from arrendatools.rent_update.ine_client import IneClient
+from arrendatools.rent_update.strategies.ipc import IpcUpdate
+from arrendatools.rent_update.strategies.irav import IravUpdate
+
+
+class _DictIndexProvider(IndexProvider):
+    def __init__(self, values):
+        self.values = values
+        self.calls = []
+
+    def get_value(self, series, year, month):
+        self.calls.append((series, year, month))
+        return self.values.get((series, year, month))
+
+
+class TestIndexProvider(unittest.TestCase):
+    def test_default_get_range(self):
+        provider = _DictIndexProvider(
+            {("IRAV1", 2024, 11): Decimal("2.2"), ("IRAV1", 2025, 1): Decimal("2.0")}
+        )
+
+        values = provider.get_range("IRAV1", date(2024, 11, 1), date(2025, 2, 1))
+
+        self.assertEqual(
+            values, {(2024, 11): Decimal("2.2"), (2025, 1): Decimal("2.0")}
+        )
+        self.assertEqual(len(provider.calls), 4)
+
+    def test_default_missing_periods(self):
+        provider = _DictIndexProvider({})
+        self.assertEqual(
+            provider.missing_periods("IRAV1", [(2025, 1), (2024, 11), (2025, 1)]),
+            [(2024, 11), (2025, 1)],
+        )
+
+    def test_default_aget_value(self):
+        provider = _DictIndexProvider({("IRAV1", 2024, 11): Decimal("2.2")})
+        self.assertEqual(
+            asyncio.run(provider.aget_value("IRAV1", 2024, 11)), Decimal("2.2")
+        )
+
+
+class TestIneIndexProvider(unittest.TestCase):
+    def test_delegates_to_client(self):
+        client = Mock()
+        client.fetch_series_value.return_value = Decimal("2.2")
+        client.prefetch_series.return_value = {(2024, 11): Decimal("2.2")}
+        client.missing_periods.return_value = [(2024, 11)]
+        provider = IneIndexProvider(client)
+
+        self.assertEqual(provider.get_value("IRAV1", 2024, 11), Decimal("2.2"))
+        self.assertEqual(
+            provider.get_range("IRAV1", date(2024, 11, 1), date(2024, 12, 1)),
+            {(2024, 11): Decimal("2.2")},
+        )
+        self.assertEqual(
+            provider.missing_periods("IRAV1", [(2024, 11)]), [(2024, 11)]
+        )
+        client.fetch_series_value.assert_called_once_with("IRAV1", 2024, 11)
+        client.prefetch_series.assert_called_once_with(
+            "IRAV1", date(2024, 11, 1), date(2024, 12, 1)
+        )
+
+    def test_default_client(self):
+        self.assertIs(IneIndexProvider().client, IneClient.default())
+
+
+class TestBundledIndexProvider(unittest.TestCase):
+    def test_ipc_base_1992(self):
+        provider = BundledIndexProvider()
+        self.assertEqual(
+            provider.get_value(SERIES_IPC_BASE_1992, 2001, 8), Decimal("136.745")
+        )
+        self.assertIsNone(provider.get_value(SERIES_IPC_BASE_1992, 2030, 8))
+
+    def test_snapshot(self):
+        series = {"IRAV1": {2024: [None] * 10 + [2.2, None]}}
+        with patch.object(ine_snapshot, "SERIES", series):
+            self.assertEqual(
+                BundledIndexProvider().get_value("IRAV1", 2024, 11), Decimal(2.2)
+            )
+            self.assertIsNone(
+                BundledIndexProvider(include_snapshot=False).get_value(
+                    "IRAV1", 2024, 11
+                )
+            )
+            self.assertEqual(
+                BundledIndexProvider().missing_periods(
+                    "IRAV1", [(2024, 12), (2024, 11)]
+                ),
+                [(2024, 12)],
+            )
+
+
+class TestCachingIndexProvider(unittest.TestCase):
+    def test_get_value_is_cached(self):
+        inner = _DictIndexProvider({("IRAV1", 2024, 11): Decimal("2.2")})
+        provider = CachingIndexProvider(inner)
+
+        self.assertEqual(provider.get_value("IRAV1", 2024, 11), Decimal("2.2"))
+        self.assertEqual(provider.get_value("IRAV1", 2024, 11), Decimal("2.2"))
+        self.assertIsNone(provider.get_value("IRAV1", 2030, 1))
+        self.assertIsNone(provider.get_value("IRAV1", 2030, 1))
+
+        self.assertEqual(
+            inner.calls,
+            [("IRAV1", 2024, 11), ("IRAV1", 2030, 1), ("IRAV1", 2030, 1)],
+        )
+
+    def test_get_range_only_asks_for_uncached_window(self):
+        inner = Mock(spec=IndexProvider)
+        inner.get_range.return_value = {(2025, 1): Decimal("2.0")}
+        cache = MemoryIndexCache()
+        cache.set("IRAV1", 2024, 11, Decimal("2.2"))
+        cache.set("IRAV1", 2024, 12, Decimal("2.1"))
+        provider = CachingIndexProvider(inner, cache)
+
+        values = provider.get_range("IRAV1", date(2024, 11, 1), date(2025, 1, 1))
+
+        self.assertEqual(len(values), 3)
+        inner.get_range.assert_called_once_with(
+            "IRAV1", date(2025, 1, 1), date(2025, 1, 1)
+        )
+        self.assertEqual(cache.get("IRAV1", 2025, 1), Decimal("2.0"))
+
+    def test_missing_periods(self):
+        inner = Mock(spec=IndexProvider)
+        inner.missing_periods.side_effect = lambda series, periods: periods
+        cache = MemoryIndexCache()
+        cache.set("IRAV1", 2024, 11, Decimal("2.2"))
+        provider = CachingIndexProvider(inner, cache)
+
+        self.assertEqual(
+            provider.missing_periods("IRAV1", [(2024, 11), (2024, 12)]),
+            [(2024, 12)],
+        )
+        self.assertEqual(provider.missing_periods("IRAV1", [(2024, 11)]), [])
+        inner.missing_periods.assert_called_once_with("IRAV1", [(2024, 12)])
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class _PendingExecutor:
+    """Guarda las tareas para ejecutarlas cuando lo pida el test."""
+
+    def __init__(self):
+        self.tasks = []
+
+    def submit(self, func, *args):
+        self.tasks.append((func, args))
+
+    def run(self):
+        tasks, self.tasks = self.tasks, []
+        for func, args in tasks:
+            func(*args)
+
+
+class TestStaleWhileRevalidateIndexProvider(unittest.TestCase):
+    def setUp(self):
+        today = date.today()
+        self.period = (today.year, today.month)
+        self.inner = _DictIndexProvider({("IRAV1", *self.period): Decimal("2.2")})
+        self.clock = _Clock()
+        self.executor = _PendingExecutor()
+        self.provider = StaleWhileRevalidateIndexProvider(
+            self.inner, max_age=10, max_stale=100, executor=self.executor, clock=self.clock
+        )
+
+    def test_stale_value_is_served_and_refreshed_in_background(self):
+        self.assertEqual(self.provider.get_value("IRAV1", *self.period), Decimal("2.2"))
+        self.inner.values[("IRAV1", *self.period)] = Decimal("2.3")
+        self.clock.now = 5
+        self.assertEqual(self.provider.get_value("IRAV1", *self.period), Decimal("2.2"))
+        self.assertEqual(self.executor.tasks, [])
+
+        self.clock.now = 50
+        self.assertEqual(self.provider.get_value("IRAV1", *self.period), Decimal("2.2"))
+        self.assertEqual(self.provider.get_value("IRAV1", *self.period), Decimal("2.2"))
+        self.assertEqual(len(self.executor.tasks), 1)
+        self.assertEqual(len(self.inner.calls), 1)
+
+        self.executor.run()
+        self.assertEqual(self.provider.get_value("IRAV1", *self.period), Decimal("2.3"))
+        self.assertEqual(len(self.inner.calls), 2)
+
+    def test_too_stale_value_is_fetched_synchronously(self):
+        self.provider.get_value("IRAV1", *self.period)
+        self.inner.values[("IRAV1", *self.period)] = Decimal("2.3")
+        self.clock.now = 101
+
+        self.assertEqual(self.provider.get_value("IRAV1", *self.period), Decimal("2.3"))
+        self.assertEqual(self.executor.tasks, [])
+
+    def test_unpublished_month_is_detected_in_background(self):
+        del self.inner.values[("IRAV1", *self.period)]
+        self.assertIsNone(self.provider.get_value("IRAV1", *self.period))
+        self.inner.values[("IRAV1", *self.period)] = Decimal("2.4")
+        self.clock.now = 20
+
+        self.assertIsNone(self.provider.get_value("IRAV1", *self.period))
+        self.executor.run()
+
+        self.assertEqual(self.provider.get_value("IRAV1", *self.period), Decimal("2.4"))
+
+    def test_old_months_never_expire(self):
+        self.inner.values[("IRAV1", 2024, 11)] = Decimal("2.2")
+        self.provider.get_value("IRAV1", 2024, 11)
+        self.clock.now = 10_000
+
+        self.assertEqual(self.provider.get_value("IRAV1", 2024, 11), Decimal("2.2"))
+        self.assertEqual(self.executor.tasks, [])
+        self.assertEqual(self.provider.missing_periods("IRAV1", [(2024, 11)]), [])
+
+    def test_failed_refresh_keeps_stale_value(self):
+        self.provider.get_value("IRAV1", *self.period)
+        self.clock.now = 50
+        self.provider.get_value("IRAV1", *self.period)
+
+        with patch.object(self.inner, "get_range", side_effect=ConnectionError("down")):
+            with self.assertLogs(level="WARNING"):
+                self.executor.run()
+
+        self.assertEqual(self.provider.get_value("IRAV1", *self.period), Decimal("2.2"))
+        self.assertEqual(len(self.executor.tasks), 1)
+
+    def test_default_executor_refreshes(self):
+        provider = StaleWhileRevalidateIndexProvider(
+            self.inner, max_age=0, max_stale=100, clock=self.clock
+        )
+        provider.get_value("IRAV1", *self.period)
+        self.inner.values[("IRAV1", *self.period)] = Decimal("2.3")
+        self.clock.now = 1
+
+        provider.get_value("IRAV1", *self.period)
+        provider._executor.shutdown(wait=True)
+
+        self.assertEqual(provider.get_value("IRAV1", *self.period), Decimal("2.3"))
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(ValueError):
+            StaleWhileRevalidateIndexProvider(self.inner, max_age=10, max_stale=5)
+        with self.assertRaises(ValueError):
+            StaleWhileRevalidateIndexProvider(self.inner, recent_months=-1)
+
+
+class TestChainedIndexProvider(unittest.TestCase):
+    def test_requires_providers(self):
+        with self.assertRaises(ValueError) as context:
+            ChainedIndexProvider([])
+        self.assertEqual(
+            str(context.exception), "At least one index provider is required."
+        )
+
+    def test_first_value_wins(self):
+        first = _DictIndexProvider({("IRAV1", 2024, 11): Decimal("2.2")})
+        second = _DictIndexProvider(
+            {("IRAV1", 2024, 11): Decimal("9.9"), ("IRAV1", 2024, 12): Decimal("2.1")}
+        )
+        provider = ChainedIndexProvider([first, second])
+
+        self.assertEqual(provider.get_value("IRAV1", 2024, 11), Decimal("2.2"))
+        self.assertEqual(provider.get_value("IRAV1", 2024, 12), Decimal("2.1"))
+        self.assertIsNone(provider.get_value("IRAV1", 2025, 1))
+        self.assertEqual(
+            asyncio.run(provider.aget_value("IRAV1", 2024, 12)), Decimal("2.1")
+        )
+        self.assertNotIn(("IRAV1", 2024, 11), second.calls)
+
+    def test_get_range_narrows_window(self):
+        first = _DictIndexProvider({("IRAV1", 2024, 11): Decimal("2.2")})
+        second = Mock(spec=IndexProvider)
+        second.get_range.return_value = {(2024, 12): Decimal("2.1")}
+        provider = ChainedIndexProvider([first, second])
+
+        values = provider.get_range("IRAV1", date(2024, 11, 1), date(2024, 12, 1))
+
+        self.assertEqual(
+            values, {(2024, 11): Decimal("2.2"), (2024, 12): Decimal("2.1")}
+        )
+        second.get_range.assert_called_once_with(
+            "IRAV1", date(2024, 12, 1), date(2024, 12, 1)
+        )
+
+    def test_missing_periods(self):
+        first = BundledIndexProvider(include_snapshot=False)
+        second = Mock(spec=IndexProvider)
+        second.missing_periods.side_effect = lambda series, periods: periods
+        provider = ChainedIndexProvider([first, second])
+
+        self.assertEqual(
+            provider.missing_periods(SERIES_IPC_BASE_1992, [(2030, 1), (2001, 8)]),
+            [(2030, 1)],
+        )
+        second.missing_periods.assert_called_once_with(
+            SERIES_IPC_BASE_1992, [(2030, 1)]
+        )
+
+
+class TestDefaultIndexProvider(unittest.TestCase):
+    def test_default_index_provider(self):
+        client = Mock()
+        provider = default_index_provider(client)
+        self.assertIsInstance(provider, ChainedIndexProvider)
+        self.assertIsInstance(provider.providers[0], BundledIndexProvider)
+        self.assertIs(provider.providers[1].client, client)
+
+        provider = default_index_provider(client, use_snapshot=False)
+        self.assertIsInstance(provider, IneIndexProvider)
+
+    def test_strategies_use_injected_provider(self):
+        provider = _DictIndexProvider(
+            {
+                ("IPC290751", 2002, 8): Decimal("60.030"),
+                ("IPC290751", 2003, 8): Decimal("61.827"),
+                ("IRAV1", 2024, 11): Decimal("2.2"),
+            }
+        )
+
+        ipc = IpcUpdate(provider=provider).calculate(
+            RentUpdateInput(
+                amount=Decimal("400.00"), year_start=2002, year_end=2003, month=8
+            )
+        )
+        irav = IravUpdate(provider=provider).calculate(
+            RentUpdateInput(amount=Decimal("1000.00"), month=11, year_start=2024)
+        )
+
+        self.assertEqual(ipc.updated_amount, Decimal("412.00"))
+        self.assertEqual(irav.updated_amount, Decimal("1022.00"))
+
+
+class TestStaticIndexProvider(unittest.TestCase):
+    def test_static_values(self):
+        values = {"IRAV1": {(2024, 11): Decimal("2.2")}}
+        provider = StaticIndexProvider(values)
+        values["IRAV1"][(2024, 12)] = Decimal("2.1")
+
+        self.assertEqual(provider.get_value("IRAV1", 2024, 11), Decimal("2.2"))
+        self.assertIsNone(provider.get_value("IRAV1", 2024, 12))
+        self.assertIsNone(provider.get_value("IPC290751", 2024, 11))
+        self.assertEqual(provider.missing_periods("IRAV1", [(2024, 12)]), [])
+        self.assertEqual(
+            pickle.loads(pickle.dumps(provider)).values, provider.values
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
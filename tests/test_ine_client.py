@@ -1,14 +1,39 @@
 import json
+import tempfile
+import threading
+import time
 import unittest
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date
+from decimal import Decimal
+from functools import partial
 from unittest.mock import Mock, patch
 
 import requests
 
+from arrendatools.rent_update.deadline import DeadlineExceeded, deadline
+from arrendatools.rent_update.index_cache import DiskIndexCache, MemoryIndexCache
 from arrendatools.rent_update.ine_client import IneClient
+from arrendatools.rent_update.ine_payload import SeriesValues
+from arrendatools.rent_update.instrumentation import EventCollector
+from arrendatools.rent_update.resilience import (
+    CircuitBreaker,
+    CircuitOpenError,
+    RateLimiter,
+)
 
 
 class TestIneClient(unittest.TestCase):
+    # IneClient.fetch_series_data sobre la clase usa el cliente compartido;
+    # aqui se le da requests como sesion para que los patch de requests.get
+    # intercepten sus peticiones.
+    def setUp(self):
+        self._default = IneClient._default
+        IneClient.set_default(IneClient(session=requests))
+
+    def tearDown(self):
+        IneClient.set_default(self._default)
+
     def test_fetch_series_data_invalid_dates(self):
         with self.assertRaises(ValueError) as context:
             IneClient.fetch_series_data(
@@ -102,5 +127,535 @@ class TestIneClient(unittest.TestCase):
             )
 
 
+class TestIneClientSession(unittest.TestCase):
+    def setUp(self):
+        self.session = Mock()
+        self.session.headers = {}
+        self.client = IneClient(session=self.session)
+
+    def test_fetch_series_data_uses_own_session(self):
+        response = Mock()
+        response.raise_for_status.return_value = None
+        response.json.return_value = {"Data": [{"Valor": "100.0"}]}
+        self.session.get.return_value = response
+
+        result = self.client.fetch_series_data(
+            date(2024, 1, 1), date(2024, 1, 1), "IPC290751"
+        )
+
+        self.session.get.assert_called_once_with(
+            "https://servicios.ine.es/wstempus/js/ES/DATOS_SERIE/IPC290751"
+            "?date=20240101:20240101",
+            timeout=30,
+        )
+        self.assertEqual(result, {"Data": [{"Valor": "100.0"}]})
+
+    def test_fetch_series_data_on_class_uses_default(self):
+        response = Mock()
+        response.raise_for_status.return_value = None
+        response.json.return_value = {"Data": []}
+        self.session.get.return_value = response
+        default = IneClient._default
+        try:
+            IneClient.set_default(self.client)
+            result = IneClient.fetch_series_data(
+                date(2024, 1, 1), date(2024, 1, 1), "IPC290751"
+            )
+        finally:
+            IneClient.set_default(default)
+        self.assertEqual(result, {"Data": []})
+        self.session.get.assert_called_once()
+
+    def test_session_pool_and_retries(self):
+        client = IneClient(pool_size=4, max_retries=3, backoff_factor=0.1)
+        adapter = client.session.get_adapter("https://servicios.ine.es")
+
+        self.assertEqual(adapter._pool_maxsize, 4)
+        # Los reintentos los hace el cliente; urllib3 no debe multiplicarlos.
+        self.assertEqual(adapter.max_retries.total, 0)
+        self.assertEqual(client.max_retries, 3)
+        self.assertEqual(client.backoff_factor, 0.1)
+        self.assertEqual(client.session.headers["Connection"], "keep-alive")
+        client.close()
+
+    def test_keep_alive_disabled(self):
+        client = IneClient(keep_alive=False)
+        self.assertEqual(client.session.headers["Connection"], "close")
+        client.close()
+
+    def test_custom_base_url_and_timeout(self):
+        response = Mock()
+        response.json.return_value = {"Data": []}
+        self.session.get.return_value = response
+        client = IneClient(
+            base_url="http://127.0.0.1:8080/DATOS_SERIE/",
+            timeout=5,
+            session=self.session,
+        )
+
+        client.fetch_series_data(date(2024, 1, 1), date(2024, 2, 1), "IRAV1")
+
+        self.session.get.assert_called_once_with(
+            "http://127.0.0.1:8080/DATOS_SERIE/IRAV1?date=20240101:20240201",
+            timeout=5,
+        )
+
+    def test_fetch_series_values(self):
+        response = Mock()
+        response.content = (
+            b'{"Data": [{"Fecha": 1, "FK_TipoDato": 1, "FK_Periodo": 1, "Anyo": 2024,'
+            b' "Valor": 100.10, "Secreto": false}]}'
+        )
+        self.session.get.return_value = response
+
+        values = self.client.fetch_series_values(
+            date(2024, 1, 1), date(2024, 2, 1), "IPC290751"
+        )
+
+        self.assertEqual(dict(values), {(2024, 1): Decimal("100.10")})
+        response.json.assert_not_called()
+
+    def test_fetch_series_values_unexpected_payload(self):
+        response = Mock()
+        response.content = b'{"Data": [{"Valor": 1}]}'
+        response.text = response.content.decode()
+        self.session.get.return_value = response
+
+        with self.assertRaises(json.JSONDecodeError):
+            self.client.fetch_series_values(date(2024, 1, 1), date(2024, 1, 1), "IRAV1")
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(ValueError) as context:
+            IneClient(json_backend="simdjson")
+        self.assertEqual(
+            str(context.exception), "Unknown JSON backend: simdjson. Available: json, msgspec"
+        )
+        with self.assertRaises(ValueError) as context:
+            IneClient(pool_size=0)
+        self.assertEqual(str(context.exception), "Pool size must be at least 1.")
+        with self.assertRaises(ValueError) as context:
+            IneClient(max_retries=-1)
+        self.assertEqual(str(context.exception), "Max retries cannot be negative.")
+
+    def test_context_manager_closes_session(self):
+        with IneClient(session=self.session) as client:
+            self.assertIs(client.session, self.session)
+        self.session.close.assert_called_once_with()
+
+    def test_default_is_shared(self):
+        default = IneClient._default
+        try:
+            IneClient.set_default(None)
+            self.assertIs(IneClient.default(), IneClient.default())
+            IneClient.set_default(self.client)
+            self.assertIs(IneClient.default(), self.client)
+        finally:
+            IneClient.set_default(default)
+
+
+class TestIneClientSeriesValue(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self._memory_cache = IneClient._memory_cache
+        self._disk_cache = IneClient._disk_cache
+        IneClient.set_memory_cache(None)
+        self.client = IneClient(session=Mock())
+
+    def tearDown(self):
+        IneClient.set_memory_cache(self._memory_cache)
+        IneClient.set_disk_cache(self._disk_cache)
+        self._tmp.cleanup()
+
+    @patch("arrendatools.rent_update.ine_client.IneClient.fetch_series_values")
+    def test_fetch_series_value_without_cache(self, mock_fetch):
+        IneClient.set_disk_cache(None)
+        mock_fetch.return_value = SeriesValues("IPC290751", {(2003, 8): Decimal("61.827")})
+
+        self.assertEqual(
+            self.client.fetch_series_value("IPC290751", 2003, 8), Decimal("61.827")
+        )
+        self.assertEqual(
+            self.client.fetch_series_value("IPC290751", 2003, 8), Decimal("61.827")
+        )
+        self.assertEqual(mock_fetch.call_count, 2)
+        mock_fetch.assert_called_with(date(2003, 8, 1), date(2003, 8, 1), "IPC290751")
+
+    @patch("arrendatools.rent_update.ine_client.IneClient.fetch_series_values")
+    def test_fetch_series_value_no_data(self, mock_fetch):
+        IneClient.set_disk_cache(DiskIndexCache(self._tmp.name))
+        mock_fetch.return_value = SeriesValues("IPC290751")
+
+        self.assertIsNone(self.client.fetch_series_value("IPC290751", 2003, 8))
+        self.assertIsNone(self.client.fetch_series_value("IPC290751", 2003, 8))
+        self.assertEqual(mock_fetch.call_count, 2)
+
+    @patch("arrendatools.rent_update.ine_client.IneClient.fetch_series_values")
+    def test_fetch_series_value_uses_disk_cache(self, mock_fetch):
+        IneClient.set_disk_cache(DiskIndexCache(self._tmp.name))
+        mock_fetch.return_value = SeriesValues("IPC290751", {(2003, 8): Decimal("61.827")})
+
+        self.client.fetch_series_value("IPC290751", 2003, 8)
+        IneClient.set_disk_cache(DiskIndexCache(self._tmp.name))
+        value = self.client.fetch_series_value("IPC290751", 2003, 8)
+
+        self.assertEqual(value, Decimal("61.827"))
+        mock_fetch.assert_called_once()
+
+    @patch("arrendatools.rent_update.ine_client.IneClient.fetch_series_values")
+    def test_fetch_series_value_uses_memory_cache(self, mock_fetch):
+        memory_cache = MemoryIndexCache()
+        IneClient.set_memory_cache(memory_cache)
+        mock_fetch.return_value = SeriesValues("IPC290751", {(2003, 8): Decimal("61.827")})
+
+        self.client.fetch_series_value("IPC290751", 2003, 8)
+        value = self.client.fetch_series_value("IPC290751", 2003, 8)
+
+        self.assertEqual(value, Decimal("61.827"))
+        mock_fetch.assert_called_once()
+        self.assertEqual((memory_cache.hits, memory_cache.misses), (1, 1))
+
+    @patch("arrendatools.rent_update.ine_client.IneClient.fetch_series_values")
+    def test_fetch_series_value_memory_cache_filled_from_disk(self, mock_fetch):
+        disk_cache = DiskIndexCache(self._tmp.name)
+        disk_cache.set("IPC290751", 2003, 8, Decimal("61.827"))
+        memory_cache = MemoryIndexCache()
+        IneClient.set_disk_cache(disk_cache)
+        IneClient.set_memory_cache(memory_cache)
+
+        value = self.client.fetch_series_value("IPC290751", 2003, 8)
+
+        self.assertEqual(value, Decimal("61.827"))
+        self.assertEqual(memory_cache.get("IPC290751", 2003, 8), Decimal("61.827"))
+        mock_fetch.assert_not_called()
+
+    @patch("arrendatools.rent_update.ine_client.IneClient.fetch_series_values")
+    def test_recent_month_expires_from_memory_cache(self, mock_fetch):
+        today = date.today()
+        now = [0.0]
+        IneClient.set_disk_cache(DiskIndexCache(self._tmp.name, recent_ttl=0.01))
+        IneClient.set_memory_cache(MemoryIndexCache(recent_ttl=0.01, clock=lambda: now[0]))
+        mock_fetch.return_value = SeriesValues(
+            "IRAV1", {(today.year, today.month): Decimal("2.2")}
+        )
+
+        self.client.fetch_series_value("IRAV1", today.year, today.month)
+        self.client.fetch_series_value("IRAV1", today.year, today.month)
+        self.assertEqual(mock_fetch.call_count, 1)
+
+        now[0] = 0.05
+        time.sleep(0.02)
+        self.client.fetch_series_value("IRAV1", today.year, today.month)
+        self.assertEqual(mock_fetch.call_count, 2)
+
+    def test_missing_periods(self):
+        disk_cache = DiskIndexCache(self._tmp.name)
+        disk_cache.set("IPC290751", 2002, 8, Decimal("60.030"))
+        memory_cache = MemoryIndexCache()
+        memory_cache.set("IPC290751", 2003, 8, Decimal("61.827"))
+        IneClient.set_disk_cache(disk_cache)
+        IneClient.set_memory_cache(memory_cache)
+
+        missing = self.client.missing_periods(
+            "IPC290751", [(2004, 8), (2003, 8), (2002, 8), (2001, 8), (2004, 8)]
+        )
+
+        self.assertEqual(missing, [(2001, 8), (2004, 8)])
+        self.assertIn(("IPC290751", 2002, 8), memory_cache)
+
+    @patch("arrendatools.rent_update.ine_client.IneClient.fetch_series_values")
+    def test_prefetch_series_fills_caches(self, mock_fetch):
+        disk_cache = DiskIndexCache(self._tmp.name)
+        memory_cache = MemoryIndexCache()
+        IneClient.set_disk_cache(disk_cache)
+        IneClient.set_memory_cache(memory_cache)
+        mock_fetch.return_value = SeriesValues(
+            "IPC290751",
+            {(2002, 8): Decimal("60.030"), (2003, 8): Decimal("61.827")},
+        )
+
+        values = self.client.prefetch_series(
+            "IPC290751", date(2002, 8, 1), date(2003, 8, 1)
+        )
+
+        mock_fetch.assert_called_once_with(
+            date(2002, 8, 1), date(2003, 8, 1), "IPC290751"
+        )
+        self.assertEqual(
+            values,
+            {(2002, 8): Decimal("60.030"), (2003, 8): Decimal("61.827")},
+        )
+        self.assertEqual(memory_cache.get("IPC290751", 2003, 8), Decimal("61.827"))
+        self.assertEqual(disk_cache.get("IPC290751", 2002, 8), Decimal("60.030"))
+        self.assertIsNone(disk_cache.get("IPC290751", 2002, 9))
+
+    @patch("arrendatools.rent_update.ine_client.IneClient.fetch_series_values")
+    def test_prefetch_series_writes_disk_cache_once(self, mock_fetch):
+        disk_cache = Mock()
+        IneClient.set_disk_cache(disk_cache)
+        mock_fetch.return_value = SeriesValues(
+            "IPC290751",
+            {(2002, 8): Decimal("60.030"), (2003, 8): Decimal("61.827")},
+        )
+
+        self.client.prefetch_series("IPC290751", date(2002, 8, 1), date(2003, 8, 1))
+
+        disk_cache.set_many.assert_called_once_with(
+            "IPC290751", {(2002, 8): Decimal("60.030"), (2003, 8): Decimal("61.827")}
+        )
+        disk_cache.set.assert_not_called()
+
+
+class TestIneClientResilience(unittest.TestCase):
+    def setUp(self):
+        self.session = Mock()
+        self.session.headers = {}
+        self.client = IneClient(session=self.session)
+
+    def _response(self, status=200, payload=None, headers=None):
+        response = Mock()
+        response.status_code = status
+        response.headers = headers or {}
+        response.json.return_value = payload if payload is not None else {"Data": []}
+        if status >= 400:
+            response.raise_for_status.side_effect = requests.exceptions.HTTPError(
+                f"{status} error", response=response
+            )
+        return response
+
+    @patch("arrendatools.rent_update.ine_client.time.sleep")
+    def test_retries_transient_errors_with_jittered_backoff(self, sleep):
+        client = IneClient(
+            session=self.session, max_retries=3, backoff_factor=1, backoff_max=3
+        )
+        self.session.get.side_effect = [
+            requests.exceptions.Timeout(),
+            requests.exceptions.ConnectionError(),
+            self._response(503),
+            self._response(payload={"Data": [{"Valor": "1"}]}),
+        ]
+
+        with patch("arrendatools.rent_update.ine_client.random.uniform", side_effect=lambda a, b: b):
+            data = client.fetch_series_data(date(2024, 1, 1), date(2024, 1, 1), "IRAV1")
+
+        self.assertEqual(data, {"Data": [{"Valor": "1"}]})
+        self.assertEqual([c.args[0] for c in sleep.call_args_list], [1, 2, 3])
+
+    @patch("arrendatools.rent_update.ine_client.time.sleep")
+    def test_retry_after_is_respected(self, sleep):
+        client = IneClient(session=self.session, max_retries=2, backoff_max=10)
+        self.session.get.side_effect = [
+            self._response(429, headers={"Retry-After": "4"}),
+            self._response(503, headers={"Retry-After": "60"}),
+        ]
+
+        with self.assertRaises(ConnectionError):
+            client.fetch_series_data(date(2024, 1, 1), date(2024, 1, 1), "IRAV1")
+
+        # La segunda pide esperar mas que backoff_max: no se reintenta.
+        sleep.assert_called_once_with(4.0)
+        self.assertEqual(self.session.get.call_count, 2)
+
+    @patch("arrendatools.rent_update.ine_client.time.sleep")
+    def test_client_errors_are_not_retried(self, sleep):
+        client = IneClient(session=self.session, max_retries=2)
+        self.session.get.return_value = self._response(404)
+
+        with self.assertRaises(ConnectionError):
+            client.fetch_series_data(date(2024, 1, 1), date(2024, 1, 1), "IRAV1")
+
+        sleep.assert_not_called()
+        self.session.get.assert_called_once()
+
+    def test_circuit_breaker_fails_fast(self):
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout=60)
+        client = IneClient(session=self.session, circuit_breaker=breaker)
+        self.session.get.side_effect = requests.exceptions.Timeout()
+
+        for _ in range(2):
+            with self.assertRaises(ConnectionError):
+                client.fetch_series_data(date(2024, 1, 1), date(2024, 1, 1), "IRAV1")
+        with self.assertRaises(CircuitOpenError):
+            client.fetch_series_data(date(2024, 1, 1), date(2024, 1, 1), "IRAV1")
+
+        self.assertEqual(self.session.get.call_count, 2)
+
+    def test_prefetch_falls_back_to_cache(self):
+        memory_cache = MemoryIndexCache()
+        memory_cache.set("IRAV1", 2024, 11, Decimal("2.2"))
+        self.session.get.side_effect = requests.exceptions.Timeout()
+
+        with patch.object(IneClient, "_memory_cache", memory_cache), \
+                patch.object(IneClient, "_disk_cache", None):
+            with self.assertLogs(level="WARNING"):
+                values = self.client.prefetch_series("IRAV1", date(2024, 11, 1), date(2025, 1, 1))
+            client = IneClient(session=self.session, fallback_to_cache=False)
+            with self.assertRaises(ConnectionError):
+                client.prefetch_series("IRAV1", date(2024, 11, 1), date(2025, 1, 1))
+            with self.assertRaises(ConnectionError):
+                self.client.prefetch_series("IPC290751", date(2024, 11, 1), date(2025, 1, 1))
+
+        self.assertEqual(values, {(2024, 11): Decimal("2.2")})
+
+    def test_concurrent_identical_requests_are_coalesced(self):
+        started = threading.Event()
+        release = threading.Event()
+
+        def slow_get(url, timeout):
+            started.set()
+            release.wait(5)
+            return self._response(payload={"Data": [{"Valor": "1"}]})
+
+        self.session.get.side_effect = slow_get
+        fetch = partial(
+            self.client.fetch_series_data, date(2024, 1, 1), date(2024, 1, 1), "IRAV1"
+        )
+        with EventCollector() as collector, ThreadPoolExecutor(max_workers=3) as executor:
+            leader = executor.submit(fetch)
+            started.wait(5)
+            followers = [executor.submit(fetch) for _ in range(2)]
+            while len(self.client._single_flight._calls) != 1 or len(
+                next(iter(self.client._single_flight._calls.values())).done._cond._waiters
+            ) < 2:
+                release.wait(0.001)
+            release.set()
+            results = [leader.result()] + [future.result() for future in followers]
+
+        self.session.get.assert_called_once()
+        self.assertTrue(all(result is results[0] for result in results))
+        self.assertEqual(
+            sorted(event.cache for event in collector.ine_requests()),
+            ["coalesced", "coalesced", "miss"],
+        )
+
+    def test_coalescing_disabled(self):
+        client = IneClient(session=self.session, coalesce=False)
+        self.session.get.return_value = self._response()
+
+        client.fetch_series_data(date(2024, 1, 1), date(2024, 1, 1), "IRAV1")
+
+        self.assertIsNone(client._single_flight)
+
+    def test_rate_limiter_is_applied_to_every_attempt(self):
+        sleeps = []
+        limiter = RateLimiter(rate=10, burst=1, clock=lambda: 0.0, sleep=sleeps.append)
+        client = IneClient(session=self.session, rate_limiter=limiter, max_retries=1, jitter=False)
+        self.session.get.side_effect = [
+            requests.exceptions.Timeout(),
+            self._response(),
+            self._response(),
+        ]
+
+        with patch("arrendatools.rent_update.ine_client.time.sleep"):
+            client.fetch_series_data(date(2024, 1, 1), date(2024, 1, 1), "IRAV1")
+            client.fetch_series_data(date(2024, 2, 1), date(2024, 2, 1), "IRAV1")
+
+        self.assertEqual(sleeps, [0.1, 0.2])
+
+    def test_connect_and_read_timeouts(self):
+        self.session.get.return_value = self._response()
+        client = IneClient(session=self.session, timeout=20, connect_timeout=3)
+
+        client.fetch_series_data(date(2024, 1, 1), date(2024, 1, 1), "IRAV1")
+
+        self.assertEqual(self.session.get.call_args.kwargs["timeout"], (3, 20))
+        with self.assertRaises(ValueError):
+            IneClient(connect_timeout=0)
+
+    def test_deadline_limits_request_timeout(self):
+        self.session.get.return_value = self._response()
+        client = IneClient(session=self.session, timeout=20, connect_timeout=3)
+
+        with deadline(2):
+            client.fetch_series_data(date(2024, 1, 1), date(2024, 1, 1), "IRAV1")
+
+        connect_timeout, read_timeout = self.session.get.call_args.kwargs["timeout"]
+        self.assertLessEqual(connect_timeout, 2)
+        self.assertGreater(connect_timeout, 1)
+        self.assertEqual(connect_timeout, read_timeout)
+
+    def test_expired_deadline_fails_before_request(self):
+        with deadline(0):
+            with self.assertRaises(DeadlineExceeded):
+                self.client.fetch_series_data(date(2024, 1, 1), date(2024, 1, 1), "IRAV1")
+        self.session.get.assert_not_called()
+
+    def test_timeout_at_deadline_raises_deadline_exceeded(self):
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0)
+        breaker.record_failure()
+        client = IneClient(session=self.session, max_retries=3, circuit_breaker=breaker)
+
+        def slow_get(url, timeout):
+            time.sleep(timeout)
+            raise requests.exceptions.ReadTimeout()
+
+        self.session.get.side_effect = slow_get
+        with deadline(0.02):
+            with self.assertRaises(DeadlineExceeded) as context:
+                client.fetch_series_data(date(2024, 1, 1), date(2024, 1, 1), "IRAV1")
+
+        self.assertIsInstance(context.exception.__cause__, requests.exceptions.ReadTimeout)
+        self.assertEqual(self.session.get.call_count, 1)
+        # El intento de prueba se libera sin contar como fallo del INE.
+        breaker.before_request()
+
+    @patch("arrendatools.rent_update.ine_client.time.sleep")
+    def test_retry_that_does_not_fit_in_deadline_is_skipped(self, sleep):
+        self.session.get.return_value = self._response(503, headers={"Retry-After": "5"})
+        client = IneClient(session=self.session, max_retries=3)
+
+        with deadline(1):
+            with self.assertRaises(ConnectionError):
+                client.fetch_series_data(date(2024, 1, 1), date(2024, 1, 1), "IRAV1")
+
+        sleep.assert_not_called()
+        self.assertEqual(self.session.get.call_count, 1)
+
+    def test_rate_limit_wait_respects_deadline(self):
+        self.session.get.return_value = self._response()
+        sleeps = []
+        client = IneClient(
+            session=self.session,
+            rate_limiter=RateLimiter(rate=1, sleep=sleeps.append),
+        )
+        client.fetch_series_data(date(2024, 1, 1), date(2024, 1, 1), "IRAV1")
+
+        with deadline(0.5):
+            with self.assertRaises(DeadlineExceeded):
+                client.fetch_series_data(date(2024, 2, 1), date(2024, 2, 1), "IRAV1")
+
+        self.assertEqual(sleeps, [])
+        self.assertEqual(self.session.get.call_count, 1)
+
+    def test_follower_retries_when_leader_deadline_expires(self):
+        started = threading.Event()
+
+        def get(url, timeout):
+            if self.session.get.call_count == 1:
+                started.set()
+                time.sleep(timeout)
+                raise requests.exceptions.ReadTimeout()
+            return self._response(payload={"Data": [{"Valor": "1"}]})
+
+        self.session.get.side_effect = get
+        fetch = partial(
+            self.client.fetch_series_data, date(2024, 1, 1), date(2024, 1, 1), "IRAV1"
+        )
+
+        def fetch_with_deadline():
+            with deadline(0.2):
+                return fetch()
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            leader = executor.submit(fetch_with_deadline)
+            started.wait(5)
+            follower = executor.submit(fetch)
+            with self.assertRaises(DeadlineExceeded):
+                leader.result()
+            result = follower.result()
+
+        self.assertEqual(result, {"Data": [{"Valor": "1"}]})
+        self.assertEqual(self.session.get.call_count, 2)
+
+
 if __name__ == "__main__":
     unittest.main()
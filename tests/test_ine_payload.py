@@ -0,0 +1,104 @@
+import json
+import unittest
+from decimal import Decimal
+from importlib.util import find_spec
+
+from arrendatools.rent_update.ine_payload import (
+    JSON_BACKEND_MSGSPEC,
+    JSON_BACKEND_STDLIB,
+    SeriesValues,
+    decode_series_values,
+    default_json_backend,
+)
+
+_PAYLOAD = (
+    b'{"COD": "IPC290751", "Data": ['
+    b'{"Fecha": 1007161200000, "FK_TipoDato": 1, "FK_Periodo": 12, "Anyo": 2001,'
+    b' "Valor": 59.123, "Secreto": false},'
+    b'{"Fecha": 1009839600000, "FK_TipoDato": 1, "FK_Periodo": 1, "Anyo": 2002,'
+    b' "Valor": 60.030, "Secreto": false},'
+    b'{"Fecha": 1012518000000, "FK_TipoDato": 1, "FK_Periodo": 2, "Anyo": 2002,'
+    b' "Valor": null, "Secreto": false},'
+    b'{"Fecha": 1015023600000, "FK_TipoDato": 1, "FK_Periodo": 3, "Anyo": 2002,'
+    b' "Valor": 101, "Secreto": false}'
+    b"]}"
+)
+
+
+class TestSeriesValues(unittest.TestCase):
+    def test_mapping_by_period(self):
+        values = SeriesValues(
+            "IRAV1",
+            {(2024, 12): Decimal("2.2"), (2025, 2): Decimal("2.3"), (2024, 11): None},
+        )
+
+        self.assertEqual(len(values), 2)
+        self.assertEqual(list(values), [(2024, 12), (2025, 2)])
+        self.assertEqual(values[(2025, 2)], Decimal("2.3"))
+        self.assertIsNone(values.get((2025, 1)))
+        self.assertNotIn((2024, 11), values)
+        self.assertNotIn((2030, 1), values)
+        self.assertEqual(values, {(2024, 12): Decimal("2.2"), (2025, 2): Decimal("2.3")})
+        self.assertEqual(
+            repr(values),
+            "SeriesValues('IRAV1', {(2024, 12): Decimal('2.2'), (2025, 2): Decimal('2.3')})",
+        )
+
+    def test_empty(self):
+        values = SeriesValues("IRAV1")
+        self.assertEqual(len(values), 0)
+        self.assertEqual(dict(values), {})
+        with self.assertRaises(KeyError):
+            values[(2024, 1)]
+
+
+class TestDecodeSeriesValues(unittest.TestCase):
+    def test_decodes_values_without_float_round_trip(self):
+        values = decode_series_values(_PAYLOAD, "IPC290751")
+
+        self.assertEqual(
+            dict(values),
+            {
+                (2001, 12): Decimal("59.123"),
+                (2002, 1): Decimal("60.030"),
+                (2002, 3): Decimal("101"),
+            },
+        )
+        self.assertEqual(str(values[(2002, 1)]), "60.030")
+        self.assertEqual(values.series, "IPC290751")
+
+    def test_string_values_and_empty_payload(self):
+        values = decode_series_values(
+            '{"Data": [{"Anyo": 2024, "FK_Periodo": 11, "Valor": "2.2"}]}', "IRAV1"
+        )
+        self.assertEqual(dict(values), {(2024, 11): Decimal("2.2")})
+        self.assertEqual(len(decode_series_values(b"{}", "IRAV1")), 0)
+
+    def test_invalid_payloads(self):
+        invalid = (
+            b"not json",
+            b"[]",
+            b'{"Data": [{"Valor": 1.5}]}',
+            b'{"Data": [{"Anyo": 2024, "FK_Periodo": 1, "Valor": "x"}]}',
+        )
+        for content in invalid:
+            with self.subTest(content=content):
+                with self.assertRaises(json.JSONDecodeError):
+                    decode_series_values(content, "IRAV1")
+
+    def test_default_backend(self):
+        expected = JSON_BACKEND_MSGSPEC if find_spec("msgspec") else JSON_BACKEND_STDLIB
+        self.assertEqual(default_json_backend(), expected)
+
+    @unittest.skipUnless(find_spec("msgspec"), "msgspec is not installed")
+    def test_msgspec_backend_matches_stdlib(self):
+        values = decode_series_values(_PAYLOAD, "IPC290751", JSON_BACKEND_MSGSPEC)
+
+        self.assertEqual(values, decode_series_values(_PAYLOAD, "IPC290751"))
+        self.assertEqual(str(values[(2002, 1)]), "60.030")
+        with self.assertRaises(json.JSONDecodeError):
+            decode_series_values(b"[]", "IRAV1", JSON_BACKEND_MSGSPEC)
+
+
+if __name__ == "__main__":
+    unittest.main()
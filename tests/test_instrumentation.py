@@ -0,0 +1,163 @@
+import asyncio
+import unittest
+from datetime import date
+from decimal import Decimal
+from unittest.mock import Mock
+
+import requests
+
+from arrendatools.rent_update import instrumentation
+from arrendatools.rent_update.base import RentUpdateInput
+from arrendatools.rent_update.factory import RentUpdateFactory
+from arrendatools.rent_update.index_cache import MemoryIndexCache
+from arrendatools.rent_update.index_provider import StaticIndexProvider
+from arrendatools.rent_update.ine_client import IneClient
+from arrendatools.rent_update.instrumentation import (
+    CACHE_MEMORY,
+    CACHE_MISS,
+    OUTCOME_ERROR,
+    OUTCOME_OK,
+    CalculationEvent,
+    EventCollector,
+)
+
+_PROVIDER = StaticIndexProvider(
+    {"IPC290751": {(2002, 8): Decimal("60.030"), (2003, 8): Decimal("61.827")}}
+)
+
+
+def _ipc_input(data=None):
+    return RentUpdateInput(
+        amount=Decimal("400.00"), data=data, month=8, year_start=2002, year_end=2003
+    )
+
+
+class TestCalculationEvents(unittest.TestCase):
+    def test_calculate_emits_one_event(self):
+        method = RentUpdateFactory.create("percentage")
+        with EventCollector() as collector:
+            method.calculate(RentUpdateInput(amount=Decimal("100"), data=Decimal("0.1")))
+
+        [event] = collector.events
+        self.assertEqual(event.strategy, "percentage")
+        self.assertEqual(event.operation, "calculate")
+        self.assertEqual(event.count, 1)
+        self.assertEqual(event.outcome, OUTCOME_OK)
+        self.assertIsNone(event.error)
+        self.assertGreaterEqual(event.duration, 0)
+
+    def test_nested_calculations_are_not_reported(self):
+        ipc = RentUpdateFactory.create("ipc", provider=_PROVIDER)
+        composite = RentUpdateFactory.create("min_ipc_or_percentage", provider=_PROVIDER)
+        with EventCollector() as collector:
+            ipc.calculate_many([_ipc_input()] * 3)
+            composite.calculate(_ipc_input(Decimal("0.01")))
+
+        self.assertEqual(
+            [(event.strategy, event.operation, event.count) for event in collector.events],
+            [("ipc", "calculate_many", 3), ("min_ipc_or_percentage", "calculate", 1)],
+        )
+
+    def test_base_calculate_many_counts_inputs(self):
+        method = RentUpdateFactory.create("fixed_amount")
+        inputs = (RentUpdateInput(amount=Decimal("100"), data=Decimal("5")) for _ in range(4))
+        with EventCollector() as collector:
+            method.calculate_many(inputs)
+
+        [event] = collector.events
+        self.assertEqual((event.strategy, event.count), ("fixed_amount", 4))
+
+    def test_errors_are_reported(self):
+        method = RentUpdateFactory.create("percentage")
+        with EventCollector() as collector:
+            with self.assertRaises(ValueError):
+                method.calculate(RentUpdateInput(amount=Decimal("100")))
+
+        [event] = collector.events
+        self.assertEqual((event.outcome, event.error), (OUTCOME_ERROR, "ValueError"))
+
+    def test_acalculate_emits_one_event(self):
+        method = RentUpdateFactory.create("percentage")
+        with EventCollector() as collector:
+            asyncio.run(
+                method.acalculate(RentUpdateInput(amount=Decimal("100"), data=Decimal("0.1")))
+            )
+
+        self.assertEqual(
+            [(event.strategy, event.operation) for event in collector.events],
+            [("percentage", "acalculate")],
+        )
+
+    def test_disabled_without_listeners(self):
+        collector = EventCollector()
+        RentUpdateFactory.create("percentage").calculate(
+            RentUpdateInput(amount=Decimal("100"), data=Decimal("0.1"))
+        )
+        self.assertFalse(instrumentation.enabled())
+        self.assertEqual(collector.events, [])
+
+    def test_failing_listener_does_not_break_calculation(self):
+        def failing(event):
+            raise RuntimeError("boom")
+
+        instrumentation.add_listener(failing)
+        try:
+            with self.assertLogs(level="ERROR"):
+                result = RentUpdateFactory.create("percentage").calculate(
+                    RentUpdateInput(amount=Decimal("100"), data=Decimal("0.1"))
+                )
+        finally:
+            instrumentation.remove_listener(failing)
+        self.assertEqual(result.updated_amount, Decimal("110.00"))
+        with self.assertRaises(ValueError):
+            instrumentation.remove_listener(failing)
+
+
+class TestIneRequestEvents(unittest.TestCase):
+    def setUp(self):
+        self._memory_cache = IneClient._memory_cache
+        self._disk_cache = IneClient._disk_cache
+        IneClient.set_memory_cache(MemoryIndexCache())
+        IneClient.set_disk_cache(None)
+        self.session = Mock()
+        self.session.headers = {}
+        self.client = IneClient(session=self.session)
+
+    def tearDown(self):
+        IneClient.set_memory_cache(self._memory_cache)
+        IneClient.set_disk_cache(self._disk_cache)
+
+    def test_request_and_cache_hit(self):
+        response = Mock()
+        response.content = b'{"Data": [{"Anyo": 2024, "FK_Periodo": 1, "Valor": 100.0}]}'
+        self.session.get.return_value = response
+
+        with EventCollector() as collector:
+            self.client.fetch_series_value("IPC290751", 2024, 1)
+            self.client.fetch_series_value("IPC290751", 2024, 1)
+
+        self.assertEqual(
+            [(event.series, event.start_date, event.cache, event.outcome)
+             for event in collector.ine_requests()],
+            [
+                ("IPC290751", date(2024, 1, 1), CACHE_MISS, OUTCOME_OK),
+                ("IPC290751", date(2024, 1, 1), CACHE_MEMORY, OUTCOME_OK),
+            ],
+        )
+
+    def test_failed_request_reports_original_error(self):
+        self.session.get.side_effect = requests.exceptions.Timeout()
+
+        with EventCollector() as collector:
+            with self.assertRaises(ConnectionError):
+                self.client.fetch_series_data(date(2024, 1, 1), date(2024, 2, 1), "IRAV1")
+
+        [event] = collector.ine_requests()
+        self.assertEqual(event.series, "IRAV1")
+        self.assertEqual(event.end_date, date(2024, 2, 1))
+        self.assertEqual((event.outcome, event.error), (OUTCOME_ERROR, "Timeout"))
+        self.assertFalse(any(isinstance(e, CalculationEvent) for e in collector.events))
+
+
+if __name__ == "__main__":
+    unittest.main()
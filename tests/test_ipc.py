@@ -1,10 +1,19 @@
+import threading
 import unittest
 from datetime import date
-from decimal import Decimal
-from unittest.mock import patch
+from decimal import ROUND_HALF_UP, Decimal
+from unittest.mock import Mock, patch
 
 from arrendatools.rent_update.base import RentUpdateInput, RentUpdateResult
+from arrendatools.rent_update.deadline import current_deadline, deadline
 from arrendatools.rent_update.factory import RentUpdateFactory
+from arrendatools.rent_update.index_provider import (
+    ChainedIndexProvider,
+    IneIndexProvider,
+)
+from arrendatools.rent_update.ine_payload import SeriesValues
+from arrendatools.rent_update.strategies import ipc
+from arrendatools.rent_update.strategies.ipc import IpcUpdate
 
 
 class TestIpcUpdate(unittest.TestCase):
@@ -208,9 +217,9 @@ class TestIpcUpdate(unittest.TestCase):
             "IPC data is only available from March 1954 onward.",
         )
 
-    @patch("arrendatools.rent_update.strategies.ipc.IneClient.fetch_series_data")
+    @patch("arrendatools.rent_update.strategies.ipc.IneClient.fetch_series_values")
     def test_fetch_ipc_no_data(self, mock_fetch):
-        mock_fetch.return_value = {"Data": []}
+        mock_fetch.return_value = SeriesValues("IPC290751")
 
         with self.assertRaises(ValueError) as context:
             self.rent_update._fetch_ipc(2024, 1)
@@ -293,6 +302,284 @@ class TestIpcUpdate(unittest.TestCase):
             "Rent not updated: Could not fetch IPC data for agosto 2003.",
         )
 
+    @patch(
+        "arrendatools.rent_update.strategies.ipc.IneClient.prefetch_series",
+        return_value={},
+    )
+    @patch(
+        "arrendatools.rent_update.strategies.ipc.IneClient.missing_periods",
+        return_value=[],
+    )
+    @patch("arrendatools.rent_update.strategies.ipc.IpcUpdate._fetch_ipc")
+    def test_calculate_many_fetches_each_index_once(
+        self, mock_fetch, mock_missing, mock_prefetch
+    ):
+        indices = {
+            (2002, 8): Decimal("60.030"),
+            (2003, 8): Decimal("61.827"),
+            (2004, 8): Decimal("63.671"),
+        }
+        mock_fetch.side_effect = lambda year, month: indices[(year, month)]
+        inputs = [
+            RentUpdateInput(
+                amount=Decimal("400.00"), year_start=2002, year_end=2003, month=8
+            ),
+            RentUpdateInput(
+                amount=Decimal("500.00"), year_start=2003, year_end=2004, month=8
+            ),
+            RentUpdateInput(
+                amount=Decimal("400.00"), year_start=2002, year_end=2003, month=8
+            ),
+        ]
+
+        results = self.rent_update.calculate_many(inputs)
+
+        self.assertEqual(mock_fetch.call_count, 3)
+        self.assertEqual(
+            [result.amount for result in results],
+            [Decimal("400.00"), Decimal("500.00"), Decimal("400.00")],
+        )
+        self.assertEqual(results[0].updated_amount, Decimal("412.00"))
+        self.assertEqual(results[0], results[2])
+        self.assertEqual(results[1].index_start, Decimal("61.827"))
+
+    def test_calculate_many_empty(self):
+        self.assertEqual(self.rent_update.calculate_many([]), [])
+
+    @patch("arrendatools.rent_update.strategies.ipc.IpcUpdate._fetch_ipc")
+    def test_parallel_fetch_mode_propagates_deadline(self, mock_fetch):
+        deadlines = []
+
+        def fetch(year, month):
+            deadlines.append(current_deadline())
+            return Decimal("60.030")
+
+        mock_fetch.side_effect = fetch
+        rent_update = IpcUpdate(
+            provider=self._uncached_provider(), fetch_mode=IpcUpdate.FETCH_PARALLEL
+        )
+
+        with deadline(5) as budget:
+            rent_update.calculate(
+                RentUpdateInput(
+                    amount=Decimal("400.00"), year_start=2002, year_end=2003, month=8
+                )
+            )
+
+        self.assertEqual(deadlines, [budget, budget])
+
+    @patch("arrendatools.rent_update.ine_snapshot.SERIES", {})
+    @patch("arrendatools.rent_update.strategies.ipc.IpcUpdate._fetch_ipc")
+    @patch("arrendatools.rent_update.strategies.ipc.IneClient.prefetch_series")
+    @patch("arrendatools.rent_update.strategies.ipc.IneClient.missing_periods")
+    def test_calculate_many_uses_one_ranged_request(
+        self, mock_missing, mock_prefetch, mock_fetch
+    ):
+        mock_missing.side_effect = lambda series, periods: sorted(set(periods))
+        mock_prefetch.return_value = {
+            (2001, 8): Decimal("58.900"),
+            (2002, 8): Decimal("60.030"),
+            (2003, 8): Decimal("61.827"),
+        }
+        inputs = [
+            RentUpdateInput(
+                amount=Decimal("400.00"), year_start=2002, year_end=2003, month=8
+            ),
+            RentUpdateInput(
+                amount=Decimal("400.00"), year_start=1999, year_end=2001, month=8
+            ),
+            RentUpdateInput(
+                amount=Decimal("400.00"), year_start=1999, year_end=2003, month=8
+            ),
+        ]
+
+        results = self.rent_update.calculate_many(inputs)
+
+        mock_missing.assert_called_once_with("IPC290751", [(2002, 8), (2003, 8)])
+        mock_prefetch.assert_called_once_with(
+            "IPC290751", date(2002, 8, 1), date(2003, 8, 1)
+        )
+        mock_fetch.assert_not_called()
+        self.assertEqual(results[0].updated_amount, Decimal("412.00"))
+        self.assertEqual(results[1].updated_amount, Decimal("429.60"))
+
+    @patch("arrendatools.rent_update.strategies.ipc.IneClient.prefetch_series")
+    @patch(
+        "arrendatools.rent_update.strategies.ipc.IneClient.missing_periods",
+        return_value=[(2003, 8)],
+    )
+    def test_prefetch_skips_single_missing_period(self, mock_missing, mock_prefetch):
+        self.rent_update.prefetch(
+            [
+                RentUpdateInput(
+                    amount=Decimal("400.00"), year_start=2002, year_end=2003, month=8
+                )
+            ]
+        )
+        mock_prefetch.assert_not_called()
+
+    def test_injected_client_is_used(self):
+        client = Mock()
+        client.fetch_series_value.return_value = Decimal("61.827")
+        rent_update = IpcUpdate(client=client, use_snapshot=False)
+
+        self.assertEqual(rent_update._fetch_ipc(2003, 8), Decimal("61.827"))
+        client.fetch_series_value.assert_called_once_with("IPC290751", 2003, 8)
+
+    def test_default_provider(self):
+        self.assertIsInstance(IpcUpdate().provider, ChainedIndexProvider)
+        self.assertIsInstance(
+            IpcUpdate(use_snapshot=False).provider, IneIndexProvider
+        )
+
+    def test_injected_provider_is_used(self):
+        provider = Mock()
+        provider.get_value.return_value = Decimal("61.827")
+        rent_update = IpcUpdate(provider=provider)
+
+        self.assertIs(rent_update.provider, provider)
+        self.assertEqual(rent_update._fetch_ipc(2003, 8), Decimal("61.827"))
+        provider.get_value.assert_called_once_with("IPC290751", 2003, 8)
+
+    @patch("arrendatools.rent_update.strategies.ipc.IpcUpdate._fetch_ipc")
+    def test_calculate_parallel_fetch_mode(self, mock_fetch):
+        indices = {(2002, 8): Decimal("60.030"), (2003, 8): Decimal("61.827")}
+        barrier = threading.Barrier(2, timeout=5)
+
+        def fetch(year, month):
+            barrier.wait()
+            return indices[(year, month)]
+
+        mock_fetch.side_effect = fetch
+        rent_update = IpcUpdate(
+            provider=self._uncached_provider(), fetch_mode=IpcUpdate.FETCH_PARALLEL
+        )
+
+        result = rent_update.calculate(
+            RentUpdateInput(
+                amount=Decimal("400.00"), year_start=2002, year_end=2003, month=8
+            )
+        )
+
+        self.assertEqual(result.updated_amount, Decimal("412.00"))
+        self.assertEqual(result.index_start, Decimal("60.030"))
+        self.assertEqual(result.index_end, Decimal("61.827"))
+
+    @patch("arrendatools.rent_update.strategies.ipc.IpcUpdate._fetch_ipc")
+    def test_parallel_fetch_mode_threads_only_missing_indices(self, mock_fetch):
+        indices = {(2002, 8): Decimal("60.030"), (2003, 8): Decimal("61.827")}
+        threads = []
+
+        def fetch(year, month):
+            threads.append(threading.current_thread())
+            return indices[(year, month)]
+
+        mock_fetch.side_effect = fetch
+        provider = Mock()
+        provider.missing_periods.return_value = [(2003, 8)]
+        rent_update = IpcUpdate(provider=provider, fetch_mode=IpcUpdate.FETCH_PARALLEL)
+        inputs = RentUpdateInput(
+            amount=Decimal("400.00"), year_start=2002, year_end=2003, month=8
+        )
+
+        result = rent_update.calculate(inputs)
+
+        self.assertEqual(result.updated_amount, Decimal("412.00"))
+        self.assertEqual(threads, [threading.current_thread()] * 2)
+        self.assertIsNone(rent_update._executor)
+
+        provider.missing_periods.return_value = [(2002, 8), (2003, 8)]
+        rent_update.calculate(inputs)
+        executor = rent_update._executor
+        rent_update.calculate(inputs)
+        self.assertIsNotNone(executor)
+        self.assertIs(rent_update._executor, executor)
+
+    @staticmethod
+    def _uncached_provider():
+        provider = Mock()
+        provider.missing_periods.side_effect = lambda series, periods: sorted(set(periods))
+        return provider
+
+    @patch("arrendatools.rent_update.ine_snapshot.SERIES", {})
+    @patch("arrendatools.rent_update.strategies.ipc.IpcUpdate._fetch_ipc")
+    @patch("arrendatools.rent_update.strategies.ipc.IneClient.prefetch_series")
+    @patch("arrendatools.rent_update.strategies.ipc.IneClient.missing_periods")
+    def test_calculate_range_fetch_mode(self, mock_missing, mock_prefetch, mock_fetch):
+        mock_missing.side_effect = lambda series, periods: sorted(set(periods))
+        mock_prefetch.return_value = {
+            (2002, 8): Decimal("60.030"),
+            (2002, 9): Decimal("60.200"),
+            (2003, 8): Decimal("61.827"),
+        }
+        rent_update = IpcUpdate(fetch_mode=IpcUpdate.FETCH_RANGE)
+
+        result = rent_update.calculate(
+            RentUpdateInput(
+                amount=Decimal("400.00"), year_start=2002, year_end=2003, month=8
+            )
+        )
+
+        self.assertEqual(result.updated_amount, Decimal("412.00"))
+        mock_prefetch.assert_called_once_with(
+            "IPC290751", date(2002, 8, 1), date(2003, 8, 1)
+        )
+        mock_fetch.assert_not_called()
+
+    def test_invalid_fetch_mode(self):
+        with self.assertRaises(ValueError) as context:
+            IpcUpdate(fetch_mode="threads")
+        self.assertEqual(
+            str(context.exception),
+            "Unknown fetch mode: threads. Available: sequential, parallel, range",
+        )
+
+    def test_index_periods(self):
+        inputs = [
+            RentUpdateInput(
+                amount=Decimal("400.00"), year_start=2002, year_end=2003, month=8
+            ),
+            RentUpdateInput(
+                amount=Decimal("400.00"), year_start=1999, year_end=2003, month=8
+            ),
+            RentUpdateInput(
+                amount=Decimal("400.00"), year_start=1999, year_end=2001, month=8
+            ),
+        ]
+        self.assertEqual(
+            self.rent_update.index_periods(inputs),
+            {"IPC290751": [(2002, 8), (2003, 8)]},
+        )
+
+    def test_base_1992_variation_rate_is_memoized(self):
+        ipc._variation_rate_base_1992.cache_clear()
+        inputs = RentUpdateInput(
+            amount=Decimal("400.00"), year_start=1999, year_end=2001, month=8
+        )
+
+        first = self.rent_update.calculate(inputs)
+        second = self.rent_update.calculate(inputs)
+
+        self.assertEqual(first, second)
+        self.assertEqual(first.variation_rate, Decimal("0.074"))
+        info = ipc._variation_rate_base_1992.cache_info()
+        self.assertEqual((info.hits, info.misses), (1, 1))
+
+    def test_precompute_base_1992(self):
+        ipc._variation_rate_base_1992.cache_clear()
+
+        count = IpcUpdate.precompute_base_1992()
+
+        # 48 anos por mes, salvo enero y febrero de 1954 (sin dato).
+        self.assertEqual(count, 10 * 48 * 49 // 2 + 2 * 47 * 48 // 2)
+        self.assertEqual(ipc._variation_rate_base_1992.cache_info().currsize, count)
+        self.assertEqual(
+            ipc._variation_rate_base_1992(1954, 2001, 3),
+            ((Decimal("134.415") / Decimal("3.282")) - 1).quantize(
+                Decimal("0.001"), rounding=ROUND_HALF_UP
+            ),
+        )
+
 
 if __name__ == "__main__":
     unittest.main()
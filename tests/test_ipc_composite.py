@@ -0,0 +1,77 @@
+import unittest
+from decimal import Decimal
+from unittest.mock import patch
+
+from arrendatools.rent_update.base import RentUpdateInput
+from arrendatools.rent_update.factory import RentUpdateFactory
+from arrendatools.rent_update.index_provider import StaticIndexProvider
+from arrendatools.rent_update.strategies.ipc import IpcUpdate
+
+# Importe actualizado de cada estrategia compuesta para data 0.05 y 0.01 con
+# el IPC de agosto 2002 -> agosto 2003 (+3%).
+_EXPECTED = {
+    "ipc_then_percentage": [Decimal("432.60"), Decimal("416.12")],
+    "min_ipc_or_percentage": [Decimal("412.00"), Decimal("404.00")],
+}
+
+
+def _input(data=None):
+    return RentUpdateInput(
+        amount=Decimal("400.00"), data=data, year_start=2002, year_end=2003, month=8
+    )
+
+
+class TestIpcCompositeUpdate(unittest.TestCase):
+    @patch(
+        "arrendatools.rent_update.strategies.ipc.IneClient.missing_periods",
+        return_value=[],
+    )
+    @patch("arrendatools.rent_update.strategies.ipc.IpcUpdate._fetch_ipc")
+    def test_calculate_many_fetches_each_index_once(self, mock_fetch, mock_missing):
+        indices = {(2002, 8): Decimal("60.030"), (2003, 8): Decimal("61.827")}
+        mock_fetch.side_effect = lambda year, month: indices[(year, month)]
+        for key, expected in _EXPECTED.items():
+            with self.subTest(strategy=key):
+                mock_fetch.reset_mock()
+                rent_update = RentUpdateFactory.create(key)
+
+                results = rent_update.calculate_many(
+                    [_input(Decimal("0.05")), _input(Decimal("0.01"))]
+                )
+
+                self.assertEqual(mock_fetch.call_count, 2)
+                self.assertEqual([result.updated_amount for result in results], expected)
+
+    def test_calculate_many_validates_every_input(self):
+        for key in _EXPECTED:
+            with self.subTest(strategy=key):
+                with self.assertRaises(ValueError) as context:
+                    RentUpdateFactory.create(key).calculate_many(
+                        [_input(Decimal("0.05")), _input()]
+                    )
+                self.assertEqual(str(context.exception), "Field 'data' is required.")
+
+    def test_injected_ipc_update_is_reused(self):
+        provider = StaticIndexProvider(
+            {"IPC290751": {(2002, 8): Decimal("60.030"), (2003, 8): Decimal("61.827")}}
+        )
+        ipc_update = IpcUpdate(provider=provider)
+        for key in _EXPECTED:
+            with self.subTest(strategy=key):
+                klass = type(RentUpdateFactory.create(key, provider=provider))
+                rent_update = klass(ipc_update=ipc_update)
+
+                with patch.object(
+                    ipc_update, "calculate_many", wraps=ipc_update.calculate_many
+                ) as calculate_many:
+                    rent_update.calculate(_input(Decimal("0.05")))
+
+                calculate_many.assert_called_once()
+                self.assertIs(rent_update.ipc_update, ipc_update)
+                self.assertIs(rent_update.provider, provider)
+                with self.assertRaises(ValueError):
+                    klass(provider=StaticIndexProvider(), ipc_update=ipc_update)
+
+
+if __name__ == "__main__":
+    unittest.main()
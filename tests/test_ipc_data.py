@@ -0,0 +1,50 @@
+import unittest
+from decimal import ROUND_HALF_UP, Decimal
+
+from arrendatools.rent_update.strategies import ipc_data
+from arrendatools.rent_update.strategies.ipc_data import (
+    IPC_BASE_1992_FIRST_YEAR,
+    IPC_BASE_1992_LAST_YEAR,
+    IPC_THOUSANDTHS_BASE_1992,
+    ipc_base_1992,
+)
+
+
+class TestIpcData(unittest.TestCase):
+    def test_table_layout(self):
+        years = IPC_BASE_1992_LAST_YEAR - IPC_BASE_1992_FIRST_YEAR + 1
+        self.assertEqual(len(IPC_THOUSANDTHS_BASE_1992), years * 12)
+
+    def test_ipc_base_1992(self):
+        value = ipc_base_1992(2001, 8)
+        self.assertEqual(value, Decimal("136.745"))
+        self.assertEqual(value.as_tuple().exponent, -3)
+        self.assertEqual(ipc_base_1992(1954, 3), Decimal("3.282"))
+
+    def test_ipc_base_1992_not_available(self):
+        self.assertIsNone(ipc_base_1992(1954, 1))
+        self.assertIsNone(ipc_base_1992(1953, 12))
+        self.assertIsNone(ipc_base_1992(2002, 1))
+        self.assertIsNone(ipc_base_1992(2001, 13))
+
+    def test_legacy_table_matches_lookup(self):
+        table = ipc_data.IPC_TABLE_BASE_1992
+        self.assertEqual(sorted(table), list(range(1954, 2002)))
+        self.assertEqual(table[1954][:3], [0, 0, 3.282])
+        for year, months in table.items():
+            for month, value in enumerate(months, start=1):
+                if value:
+                    self.assertEqual(
+                        Decimal(value).quantize(
+                            Decimal("0.001"), rounding=ROUND_HALF_UP
+                        ),
+                        ipc_base_1992(year, month),
+                    )
+
+    def test_unknown_attribute(self):
+        with self.assertRaises(AttributeError):
+            ipc_data.UNKNOWN
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,9 +1,11 @@
 import unittest
+from datetime import date
 from decimal import Decimal
-from unittest.mock import patch
+from unittest.mock import Mock, patch
 
 from arrendatools.rent_update.base import RentUpdateInput, RentUpdateResult
 from arrendatools.rent_update.factory import RentUpdateFactory
+from arrendatools.rent_update.ine_payload import SeriesValues
 from arrendatools.rent_update.strategies.irav import IravUpdate
 
 
@@ -91,9 +93,9 @@ class TestIravUpdate(unittest.TestCase):
             "Rent not updated: Could not fetch IRAV data for noviembre 2025.",
         )
 
-    @patch("arrendatools.rent_update.strategies.irav.IneClient.fetch_series_data")
+    @patch("arrendatools.rent_update.strategies.irav.IneClient.fetch_series_values")
     def test_fetch_irav_no_data(self, mock_fetch):
-        mock_fetch.return_value = {"Data": []}
+        mock_fetch.return_value = SeriesValues("IRAV1")
 
         with self.assertRaises(ValueError) as context:
             self.rent_update._fetch_irav(2025, 11)
@@ -121,6 +123,74 @@ class TestIravUpdate(unittest.TestCase):
             any("INE IRAV fetch failed: Boom" in message for message in logs.output)
         )
 
+    @patch(
+        "arrendatools.rent_update.strategies.irav.IneClient.missing_periods",
+        return_value=[(2024, 11)],
+    )
+    @patch("arrendatools.rent_update.strategies.irav.IravUpdate._fetch_irav")
+    def test_calculate_many_fetches_each_index_once(self, mock_fetch, mock_missing):
+        mock_fetch.return_value = Decimal("0.022")
+        inputs = [
+            RentUpdateInput(amount=Decimal("1000.00"), month=11, year_start=2024),
+            RentUpdateInput(amount=Decimal("500.00"), month=11, year_start=2024),
+        ]
+
+        results = self.rent_update.calculate_many(inputs)
+
+        mock_fetch.assert_called_once_with(2024, 11)
+        self.assertEqual(
+            [result.updated_amount for result in results],
+            [Decimal("1022.00"), Decimal("511.00")],
+        )
+
+    @patch("arrendatools.rent_update.ine_snapshot.SERIES", {})
+    @patch("arrendatools.rent_update.strategies.irav.IravUpdate._fetch_irav")
+    @patch("arrendatools.rent_update.strategies.irav.IneClient.prefetch_series")
+    @patch("arrendatools.rent_update.strategies.irav.IneClient.missing_periods")
+    def test_calculate_many_uses_one_ranged_request(
+        self, mock_missing, mock_prefetch, mock_fetch
+    ):
+        mock_missing.side_effect = lambda series, periods: sorted(set(periods))
+        mock_prefetch.return_value = {
+            (2024, 11): Decimal("2.2"),
+            (2025, 11): Decimal("1.95"),
+        }
+
+        results = self.rent_update.calculate_many(
+            [
+                RentUpdateInput(amount=Decimal("1000.00"), month=11, year_start=2024),
+                RentUpdateInput(amount=Decimal("1000.00"), month=11, year_start=2025),
+            ]
+        )
+
+        mock_prefetch.assert_called_once_with(
+            "IRAV1", date(2024, 11, 1), date(2025, 11, 1)
+        )
+        mock_fetch.assert_not_called()
+        self.assertEqual(
+            [result.variation_rate for result in results],
+            [Decimal("0.022"), Decimal("0.020")],
+        )
+
+    def test_injected_client_is_used(self):
+        client = Mock()
+        client.fetch_series_value.return_value = Decimal("2.2")
+        rent_update = IravUpdate(client=client, use_snapshot=False)
+
+        self.assertEqual(rent_update._fetch_irav(2024, 11), Decimal("0.022"))
+        client.fetch_series_value.assert_called_once_with("IRAV1", 2024, 11)
+
+    def test_index_periods(self):
+        inputs = [
+            RentUpdateInput(amount=Decimal("1000.00"), month=1, year_start=2025),
+            RentUpdateInput(amount=Decimal("1000.00"), month=11, year_start=2024),
+            RentUpdateInput(amount=Decimal("1000.00"), month=1, year_start=2025),
+        ]
+        self.assertEqual(
+            IravUpdate(provider=Mock()).index_periods(inputs),
+            {"IRAV1": [(2024, 11), (2025, 1)]},
+        )
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,155 @@
+import json
+import unittest
+from decimal import Decimal
+from unittest.mock import Mock
+
+import requests
+
+from arrendatools.rent_update import metrics
+from arrendatools.rent_update.base import RentUpdateInput
+from arrendatools.rent_update.factory import RentUpdateFactory
+from arrendatools.rent_update.index_cache import MemoryIndexCache
+from arrendatools.rent_update.index_provider import IneIndexProvider
+from arrendatools.rent_update.ine_client import IneClient
+from arrendatools.rent_update.metrics import Counter, Histogram, MetricsRegistry
+
+
+class TestMetricsRegistry(unittest.TestCase):
+    def test_counter_exposition(self):
+        registry = MetricsRegistry()
+        counter = registry.counter("requests_total", "Requests.", ("code",))
+        counter.inc(code="200")
+        counter.inc(2, code='a"b')
+
+        self.assertEqual(
+            registry.expose(),
+            "# HELP requests_total Requests.\n"
+            "# TYPE requests_total counter\n"
+            'requests_total{code="200"} 1\n'
+            'requests_total{code="a\\"b"} 2\n',
+        )
+        with self.assertRaises(ValueError):
+            counter.inc(-1, code="200")
+        with self.assertRaises(ValueError):
+            counter.inc(other="x")
+
+    def test_histogram_exposition(self):
+        histogram = Histogram("latency_seconds", "Latency.", buckets=(0.1, 1.0))
+        for value in (0.05, 0.1, 0.5, 3.0):
+            histogram.observe(value)
+
+        self.assertEqual(
+            histogram.expose().splitlines()[2:],
+            [
+                'latency_seconds_bucket{le="0.1"} 2',
+                'latency_seconds_bucket{le="1.0"} 3',
+                'latency_seconds_bucket{le="+Inf"} 4',
+                "latency_seconds_sum 3.65",
+                "latency_seconds_count 4",
+            ],
+        )
+
+    def test_registry_returns_existing_metric(self):
+        registry = MetricsRegistry()
+        counter = registry.counter("total", "Total.")
+        self.assertIs(registry.counter("total", "Total."), counter)
+        self.assertIsInstance(registry.get("total"), Counter)
+        with self.assertRaises(ValueError):
+            registry.histogram("total", "Total.")
+
+
+class TestRentUpdateMetrics(unittest.TestCase):
+    def setUp(self):
+        self._memory_cache = IneClient._memory_cache
+        self._disk_cache = IneClient._disk_cache
+        IneClient.set_memory_cache(MemoryIndexCache())
+        IneClient.set_disk_cache(None)
+        self.session = Mock()
+        self.session.headers = {}
+        self.client = IneClient(session=self.session)
+        self.metrics = metrics.enable_metrics()
+
+    def tearDown(self):
+        metrics.disable_metrics()
+        IneClient.set_memory_cache(self._memory_cache)
+        IneClient.set_disk_cache(self._disk_cache)
+
+    def _response(self, payload):
+        response = Mock()
+        response.json.return_value = payload
+        response.content = json.dumps(payload).encode()
+        return response
+
+    def test_calculations_and_factory(self):
+        method = RentUpdateFactory.create("percentage")
+        method.calculate_many(
+            [RentUpdateInput(amount=Decimal("100"), data=Decimal("0.1"))] * 3
+        )
+        with self.assertRaises(ValueError):
+            method.calculate(RentUpdateInput(amount=Decimal("100")))
+        with self.assertRaises(ValueError):
+            RentUpdateFactory.create("unknown")
+
+        calculations = self.metrics.calculations
+        self.assertEqual(calculations.value(strategy="percentage", outcome="ok"), 3)
+        self.assertEqual(calculations.value(strategy="percentage", outcome="error"), 1)
+        self.assertEqual(
+            self.metrics.calculation_seconds.count(
+                strategy="percentage", operation="calculate_many"
+            ),
+            1,
+        )
+        created = self.metrics.strategies_created
+        self.assertEqual(
+            created.value(strategy="percentage", shared="false", outcome="ok"), 1
+        )
+        self.assertEqual(
+            created.value(strategy="unknown", shared="false", outcome="error"), 1
+        )
+
+    def test_ine_requests_failures_and_cache_ratio(self):
+        invalid_json = self._response(None)
+        invalid_json.text = "not json"
+        invalid_json.content = b"not json"
+        invalid_json.json.side_effect = json.JSONDecodeError("x", "not json", 0)
+        self.session.get.side_effect = [
+            self._response({"Data": [{"Anyo": 2025, "FK_Periodo": 1, "Valor": 2.15}]}),
+            requests.exceptions.Timeout(),
+            requests.exceptions.HTTPError("503"),
+            invalid_json,
+        ]
+        method = RentUpdateFactory.create(
+            "irav", provider=IneIndexProvider(client=self.client)
+        )
+
+        method.calculate(RentUpdateInput(amount=Decimal("100"), month=1, year_start=2025))
+        self.client.fetch_series_value("IRAV1", 2025, 1)
+        for _ in range(3):
+            with self.assertRaises((ConnectionError, json.JSONDecodeError)):
+                self.client.fetch_series_value("IRAV1", 2024, 11)
+
+        self.assertEqual(self.metrics.ine_requests.value(series="IRAV1", outcome="ok"), 1)
+        self.assertEqual(self.metrics.ine_requests.value(series="IRAV1", outcome="error"), 3)
+        for error in ("Timeout", "HTTPError", "JSONDecodeError"):
+            self.assertEqual(self.metrics.ine_failures.value(error=error), 1)
+        self.assertEqual(self.metrics.index_lookups.value(cache="memory"), 1)
+        self.assertEqual(self.metrics.cache_hit_ratio.value(), 0.2)
+        self.assertEqual(self.metrics.calculations.value(strategy="irav", outcome="ok"), 1)
+
+        text = metrics.exposition()
+        self.assertIn('arrendatools_ine_failures_total{error="Timeout"} 1\n', text)
+        self.assertIn("arrendatools_index_cache_hit_ratio 0.2\n", text)
+        self.assertIn(
+            'arrendatools_ine_request_duration_seconds_count{series="IRAV1"} 4\n', text
+        )
+
+    def test_disabled_metrics(self):
+        self.assertIs(metrics.enable_metrics(), self.metrics)
+        metrics.disable_metrics()
+        self.assertEqual(metrics.exposition(), "")
+        RentUpdateFactory.create("percentage")
+        self.assertEqual(self.metrics.strategies_created.samples(), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,204 @@
+import unittest
+from dataclasses import replace
+from datetime import date
+from decimal import Decimal
+from unittest.mock import Mock
+
+from arrendatools.rent_update.base import RentUpdateInput
+from arrendatools.rent_update.factory import RentUpdateFactory
+from arrendatools.rent_update.index_provider import IndexProvider, StaticIndexProvider
+from arrendatools.rent_update import parallel
+from arrendatools.rent_update.parallel import (
+    ParallelExecutor,
+    calculate_parallel,
+    resolve_indices,
+)
+from arrendatools.rent_update.strategies.ipc import IpcUpdate
+
+
+class _DictIndexProvider(IndexProvider):
+    def __init__(self, values):
+        self.values = values
+
+    def get_value(self, series, year, month):
+        return self.values.get((series, year, month))
+
+
+class _ScaledIpcUpdate(IpcUpdate):
+    """Estrategia con un argumento obligatorio en el constructor."""
+
+    def __init__(self, factor, provider=None):
+        super().__init__(provider=provider, fetch_mode=IpcUpdate.FETCH_RANGE)
+        self.factor = factor
+
+    def calculate_many(self, inputs):
+        return [
+            replace(result, updated_amount=result.updated_amount * self.factor)
+            for result in super().calculate_many(inputs)
+        ]
+
+
+def _values():
+    values = {}
+    for year in range(2002, 2026):
+        for month in range(1, 13):
+            offset = (year - 2002) * 12 + month - 1
+            values[("IPC290751", year, month)] = Decimal(60000 + offset * 157) / 1000
+    for year in range(2024, 2026):
+        for month in range(1, 13):
+            values[("IRAV1", year, month)] = Decimal(2000 + month * 10) / 1000
+    return values
+
+
+def _ipc_inputs(count):
+    return [
+        RentUpdateInput(
+            amount=Decimal("400.00") + index,
+            data=Decimal("0.03"),
+            month=index % 12 + 1,
+            year_start=1995 + index % 25,
+            year_end=2000 + index % 25,
+        )
+        for index in range(count)
+    ]
+
+
+class TestParallelExecutor(unittest.TestCase):
+    def setUp(self):
+        self.provider = _DictIndexProvider(_values())
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(ValueError):
+            ParallelExecutor(workers=0)
+        with self.assertRaises(ValueError):
+            ParallelExecutor(chunk_size=0)
+
+    def test_results_match_sequential_path(self):
+        cases = {
+            "ipc": _ipc_inputs(60),
+            "min_ipc_or_percentage": _ipc_inputs(60),
+            "ipc_then_percentage": _ipc_inputs(60),
+            "irav": [
+                RentUpdateInput(
+                    amount=Decimal("1000.00"), month=index % 12 + 1, year_start=2025
+                )
+                for index in range(24)
+            ],
+            "percentage": [
+                RentUpdateInput(amount=Decimal("100.00") + index, data=Decimal("0.10"))
+                for index in range(10)
+            ],
+        }
+        with ParallelExecutor(workers=2, chunk_size=7) as executor:
+            for key, inputs in cases.items():
+                with self.subTest(key=key):
+                    method = RentUpdateFactory.create(key, provider=self.provider)
+                    self.assertEqual(
+                        executor.calculate_many(method, inputs),
+                        method.calculate_many(inputs),
+                    )
+
+    def test_strategy_configuration_reaches_workers(self):
+        inputs = _ipc_inputs(20)
+        method = _ScaledIpcUpdate(Decimal(2), provider=self.provider)
+
+        results = calculate_parallel(method, inputs, workers=2, chunk_size=5)
+
+        self.assertEqual(results, method.calculate_many(inputs))
+        self.assertEqual(
+            results[0].updated_amount,
+            IpcUpdate(provider=self.provider).calculate(inputs[0]).updated_amount * 2,
+        )
+        self.assertIs(method.provider, self.provider)
+
+    def test_composite_provider_is_replaced_on_a_copy(self):
+        method = RentUpdateFactory.create("ipc_then_percentage", provider=self.provider)
+        ipc_update = method.ipc_update
+        static_provider = StaticIndexProvider({})
+
+        copied = parallel._with_provider(method, static_provider)
+
+        self.assertIs(copied.provider, static_provider)
+        self.assertIs(copied.ipc_update.provider, static_provider)
+        self.assertIs(method.ipc_update, ipc_update)
+        self.assertIs(method.provider, self.provider)
+
+    def test_calculate_parallel_with_key(self):
+        inputs = _ipc_inputs(20)
+        expected = RentUpdateFactory.create("ipc", provider=self.provider).calculate_many(
+            inputs
+        )
+        self.assertEqual(
+            calculate_parallel("ipc", inputs, workers=2, provider=self.provider),
+            expected,
+        )
+
+    def test_missing_index_raises_like_sequential_path(self):
+        inputs = _ipc_inputs(4) + [
+            RentUpdateInput(
+                amount=Decimal("400.00"), month=8, year_start=2003, year_end=2030
+            )
+        ]
+        with self.assertRaises(ValueError) as context:
+            calculate_parallel("ipc", inputs, workers=2, provider=self.provider)
+        self.assertEqual(
+            str(context.exception),
+            "Rent not updated: Could not fetch IPC data for agosto 2030.",
+        )
+
+    def test_single_worker_runs_in_process(self):
+        method = Mock()
+        method.calculate_many.return_value = ["result"]
+
+        self.assertEqual(
+            ParallelExecutor(workers=1).calculate_many(method, ["input"]), ["result"]
+        )
+        method.calculate_many.assert_called_once_with(["input"])
+
+
+class TestResolveIndices(unittest.TestCase):
+    def test_resolve_uses_one_ranged_request(self):
+        provider = Mock(spec=IndexProvider)
+        provider.missing_periods.side_effect = lambda series, periods: periods
+        provider.get_range.return_value = {
+            (2002, 8): Decimal("60.030"),
+            (2003, 8): Decimal("61.827"),
+        }
+        provider.get_value.return_value = None
+        method = RentUpdateFactory.create("ipc", provider=provider)
+        inputs = [
+            RentUpdateInput(
+                amount=Decimal("400.00"), month=8, year_start=2002, year_end=2003
+            ),
+            RentUpdateInput(
+                amount=Decimal("400.00"), month=8, year_start=2003, year_end=2004
+            ),
+        ]
+
+        static_provider = resolve_indices(method, inputs)
+
+        provider.get_range.assert_called_once_with(
+            "IPC290751", date(2002, 8, 1), date(2004, 8, 1)
+        )
+        provider.get_value.assert_called_once_with("IPC290751", 2004, 8)
+        self.assertIsInstance(static_provider, StaticIndexProvider)
+        self.assertEqual(
+            static_provider.values,
+            {
+                "IPC290751": {
+                    (2002, 8): Decimal("60.030"),
+                    (2003, 8): Decimal("61.827"),
+                }
+            },
+        )
+
+    def test_resolve_without_indices(self):
+        method = RentUpdateFactory.create("percentage")
+        static_provider = resolve_indices(
+            method, [RentUpdateInput(amount=Decimal("1"), data=Decimal("0.1"))]
+        )
+        self.assertEqual(static_provider.values, {})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,3 +1,4 @@
+import asyncio
 import unittest
 from decimal import Decimal
 
@@ -89,6 +90,26 @@ class TestPercentageUpdate(unittest.TestCase):
         )
         self.assertEqual(result_max, expected_max)
 
+    def test_calculate_many_keeps_input_order(self):
+        results = self.rent_update.calculate_many(
+            [
+                RentUpdateInput(amount=Decimal("100.00"), data=Decimal("0.10")),
+                RentUpdateInput(amount=Decimal("200.00"), data=Decimal("-0.10")),
+            ]
+        )
+        self.assertEqual(
+            [result.updated_amount for result in results],
+            [Decimal("110.00"), Decimal("180.00")],
+        )
+
+    def test_acalculate_default_implementation(self):
+        result = asyncio.run(
+            self.rent_update.acalculate(
+                RentUpdateInput(amount=Decimal("100.00"), data=Decimal("0.10"))
+            )
+        )
+        self.assertEqual(result.updated_amount, Decimal("110.00"))
+
 
 if __name__ == "__main__":
     unittest.main()
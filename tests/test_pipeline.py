@@ -0,0 +1,201 @@
+import io
+import json
+import os
+import tempfile
+import unittest
+from decimal import Decimal
+
+from arrendatools.rent_update.base import RentUpdateInput
+from arrendatools.rent_update.index_provider import IndexProvider
+from arrendatools.rent_update.pipeline import (
+    PipelineStats,
+    RentUpdatePipeline,
+    detect_format,
+    read_rows,
+    row_to_input,
+    run_pipeline,
+    write_rows,
+)
+
+
+class _DictIndexProvider(IndexProvider):
+    def __init__(self, values):
+        self.values = values
+        self.calls = []
+
+    def get_value(self, series, year, month):
+        self.calls.append((series, year, month))
+        return self.values.get((series, year, month))
+
+
+_CSV = """method,amount,data,month,year_start,year_end
+percentage,100.00,0.10,,,
+ipc,400.00,,8,2002,2003
+irav,1000.00,,11,2024,
+unknown,100.00,,,,
+ipc,400.00,,8,2003,2030
+fixed_amount,abc,1,,,
+"""
+
+
+class TestPipeline(unittest.TestCase):
+    def setUp(self):
+        self.provider = _DictIndexProvider(
+            {
+                ("IPC290751", 2002, 8): Decimal("60.030"),
+                ("IPC290751", 2003, 8): Decimal("61.827"),
+                ("IRAV1", 2024, 11): Decimal("2.2"),
+            }
+        )
+
+    def test_detect_format(self):
+        self.assertEqual(detect_format("leases.CSV"), "csv")
+        self.assertEqual(detect_format("leases.jsonl"), "jsonl")
+        with self.assertRaises(ValueError):
+            detect_format("leases.xlsx")
+
+    def test_row_to_input(self):
+        self.assertEqual(
+            row_to_input(
+                {"amount": "400.00", "data": "", "month": "8", "year_start": "2002"}
+            ),
+            RentUpdateInput(amount=Decimal("400.00"), month=8, year_start=2002),
+        )
+        with self.assertRaises(ValueError) as context:
+            row_to_input({"amount": "abc"})
+        self.assertEqual(
+            str(context.exception), "Field 'amount' must be a decimal number: abc"
+        )
+        with self.assertRaises(ValueError):
+            row_to_input({"data": "1"})
+
+    def test_row_to_input_rejects_non_finite_values(self):
+        for value in ("NaN", "sNaN", "Infinity", "-Infinity", Decimal("NaN")):
+            with self.subTest(value=value):
+                with self.assertRaises(ValueError) as context:
+                    row_to_input({"amount": value})
+                self.assertIn("must be a finite decimal number", str(context.exception))
+        for value in ("1e999999", "1e26"):
+            with self.subTest(value=value):
+                with self.assertRaises(ValueError) as context:
+                    row_to_input({"amount": value})
+                self.assertIn("is out of range", str(context.exception))
+        self.assertEqual(row_to_input({"amount": "1e3"}).amount, Decimal("1e3"))
+
+    def test_process_reports_non_finite_values_per_row(self):
+        rows = [
+            {"method": "percentage", "amount": "Infinity", "data": "0.03"},
+            {"method": "percentage", "amount": "1e999999", "data": "0.03"},
+            {"method": "percentage", "amount": "400.00", "data": "NaN"},
+            {"method": "percentage", "amount": "400.00", "data": "0.03"},
+        ]
+
+        outputs = list(RentUpdatePipeline().process(rows))
+
+        self.assertIn("must be a finite decimal number", outputs[0]["error"])
+        self.assertIn("is out of range", outputs[1]["error"])
+        self.assertIn("must be a finite decimal number", outputs[2]["error"])
+        self.assertIsNone(outputs[3]["error"])
+        self.assertEqual(outputs[3]["updated_amount"], Decimal("412.00"))
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(ValueError):
+            RentUpdatePipeline(method=None, method_column=None)
+        with self.assertRaises(ValueError):
+            RentUpdatePipeline(batch_size=0)
+
+    def test_process_csv_reports_errors_per_row(self):
+        pipeline = RentUpdatePipeline(provider=self.provider, batch_size=4)
+        outputs = list(pipeline.process(read_rows(io.StringIO(_CSV), "csv")))
+
+        self.assertEqual(len(outputs), 6)
+        self.assertEqual(outputs[0]["updated_amount"], Decimal("110.00"))
+        self.assertEqual(outputs[1]["updated_amount"], Decimal("412.00"))
+        self.assertEqual(outputs[1]["index_start"], Decimal("60.030"))
+        self.assertEqual(outputs[2]["variation_rate"], Decimal("0.022"))
+        self.assertIn("Unknown update type: unknown", outputs[3]["error"])
+        self.assertEqual(
+            outputs[4]["error"],
+            "Rent not updated: Could not fetch IPC data for agosto 2030.",
+        )
+        self.assertIsNone(outputs[4]["updated_amount"])
+        self.assertIn("must be a decimal number", outputs[5]["error"])
+        self.assertEqual(outputs[1]["method"], "ipc")
+        self.assertIsNone(outputs[0]["error"])
+
+    def test_process_is_lazy(self):
+        consumed = []
+
+        def rows():
+            for index in range(10):
+                consumed.append(index)
+                yield {"amount": "100.00", "data": "1"}
+
+        pipeline = RentUpdatePipeline(method="fixed_amount", batch_size=3)
+        outputs = pipeline.process(rows())
+
+        next(outputs)
+        self.assertEqual(consumed, [0, 1, 2])
+
+    def test_strategies_are_reused(self):
+        pipeline = RentUpdatePipeline(provider=self.provider)
+        rows = [{"method": "ipc", "amount": "400.00", "month": "8", "year_start": "2002", "year_end": "2003"}] * 3
+
+        list(pipeline.process(rows))
+        strategy = pipeline._strategies["ipc"]
+        list(pipeline.process(rows))
+
+        self.assertEqual(list(pipeline._strategies), ["ipc"])
+        self.assertIs(pipeline._strategies["ipc"], strategy)
+        self.assertIs(strategy.provider, self.provider)
+
+    def test_run_pipeline_csv_to_jsonl(self):
+        with tempfile.TemporaryDirectory() as directory:
+            source = os.path.join(directory, "leases.csv")
+            destination = os.path.join(directory, "results.jsonl")
+            with open(source, "w", encoding="utf-8") as handle:
+                handle.write(_CSV)
+
+            stats = run_pipeline(source, destination, provider=self.provider)
+
+            with open(destination, encoding="utf-8") as handle:
+                lines = [json.loads(line) for line in handle]
+
+        self.assertEqual(stats, PipelineStats(rows=6, errors=3))
+        self.assertEqual(lines[1]["updated_amount"], "412.00")
+        self.assertIsNone(lines[0]["index_start"])
+
+    def test_jsonl_to_csv(self):
+        source = io.StringIO(
+            '{"amount": 400.00, "month": 8, "year_start": 2002, "year_end": 2003}\n'
+            "\n"
+            '{"amount": "400.00", "month": 8, "year_start": 1999, "year_end": 2001}\n'
+        )
+        destination = io.StringIO()
+        pipeline = RentUpdatePipeline(method="ipc", provider=self.provider)
+
+        stats = write_rows(
+            pipeline.process(read_rows(source, "jsonl")), destination, "csv"
+        )
+
+        lines = destination.getvalue().splitlines()
+        self.assertEqual(stats, PipelineStats(rows=2, errors=0))
+        self.assertEqual(
+            lines[0],
+            "amount,month,year_start,year_end,updated_amount,variation_rate,"
+            "index_start,index_end,error",
+        )
+        self.assertEqual(lines[1], "400.00,8,2002,2003,412.00,0.030,60.030,61.827,")
+        self.assertTrue(lines[2].startswith("400.00,8,1999,2001,429.60,"))
+
+    def test_file_object_requires_format(self):
+        with self.assertRaises(ValueError) as context:
+            list(read_rows(io.StringIO(_CSV)))
+        self.assertEqual(
+            str(context.exception),
+            "File format is required when passing a file object.",
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,196 @@
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from arrendatools.rent_update.resilience import (
+    STATE_CLOSED,
+    STATE_HALF_OPEN,
+    STATE_OPEN,
+    CircuitBreaker,
+    CircuitOpenError,
+    RateLimiter,
+    SingleFlight,
+)
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestCircuitBreaker(unittest.TestCase):
+    def setUp(self):
+        self.clock = _Clock()
+        self.breaker = CircuitBreaker(failure_threshold=3, reset_timeout=10, clock=self.clock)
+
+    def test_opens_after_consecutive_failures(self):
+        for _ in range(2):
+            self.breaker.before_request()
+            self.breaker.record_failure()
+        self.assertEqual(self.breaker.state, STATE_CLOSED)
+
+        self.breaker.record_failure()
+
+        self.assertEqual(self.breaker.state, STATE_OPEN)
+        with self.assertRaises(CircuitOpenError) as context:
+            self.breaker.before_request()
+        self.assertIsInstance(context.exception, ConnectionError)
+        self.assertEqual(
+            str(context.exception), "INE API circuit is open; retrying in 10.0 s."
+        )
+
+    def test_success_resets_failures(self):
+        self.breaker.record_failure()
+        self.breaker.record_failure()
+        self.breaker.record_success()
+        self.breaker.record_failure()
+        self.assertEqual(self.breaker.state, STATE_CLOSED)
+
+    def test_half_open_allows_a_single_trial(self):
+        for _ in range(3):
+            self.breaker.record_failure()
+        self.clock.now = 10
+
+        self.assertEqual(self.breaker.state, STATE_HALF_OPEN)
+        self.breaker.before_request()
+        with self.assertRaises(CircuitOpenError):
+            self.breaker.before_request()
+
+        self.breaker.record_failure()
+        self.assertEqual(self.breaker.state, STATE_OPEN)
+
+        self.clock.now = 20
+        self.breaker.before_request()
+        self.breaker.record_success()
+        self.assertEqual(self.breaker.state, STATE_CLOSED)
+        self.breaker.before_request()
+
+    def test_release_frees_trial_without_outcome(self):
+        for _ in range(3):
+            self.breaker.record_failure()
+        self.clock.now = 10
+        self.breaker.before_request()
+
+        self.breaker.release()
+
+        self.assertEqual(self.breaker.state, STATE_HALF_OPEN)
+        self.breaker.before_request()
+
+    def test_retry_after_opens_immediately(self):
+        self.breaker.record_failure(retry_after=25)
+
+        self.assertEqual(self.breaker.state, STATE_OPEN)
+        self.clock.now = 24
+        self.assertEqual(self.breaker.state, STATE_OPEN)
+        self.clock.now = 25
+        self.assertEqual(self.breaker.state, STATE_HALF_OPEN)
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(ValueError):
+            CircuitBreaker(failure_threshold=0)
+        with self.assertRaises(ValueError):
+            CircuitBreaker(reset_timeout=-1)
+
+
+class TestRateLimiter(unittest.TestCase):
+    def setUp(self):
+        self.clock = _Clock()
+        self.sleeps = []
+        self.limiter = RateLimiter(
+            rate=2, burst=3, clock=self.clock, sleep=self.sleeps.append
+        )
+
+    def test_burst_then_rate(self):
+        waits = [self.limiter.acquire() for _ in range(5)]
+
+        self.assertEqual(waits, [0.0, 0.0, 0.0, 0.5, 1.0])
+        self.assertEqual(self.sleeps, [0.5, 1.0])
+
+    def test_tokens_refill_up_to_burst(self):
+        for _ in range(3):
+            self.limiter.acquire()
+        self.clock.now = 100
+
+        waits = [self.limiter.acquire() for _ in range(4)]
+
+        self.assertEqual(waits, [0.0, 0.0, 0.0, 0.5])
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(ValueError):
+            RateLimiter(rate=0)
+        with self.assertRaises(ValueError):
+            RateLimiter(rate=1, burst=0)
+
+    def test_wait_longer_than_timeout_is_not_reserved(self):
+        for _ in range(3):
+            self.limiter.acquire()
+
+        with self.assertRaises(TimeoutError):
+            self.limiter.acquire(timeout=0.4)
+        self.assertEqual(self.limiter.acquire(timeout=0.5), 0.5)
+        self.assertEqual(self.sleeps, [0.5])
+
+
+class TestSingleFlight(unittest.TestCase):
+    def test_concurrent_calls_share_one_execution(self):
+        single_flight = SingleFlight()
+        started = threading.Event()
+        release = threading.Event()
+        calls = []
+
+        def slow():
+            calls.append(1)
+            started.set()
+            release.wait(5)
+            return {"value": 1}
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            leader = executor.submit(single_flight.do, "key", slow)
+            started.wait(5)
+            followers = [executor.submit(single_flight.do, "key", slow) for _ in range(3)]
+            # Se espera a que los tres esten bloqueados en la llamada en curso.
+            while len(single_flight._calls["key"].done._cond._waiters) < 3:
+                release.wait(0.001)
+            release.set()
+            results = [leader.result()] + [future.result() for future in followers]
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual([shared for _, shared in results], [False, True, True, True])
+        self.assertTrue(all(result is results[0][0] for result, _ in results))
+        self.assertEqual(single_flight._calls, {})
+
+    def test_errors_are_shared_and_not_cached(self):
+        single_flight = SingleFlight()
+
+        def failing():
+            raise ConnectionError("down")
+
+        with self.assertRaises(ConnectionError):
+            single_flight.do("key", failing)
+
+        self.assertEqual(single_flight.do("key", lambda: 2), (2, False))
+
+    def test_follower_wait_timeout(self):
+        single_flight = SingleFlight()
+        release = threading.Event()
+        started = threading.Event()
+
+        def slow():
+            started.set()
+            release.wait(5)
+            return 1
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            leader = executor.submit(single_flight.do, "key", slow)
+            started.wait(5)
+            with self.assertRaises(TimeoutError):
+                single_flight.do("key", slow, timeout=0.01)
+            release.set()
+            self.assertEqual(leader.result(), (1, False))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,178 @@
+import os
+import runpy
+import tempfile
+import unittest
+from datetime import date
+from decimal import Decimal
+from unittest.mock import Mock, patch
+
+from arrendatools.rent_update import snapshot
+from arrendatools.rent_update.base import RentUpdateInput
+from arrendatools.rent_update.ine_payload import SeriesValues
+from arrendatools.rent_update import ine_snapshot
+from arrendatools.rent_update.strategies.ipc import IpcUpdate
+from arrendatools.rent_update.strategies.irav import IravUpdate
+
+_SERIES = {
+    "IPC290751": {
+        2002: [None] * 7 + ["60.030", None, None, None, None],
+        2003: [None] * 7 + ["61.827", None, None, None, None],
+    },
+    "IRAV1": {
+        2024: [None] * 10 + ["2.2", None],
+    },
+}
+
+
+def _series_values(start_date, end_date, series):
+    return SeriesValues(
+        series,
+        {
+            (year, month): Decimal(value)
+            for year, months in _SERIES.get(series, {}).items()
+            for month, value in enumerate(months, start=1)
+            if value is not None
+        },
+    )
+
+
+def _decimals(series_values):
+    return {
+        series: {
+            year: [None if value is None else Decimal(value) for value in months]
+            for year, months in years.items()
+        }
+        for series, years in series_values.items()
+    }
+
+
+class TestSnapshot(unittest.TestCase):
+    def test_snapshot_value(self):
+        with patch.object(ine_snapshot, "SERIES", _SERIES):
+            self.assertEqual(
+                snapshot.snapshot_value("IPC290751", 2003, 8), Decimal("61.827")
+            )
+            self.assertIsNone(snapshot.snapshot_value("IPC290751", 2003, 9))
+            self.assertIsNone(snapshot.snapshot_value("IPC290751", 2004, 8))
+            self.assertIsNone(snapshot.snapshot_value("UNKNOWN", 2003, 8))
+
+    def test_snapshot_last_period(self):
+        with patch.object(ine_snapshot, "SERIES", _SERIES):
+            self.assertEqual(snapshot.snapshot_last_period("IPC290751"), (2003, 8))
+            self.assertEqual(snapshot.snapshot_last_period("IRAV1"), (2024, 11))
+            self.assertIsNone(snapshot.snapshot_last_period("UNKNOWN"))
+
+    def test_build_snapshot_one_request_per_series(self):
+        client = Mock()
+        client.fetch_series_values.side_effect = _series_values
+
+        values = snapshot.build_snapshot(client, date(2025, 1, 1))
+
+        self.assertEqual(values, _decimals(_SERIES))
+        client.fetch_series_values.assert_any_call(
+            date(2002, 1, 1), date(2025, 1, 1), "IPC290751"
+        )
+        client.fetch_series_values.assert_any_call(
+            date(2024, 11, 1), date(2025, 1, 1), "IRAV1"
+        )
+        self.assertEqual(client.fetch_series_values.call_count, 2)
+
+    def test_refresh_snapshot_writes_versioned_module(self):
+        client = Mock()
+        client.fetch_series_values.side_effect = _series_values
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "ine_snapshot.py")
+
+            written = snapshot.refresh_snapshot(path, client, date(2025, 1, 15))
+            module = runpy.run_path(written)
+
+        self.assertEqual(written, path)
+        self.assertEqual(module["SERIES"], _SERIES)
+        self.assertEqual(module["SNAPSHOT_DATE"], "2025-01-15")
+        self.assertEqual(
+            module["SNAPSHOT_VERSION"], ine_snapshot.SNAPSHOT_VERSION + 1
+        )
+
+    def test_render_empty_series(self):
+        source = snapshot.render_snapshot({"IRAV1": {}}, 3, date(2025, 1, 15))
+        namespace = {}
+        exec(source, namespace)
+        self.assertEqual(namespace["SERIES"], {"IRAV1": {}})
+        self.assertEqual(namespace["SNAPSHOT_VERSION"], 3)
+
+    def test_main(self):
+        client = Mock()
+        client.fetch_series_values.side_effect = _series_values
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "snapshot.py")
+            with patch.object(snapshot.IneClient, "default", return_value=client):
+                with patch("builtins.print"):
+                    self.assertEqual(snapshot.main(["--output", path]), 0)
+            self.assertTrue(os.path.exists(path))
+
+    def test_ipc_uses_snapshot_before_network(self):
+        client = Mock()
+        rent_update = IpcUpdate(client=client)
+        with patch.object(ine_snapshot, "SERIES", _SERIES):
+            result = rent_update.calculate(
+                RentUpdateInput(
+                    amount=Decimal("400.00"), year_start=2002, year_end=2003, month=8
+                )
+            )
+        self.assertEqual(result.updated_amount, Decimal("412.00"))
+        client.fetch_series_value.assert_not_called()
+
+    def test_ipc_falls_back_to_network_after_snapshot(self):
+        client = Mock()
+        client.fetch_series_value.return_value = Decimal("63.671")
+        rent_update = IpcUpdate(client=client)
+        with patch.object(ine_snapshot, "SERIES", _SERIES):
+            rent_update.calculate(
+                RentUpdateInput(
+                    amount=Decimal("400.00"), year_start=2003, year_end=2004, month=8
+                )
+            )
+        client.fetch_series_value.assert_called_once_with("IPC290751", 2004, 8)
+
+    def test_ipc_snapshot_disabled(self):
+        client = Mock()
+        client.fetch_series_value.return_value = Decimal("61.827")
+        rent_update = IpcUpdate(client=client, use_snapshot=False)
+        with patch.object(ine_snapshot, "SERIES", _SERIES):
+            self.assertEqual(rent_update._fetch_ipc(2003, 8), Decimal("61.827"))
+        client.fetch_series_value.assert_called_once_with("IPC290751", 2003, 8)
+
+    def test_irav_batch_skips_snapshot_periods(self):
+        client = Mock()
+        client.missing_periods.side_effect = lambda series, periods: sorted(
+            set(periods)
+        )
+        rent_update = IravUpdate(client=client)
+        with patch.object(ine_snapshot, "SERIES", _SERIES):
+            results = rent_update.calculate_many(
+                [RentUpdateInput(amount=Decimal("1000.00"), month=11, year_start=2024)]
+            )
+        self.assertEqual(results[0].updated_amount, Decimal("1022.00"))
+        client.missing_periods.assert_not_called()
+        client.fetch_series_value.assert_not_called()
+
+    def test_bundled_snapshot_resolves_without_network(self):
+        client = Mock()
+        client.fetch_series_value.side_effect = ConnectionError("Network disabled.")
+        rent_update = IpcUpdate(client=client)
+
+        self.assertEqual(
+            snapshot.snapshot_value("IPC290751", 2003, 8), Decimal("61.827")
+        )
+        self.assertEqual(rent_update._fetch_ipc(2003, 8), Decimal("61.827"))
+        result = rent_update.calculate(
+            RentUpdateInput(
+                amount=Decimal("400.00"), year_start=2002, year_end=2003, month=8
+            )
+        )
+        self.assertEqual(result.updated_amount, Decimal("412.00"))
+        client.fetch_series_value.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()